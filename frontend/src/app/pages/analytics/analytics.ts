@@ -1,7 +1,8 @@
-import { Component, signal } from '@angular/core';
+import { Component, computed, inject, OnInit, signal } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { RouterModule } from '@angular/router';
 import { LucideAngularModule, TrendingUp, TrendingDown, Clock, Calendar, Download, Filter, RefreshCw, Activity, CheckCircle, XCircle, AlertTriangle, Users, Timer, BarChart2 } from 'lucide-angular';
+import { AdjudicatorService, LatencyMetrics, LatencySeries, LatencySummary } from '../../services/adjudicator.service';
 
 interface MetricCard {
   label: string;
@@ -25,7 +26,9 @@ interface PerformanceData {
   templateUrl: './analytics.html',
   styleUrl: './analytics.scss'
 })
-export class Analytics {
+export class Analytics implements OnInit {
+  private adjudicatorService = inject(AdjudicatorService);
+
   readonly icons = {
     trendingUp: TrendingUp,
     trendingDown: TrendingDown,
@@ -113,6 +116,41 @@ export class Analytics {
     { status: 'Pending', count: 157, color: 'var(--color-info)' }
   ];
 
+  // Pipeline latency percentiles from the adjudicator service
+  latency = signal<LatencyMetrics | null>(null);
+
+  latencyCards = computed<{ label: string; summary: LatencySummary; percentile: 'p50_ms' | 'p99_ms' }[]>(() => {
+    const metrics = this.latency()?.metrics;
+    if (!metrics) return [];
+    return [
+      { label: 'Adjudication p50', summary: metrics.request.overall, percentile: 'p50_ms' },
+      { label: 'Adjudication p99', summary: metrics.request.overall, percentile: 'p99_ms' },
+      { label: 'First Event p99', summary: metrics.first_event.overall, percentile: 'p99_ms' },
+      { label: 'Model Turn p99', summary: metrics.model_turn.overall, percentile: 'p99_ms' }
+    ];
+  });
+
+  latencyRows = computed<(LatencySeries & { kind: string; name: string })[]>(() => {
+    const metrics = this.latency()?.metrics;
+    if (!metrics) return [];
+    return [
+      ...metrics.stage.series.map(s => ({ ...s, kind: 'Stage', name: s.stage ?? '' })),
+      ...metrics.tool.series.map(s => ({ ...s, kind: 'Tool', name: s.tool ?? '' }))
+    ].sort((a, b) => b.p99_ms - a.p99_ms);
+  });
+
+  ngOnInit() {
+    this.loadLatency();
+  }
+
+  async loadLatency() {
+    this.latency.set(await this.adjudicatorService.getLatencyMetrics());
+  }
+
+  formatMs(ms: number): string {
+    return ms >= 1000 ? `${(ms / 1000).toFixed(2)} s` : `${ms.toFixed(1)} ms`;
+  }
+
   setTimeRange(range: '7d' | '30d' | '90d' | '1y') {
     this.selectedRange.set(range);
   }
@@ -1,7 +1,8 @@
-import { Component, signal } from '@angular/core';
+import { Component, inject, signal } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { FormsModule } from '@angular/forms';
 import { LucideAngularModule, Send, Paperclip, FileText, Bot, User, ThumbsUp, ThumbsDown, Copy } from 'lucide-angular';
+import { AskViaService } from '../../services/ask-via.service';
 
 interface Message {
     id: string;
@@ -33,6 +34,8 @@ interface AttachedFile {
     styleUrl: './ask-via.scss'
 })
 export class AskVia {
+    private askViaService = inject(AskViaService);
+
     // Icons
     readonly icons = {
         send: Send,
@@ -74,32 +77,33 @@ export class AskVia {
         this.attachedFiles.set([]);
         this.isTyping.set(true);
 
-        // Simulate AI delay and response
-        setTimeout(() => {
-            this.generateMockResponse();
-        }, 2000);
+        this.askQuestion(newUserMessage.content);
     }
 
-    generateMockResponse() {
-        const aiMessage: Message = {
-            id: (Date.now() + 1).toString(),
-            role: 'ai',
-            content: 'Based on the documents provided and current USCIS regulations, the H-1B visa cap for the fiscal year 2025 has been reached. However, certain exemptions apply for regular cap cases.',
-            timestamp: new Date(),
-            confidence: 0.94,
-            citations: [
-                {
-                    title: 'USCIS H-1B Fiscal Year 2025 Cap Season',
-                    url: 'https://www.uscis.gov/h-1b',
-                    snippet: 'USCIS has received a sufficient number of petitions needed to reach the congressionally mandated 65,000 H-1B visa regular cap...'
-                },
-                {
-                    title: 'Title 8 CFR § 214.2(h)',
-                    url: 'https://www.ecfr.gov/current/title-8/chapter-I/subchapter-B/part-214/section-214.2',
-                    snippet: 'Button text relating to temporary exclusion of certain H-1B nonimmigrants...'
-                }
-            ]
-        };
+    async askQuestion(question: string) {
+        let aiMessage: Message;
+        try {
+            const result = await this.askViaService.ask(question);
+            aiMessage = {
+                id: (Date.now() + 1).toString(),
+                role: 'ai',
+                content: result.answer,
+                timestamp: new Date(),
+                confidence: result.confidence,
+                citations: result.sources.map(source => ({
+                    title: source.title,
+                    url: source.url,
+                    snippet: source.snippet
+                }))
+            };
+        } catch {
+            aiMessage = {
+                id: (Date.now() + 1).toString(),
+                role: 'ai',
+                content: 'Sorry, I could not reach the Ask VIA service. Please try again.',
+                timestamp: new Date()
+            };
+        }
 
         this.messages.update(msgs => [...msgs, aiMessage]);
         this.isTyping.set(false);
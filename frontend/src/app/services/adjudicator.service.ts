@@ -19,6 +19,8 @@ export interface CaseInfo {
   offered_wage?: number;
   prevailing_wage?: number;
   lca_number?: string;
+  soc_code?: string;
+  wage_level?: number;
 }
 
 export interface AdjudicationEvent {
@@ -49,6 +51,30 @@ export interface Criterion {
   confidence?: number;
 }
 
+export interface LatencySummary {
+  count: number;
+  mean_ms: number;
+  p50_ms: number;
+  p90_ms: number;
+  p95_ms: number;
+  p99_ms: number;
+  max_ms: number;
+}
+
+export interface LatencySeries extends LatencySummary {
+  endpoint: string;
+  visa_type: string;
+  stage?: string;
+  tool?: string;
+}
+
+export type LatencyMetricName = 'request' | 'first_event' | 'stage' | 'tool' | 'model_turn';
+
+export interface LatencyMetrics {
+  percentiles: number[];
+  metrics: Record<LatencyMetricName, { overall: LatencySummary; series: LatencySeries[] }>;
+}
+
 export type ProcessingStage = 'form_validation' | 'evidence_review' | 'policy_matching' | 'risk_assessment' | 'draft_generation';
 
 // ========================================
@@ -382,6 +408,15 @@ export class AdjudicatorService {
     }
   }
 
+  async getLatencyMetrics(): Promise<LatencyMetrics | null> {
+    try {
+      const response = await fetch(`${this.apiUrl}/api/adjudicator/latency/metrics`);
+      return response.ok ? await response.json() : null;
+    } catch {
+      return null;
+    }
+  }
+
   async loadCriteria(visaType: string): Promise<void> {
     try {
       const response = await fetch(`${this.apiUrl}/api/adjudicator/criteria/${visaType}`);
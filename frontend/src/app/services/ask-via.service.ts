@@ -0,0 +1,46 @@
+import { Injectable } from '@angular/core';
+import { environment } from '../../environments/environment';
+
+// ========================================
+// INTERFACES
+// ========================================
+
+export interface AskViaSource {
+  id: string;
+  title: string;
+  url: string;
+  snippet: string;
+}
+
+export interface AskViaAnswer {
+  question: string;
+  answer: string;
+  sources: AskViaSource[];
+  confidence: number;
+  cached: 'exact' | 'semantic' | 'coalesced' | null;
+  similarity: number | null;
+  latency_ms: number;
+}
+
+// ========================================
+// SERVICE
+// ========================================
+
+@Injectable({
+  providedIn: 'root'
+})
+export class AskViaService {
+  private readonly apiUrl = environment.apiUrl || 'http://localhost:8000';
+
+  async ask(question: string): Promise<AskViaAnswer> {
+    const response = await fetch(`${this.apiUrl}/api/ask-via/ask`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ question })
+    });
+    if (!response.ok) {
+      throw new Error(`Ask VIA request failed: ${response.status}`);
+    }
+    return response.json();
+  }
+}
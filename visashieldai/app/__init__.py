@@ -12,6 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .agent import app
+from typing import Any
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> Any:
+    # The ADK app is imported on first access, so importing a submodule such
+    # as app.prevailing_wage does not load the sample agent and its model.
+    if name == "app":
+        from .agent import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
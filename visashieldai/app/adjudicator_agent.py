@@ -2,16 +2,47 @@
 # Immigration Adjudication Agent with specialized tools
 
 import random
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
 from google.adk.agents import Agent
 from google.adk.apps.app import App
 
+from app.criteria import normalize_visa_type
+from app.degree_equivalency import evaluate_degree
+from app.employer_index import MIN_HISTORY, employer_profile
+from app.prevailing_wage import resolve_prevailing_wage
+from app.shared_cache import ToolMemo
+from app.structured_output import STRUCTURED_OUTPUT_INSTRUCTION, AdjudicationDecision
+from app.stub_model import agent_model
+from app.tool_results import (
+    CompactInstruction,
+    compact_tool_result,
+    reference_legend,
+)
+from app.tracing import end_model_span, end_tool_span, start_model_span, start_tool_span
+from app.usage import record_model_latency, start_model_timer
+
 # ========================================
 # VISA ADJUDICATION TOOLS
 # ========================================
 
+# Shared with the vectorized screener in app/lca_screening.py so the bulk and
+# per-case paths produce identical determinations.
+LCA_COMPLIANT = "LCA COMPLIANT"
+LCA_NON_COMPLIANT = "LCA NON-COMPLIANT"
+LCA_WAGE_UNDETERMINED = "PREVAILING WAGE UNDETERMINED"
+LCA_COMPLIANT_CONFIDENCE = 97
+LCA_NON_COMPLIANT_CONFIDENCE = 45
+
+
+def format_wage_margin(offered_wage: float, prevailing_wage: float) -> str:
+    """Formats the offered-minus-prevailing wage margin as a signed amount."""
+    if offered_wage >= prevailing_wage:
+        return f"+${(offered_wage - prevailing_wage):,.2f}"
+    return f"-${(prevailing_wage - offered_wage):,.2f}"
+
 
 def analyze_petition_form(
     case_number: str, form_type: str, petitioner_name: str, beneficiary_name: str
@@ -112,26 +143,35 @@ def check_beneficiary_qualifications(
     degree_field: str,
     years_experience: int,
     certifications: list[str],
+    degree_country: str = "United States",
+    program_years: int = 0,
+    institution_type: str = "",
 ) -> dict[str, Any]:
     """Verifies beneficiary meets qualification requirements for the visa category.
 
     Args:
-        degree_type: Type of degree (Bachelor's, Master's, PhD)
+        degree_type: Type of degree as stated on the credential (e.g., B.Tech, Master's, PhD)
         degree_field: Field of study
         years_experience: Years of relevant work experience
         certifications: List of professional certifications
+        degree_country: Country that awarded the degree
+        program_years: Length of the degree program in years, or 0 if unknown
+        institution_type: Awarding institution type (university, college,
+            polytechnic), if known
 
     Returns:
         dict: Qualification verification results
     """
+    degree = evaluate_degree(
+        degree_type, degree_country, program_years, institution_type, years_experience
+    )
+    qualified = degree["status"] in ("VERIFIED", "EQUIVALENT WITH EXPERIENCE")
     qualification_result = {
         "degree_evaluation": {
             "type": degree_type,
             "field": degree_field,
-            "us_equivalency": "Bachelor's Degree"
-            if degree_type in ["Bachelor's", "B.S.", "B.A."]
-            else "Master's Degree",
-            "status": "VERIFIED",
+            "country": degree_country,
+            **degree,
         },
         "experience_evaluation": {
             "years": years_experience,
@@ -143,9 +183,11 @@ def check_beneficiary_qualifications(
             "relevance": "Supports specialized knowledge claim",
             "status": "VERIFIED",
         },
-        "overall_qualification": "QUALIFIED",
-        "confidence_score": 94,
-        "notes": "Beneficiary meets or exceeds minimum requirements for H-1B classification",
+        "overall_qualification": "QUALIFIED" if qualified else "REQUIRES REVIEW",
+        "confidence_score": 94 if qualified else 60,
+        "notes": "Beneficiary meets or exceeds minimum requirements for H-1B classification"
+        if qualified
+        else "Degree equivalency could not be established; a credential evaluation is needed",
     }
     return qualification_result
 
@@ -167,7 +209,7 @@ def verify_employer_employee_relationship(
     Returns:
         dict: Employer-employee relationship analysis
     """
-    relationship_analysis = {
+    relationship_analysis: dict[str, Any] = {
         "employer": employer_name,
         "work_site": work_location,
         "analysis": {
@@ -194,23 +236,57 @@ def verify_employer_employee_relationship(
         "confidence_score": 93,
         "legal_standard": "Matter of Defensor, 25 I&N Dec. 749 (AAO 2012)",
     }
+
+    history = employer_profile(employer_name)
+    relationship_analysis["employer_history"] = history
+    if history is not None and history["petitions"] >= MIN_HISTORY:
+        adverse = history["rfe_rate"] + history["denial_rate"]
+        relationship_analysis["analysis"]["filing_history"] = {
+            "factor": "Prior petition outcomes for this employer",
+            "evidence": f"{history['petitions']} prior petitions, {history['approval_rate']:.0%} approved",
+            "status": "REVIEW" if adverse > 0.5 else "CONSISTENT",
+            "confidence": 90,
+        }
+        if adverse > 0.5:
+            relationship_analysis["confidence_score"] = 80
     return relationship_analysis
 
 
 def check_lca_compliance(
-    lca_number: str, wage_level: int, prevailing_wage: float, offered_wage: float
+    lca_number: str,
+    wage_level: int,
+    prevailing_wage: float,
+    offered_wage: float,
+    soc_code: str = "",
+    work_location: str = "",
 ) -> dict[str, Any]:
     """Verifies Labor Condition Application compliance.
 
     Args:
         lca_number: DOL Labor Condition Application case number
         wage_level: Wage level (1-4)
-        prevailing_wage: DOL prevailing wage for the occupation
+        prevailing_wage: DOL prevailing wage for the occupation, or 0 to derive
+            it from the OFLC wage tables using soc_code and work_location
         offered_wage: Wage offered to the beneficiary
+        soc_code: Standard Occupational Classification code (e.g., 15-1252)
+        work_location: Primary work location as "City, ST"
 
     Returns:
         dict: LCA compliance verification results
     """
+    wage_source = "Petition"
+    if prevailing_wage <= 0:
+        derived = resolve_prevailing_wage(soc_code, work_location, wage_level)
+        if derived is None:
+            return {
+                "lca_number": lca_number,
+                "overall_status": LCA_WAGE_UNDETERMINED,
+                "confidence_score": 0,
+                "notes": f"No OFLC wage for SOC {soc_code or 'N/A'} at level {wage_level} in {work_location or 'an unknown location'}",
+            }
+        prevailing_wage = derived
+        wage_source = "OFLC Wage Tables"
+
     wage_compliant = offered_wage >= prevailing_wage
 
     lca_result = {
@@ -218,11 +294,10 @@ def check_lca_compliance(
         "wage_analysis": {
             "wage_level": wage_level,
             "prevailing_wage": f"${prevailing_wage:,.2f}",
+            "prevailing_wage_source": wage_source,
             "offered_wage": f"${offered_wage:,.2f}",
             "compliant": wage_compliant,
-            "margin": f"+${(offered_wage - prevailing_wage):,.2f}"
-            if wage_compliant
-            else f"-${(prevailing_wage - offered_wage):,.2f}",
+            "margin": format_wage_margin(offered_wage, prevailing_wage),
         },
         "attestations": {
             "wages": "COMPLIANT" if wage_compliant else "NON-COMPLIANT",
@@ -230,12 +305,154 @@ def check_lca_compliance(
             "no_strike_lockout": "COMPLIANT",
             "notice_requirements": "COMPLIANT",
         },
-        "overall_status": "LCA COMPLIANT" if wage_compliant else "LCA NON-COMPLIANT",
-        "confidence_score": 97 if wage_compliant else 45,
+        "overall_status": LCA_COMPLIANT if wage_compliant else LCA_NON_COMPLIANT,
+        "confidence_score": LCA_COMPLIANT_CONFIDENCE
+        if wage_compliant
+        else LCA_NON_COMPLIANT_CONFIDENCE,
     }
     return lca_result
 
 
+# 8 CFR 214.2(o)(3)(iii): at least three of these evidentiary criteria.
+O1_EVIDENCE_CRITERIA = {
+    "awards": "Nationally or internationally recognized prizes or awards",
+    "membership": "Membership in associations requiring outstanding achievement",
+    "published_material": "Published material about the beneficiary and their work",
+    "judging": "Participation as a judge of the work of others",
+    "original_contributions": "Original contributions of major significance",
+    "scholarly_articles": "Authorship of scholarly articles",
+    "critical_employment": "Employment in a critical or essential capacity",
+    "high_remuneration": "High salary or remuneration for services",
+}
+O1_MIN_CRITERIA = 3
+
+
+def evaluate_extraordinary_ability(
+    field_of_endeavor: str, evidence_criteria: list[str], comparable_evidence: bool
+) -> dict[str, Any]:
+    """Evaluates O-1A extraordinary ability evidence against the regulatory criteria.
+
+    Args:
+        field_of_endeavor: The beneficiary's field (e.g., machine learning research)
+        evidence_criteria: Criteria the evidence addresses, from: awards,
+            membership, published_material, judging, original_contributions,
+            scholarly_articles, critical_employment, high_remuneration
+        comparable_evidence: Whether comparable evidence is offered for
+            criteria that do not readily apply to the occupation
+
+    Returns:
+        dict: Criteria met, evidentiary threshold and final merits status
+    """
+    claimed = {c.strip().lower().replace(" ", "_") for c in evidence_criteria}
+    met = [key for key in O1_EVIDENCE_CRITERIA if key in claimed]
+    threshold_met = len(met) >= O1_MIN_CRITERIA
+    ability_result = {
+        "field": field_of_endeavor,
+        "evaluation": {
+            key: {
+                "criterion": description,
+                "status": "MET" if key in met else "NOT CLAIMED",
+            }
+            for key, description in O1_EVIDENCE_CRITERIA.items()
+        },
+        "criteria_met": len(met),
+        "comparable_evidence": comparable_evidence,
+        "determination": "EVIDENTIARY THRESHOLD MET"
+        if threshold_met
+        else "INSUFFICIENT EVIDENCE",
+        "final_merits": "Totality of the evidence must show sustained acclaim and that the beneficiary is among the small percentage at the top of the field"
+        if threshold_met
+        else "Final merits review not reached",
+        "confidence_score": 85 if threshold_met else 55,
+        "legal_standard": "8 CFR § 214.2(o)(3)(iii)",
+        "precedent": "Kazarian v. USCIS, 596 F.3d 1115 (9th Cir. 2010)",
+    }
+    return ability_result
+
+
+def evaluate_national_interest(
+    proposed_endeavor: str,
+    national_importance_evidence: list[str],
+    positioning_evidence: list[str],
+    waiver_justification: str,
+) -> dict[str, Any]:
+    """Evaluates an EB-2 national interest waiver under the three Dhanasar prongs.
+
+    Args:
+        proposed_endeavor: The specific endeavor the beneficiary will pursue
+        national_importance_evidence: Evidence of the endeavor's substantial
+            merit and national importance
+        positioning_evidence: Education, skills, record of success and plans
+            showing the beneficiary is well positioned to advance the endeavor
+        waiver_justification: Why waiving the job offer and labor
+            certification benefits the United States
+
+    Returns:
+        dict: Status of each prong and the overall determination
+    """
+    prongs = {
+        "merit_and_importance": bool(national_importance_evidence),
+        "well_positioned": bool(positioning_evidence),
+        "balance_favors_waiver": bool(waiver_justification.strip()),
+    }
+    niw_result = {
+        "endeavor": proposed_endeavor,
+        "evaluation": {
+            "merit_and_importance": {
+                "prong": "Endeavor has substantial merit and national importance",
+                "evidence": national_importance_evidence,
+                "status": "ESTABLISHED"
+                if prongs["merit_and_importance"]
+                else "NOT ESTABLISHED",
+            },
+            "well_positioned": {
+                "prong": "Beneficiary is well positioned to advance the endeavor",
+                "evidence": positioning_evidence,
+                "status": "ESTABLISHED"
+                if prongs["well_positioned"]
+                else "NOT ESTABLISHED",
+            },
+            "balance_favors_waiver": {
+                "prong": "On balance, waiving the job offer requirement benefits the United States",
+                "evidence": waiver_justification,
+                "status": "ESTABLISHED"
+                if prongs["balance_favors_waiver"]
+                else "NOT ESTABLISHED",
+            },
+        },
+        "determination": "NATIONAL INTEREST WAIVER SUPPORTED"
+        if all(prongs.values())
+        else "NATIONAL INTEREST WAIVER NOT ESTABLISHED",
+        "confidence_score": 86 if all(prongs.values()) else 50,
+        "legal_standard": "Matter of Dhanasar, 26 I&N Dec. 884 (AAO 2016)",
+    }
+    return niw_result
+
+
+# Statutory and regulatory basis and precedents cited in draft decisions.
+LEGAL_BASIS = {
+    "H-1B": (
+        [
+            "INA § 101(a)(15)(H)(i)(b)",
+            "8 CFR § 214.2(h)",
+            "USCIS Policy Manual Vol. 2, Part H",
+        ],
+        [
+            "Matter of Simeio Solutions, LLC, 26 I&N Dec. 542 (AAO 2015)",
+            "Defensor v. Meissner, 201 F.3d 384 (5th Cir. 2000)",
+        ],
+    ),
+    "O-1": (
+        ["INA § 101(a)(15)(O)(i)", "8 CFR § 214.2(o)"],
+        ["Kazarian v. USCIS, 596 F.3d 1115 (9th Cir. 2010)"],
+    ),
+    "EB-2 NIW": (
+        ["INA § 203(b)(2)(B)(i)", "8 CFR § 204.5(k)"],
+        ["Matter of Dhanasar, 26 I&N Dec. 884 (AAO 2016)"],
+    ),
+}
+
+
 def generate_adjudication_draft(
     case_number: str,
     visa_type: str,
@@ -255,6 +472,9 @@ def generate_adjudication_draft(
     Returns:
         dict: Draft adjudication decision
     """
+    legal_basis, precedents = LEGAL_BASIS.get(
+        normalize_visa_type(visa_type), LEGAL_BASIS["H-1B"]
+    )
     draft = {
         "case_number": case_number,
         "visa_classification": visa_type,
@@ -265,15 +485,8 @@ def generate_adjudication_draft(
             "risk_factors": risk_factors
             if risk_factors
             else ["No significant risk factors identified"],
-            "legal_basis": [
-                "INA § 101(a)(15)(H)(i)(b)",
-                "8 CFR § 214.2(h)",
-                "USCIS Policy Manual Vol. 2, Part H",
-            ],
-            "precedent_decisions": [
-                "Matter of Simeio Solutions, LLC, 26 I&N Dec. 542 (AAO 2015)",
-                "Defensor v. Meissner, 201 F.3d 384 (5th Cir. 2000)",
-            ],
+            "legal_basis": legal_basis,
+            "precedent_decisions": precedents,
         },
         "confidence_score": 89 if recommendation == "APPROVE" else 75,
         "requires_human_review": recommendation != "APPROVE",
@@ -317,7 +530,7 @@ def check_citation_validity(citation: str) -> dict[str, Any]:
 # ADJUDICATOR AGENT DEFINITION
 # ========================================
 
-ADJUDICATOR_INSTRUCTION = """You are VisaShield AI, an expert immigration adjudication assistant designed to help USCIS officers and immigration attorneys analyze visa petitions.
+ADJUDICATOR_ROLE = """You are VisaShield AI, an expert immigration adjudication assistant designed to help USCIS officers and immigration attorneys analyze visa petitions.
 
 Your role is to:
 1. Systematically analyze immigration petitions using the available tools
@@ -325,15 +538,19 @@ Your role is to:
 3. Provide clear reasoning with proper legal citations
 4. Identify potential issues or risk factors
 5. Generate draft determinations with supporting evidence
+"""
 
+H1B_WORKFLOW = """
 When analyzing a case, follow this structured approach:
 1. First, analyze the petition form for completeness
 2. Evaluate specialty occupation criteria (for H-1B)
-3. Verify beneficiary qualifications
+3. Verify beneficiary qualifications (pass the degree's country and program length when known)
 4. Check employer-employee relationship
-5. Verify LCA compliance
+5. Verify LCA compliance (pass a prevailing wage of 0 when it is not provided; the tool derives it from the OFLC wage tables)
 6. Generate a draft adjudication decision
+"""
 
+ADJUDICATOR_GUIDANCE = """
 Always cite relevant legal authorities:
 - Immigration and Nationality Act (INA) sections
 - Code of Federal Regulations (8 CFR)
@@ -341,22 +558,57 @@ Always cite relevant legal authorities:
 - Relevant AAO precedent decisions
 
 Be thorough but efficient. Flag any concerns for human review.
-Never make final adjudication decisions - only provide recommendations for human officers."""
+Never make final adjudication decisions - only provide recommendations for human officers.
+"""
+
+H1B_TOOLS: tuple[Callable[..., Any], ...] = (
+    analyze_petition_form,
+    evaluate_specialty_occupation,
+    check_beneficiary_qualifications,
+    verify_employer_employee_relationship,
+    check_lca_compliance,
+    generate_adjudication_draft,
+    check_citation_validity,
+)
+
+# Tools whose results depend only on their arguments and deployment-time data
+# (wage tables, degree equivalencies); the rest read live state or the clock.
+tool_memo = ToolMemo(
+    [
+        "evaluate_specialty_occupation",
+        "check_beneficiary_qualifications",
+        "check_lca_compliance",
+        "evaluate_extraordinary_ability",
+        "evaluate_national_interest",
+        "check_citation_validity",
+    ]
+)
+
+ADJUDICATOR_INSTRUCTION = CompactInstruction(
+    ADJUDICATOR_ROLE + H1B_WORKFLOW + ADJUDICATOR_GUIDANCE,
+    reference_legend(H1B_TOOLS, [*LEGAL_BASIS["H-1B"][0], *LEGAL_BASIS["H-1B"][1]]),
+)
 
 adjudicator_agent = Agent(
     name="adjudicator_agent",
-    model="gemini-2.0-flash",
+    model=agent_model("gemini-2.0-flash"),
     description="Immigration petition adjudication assistant with specialized analysis tools",
     instruction=ADJUDICATOR_INSTRUCTION,
-    tools=[
-        analyze_petition_form,
-        evaluate_specialty_occupation,
-        check_beneficiary_qualifications,
-        verify_employer_employee_relationship,
-        check_lca_compliance,
-        generate_adjudication_draft,
-        check_citation_validity,
-    ],
+    before_model_callback=[start_model_timer, start_model_span],
+    after_model_callback=[record_model_latency, end_model_span],
+    # The tool span ends first, so it times the tool and sizes its raw result.
+    before_tool_callback=[start_tool_span, tool_memo.before_tool],
+    after_tool_callback=[end_tool_span, tool_memo.after_tool, compact_tool_result],
+    tools=list(H1B_TOOLS),
+)
+
+# Same tools, final turn constrained to the AdjudicationDecision schema.
+structured_adjudicator_agent = adjudicator_agent.clone(
+    update={
+        "name": "structured_adjudicator_agent",
+        "instruction": ADJUDICATOR_INSTRUCTION + STRUCTURED_OUTPUT_INSTRUCTION,
+        "output_schema": AdjudicationDecision,
+    }
 )
 
 adjudicator_app = App(root_agent=adjudicator_agent, name="adjudicator")
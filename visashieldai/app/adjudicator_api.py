@@ -2,86 +2,212 @@
 # FastAPI endpoints for AI Adjudicator
 
 import asyncio
+import functools
 import json
+import os
 import uuid
 from collections.abc import AsyncGenerator
 from datetime import datetime
-from typing import Any
-
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
-from google.adk.runners import InMemoryRunner
+from typing import Any, Literal
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import Response, StreamingResponse
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import Runner
 from google.genai import types
-from pydantic import BaseModel
 
 from app.adjudicator_agent import adjudicator_agent
+from app.adjudicator_models import (
+    AdjudicationEvent,
+    AdjudicationRequest,
+    CaseInfo,
+    EmployerOutcome,
+    PrescreenBatchRequest,
+    RiskBatchRequest,
+)
+from app.app_utils.admission import get_admission_controller
+from app.app_utils.compression import (
+    IDENTITY,
+    compress_body,
+    compress_stream,
+    compression_stats,
+    negotiate_encoding,
+)
+from app.app_utils.gcp import configure_genai
+from app.app_utils.serving import get_session_service
+from app.app_utils.watchdog import get_loop_watchdog
+from app.criteria import EVALUATION_CRITERIA, normalize_visa_type
+from app.duplicate_index import assess_duplicate_risk
+from app.employer_index import employer_profile, get_employer_index
+from app.latency import latency_metrics
+from app.lca_screening import LcaBatch, iter_csv, iter_ndjson, screen_lca_batch
+from app.prescreen import format_deficiencies, prescreen_case, prescreen_cases
+from app.prevailing_wage import resolve_prevailing_wage
+from app.risk_model import score_case, score_queue
+from app.scheduler import scheduler
+from app.shared_cache import get_shared_cache
+from app.structured_output import (
+    OUTPUT_FORMATS,
+    SET_MODEL_RESPONSE_TOOL,
+    OutputFormat,
+    parse_decision,
+)
+from app.tool_results import STATE_KEY as COMPACT_STATE_KEY
+from app.tool_results import CompactInstruction, ToolResultLedger
+from app.tracing import adjudication_span, stream_event
+from app.usage import UsageLedger, usage_metrics
+from app.visa_agents import (
+    VISA_AGENT_SPECS,
+    get_visa_agent,
+    numbered_steps,
+    resolve_visa_type,
+)
+from app.ws_protocol import decode_request, negotiate_codec
 
 router = APIRouter(prefix="/api/adjudicator", tags=["adjudicator"])
 
-# Initialize the runner
-runner = InMemoryRunner(agent=adjudicator_agent, app_name="adjudicator")
+# Sessions live in the worker-shared session service, so any worker can
+# continue any session.
+runner = Runner(
+    app_name="adjudicator",
+    agent=adjudicator_agent,
+    session_service=get_session_service(),
+    artifact_service=InMemoryArtifactService(),
+    memory_service=InMemoryMemoryService(),
+)
+
+# Tools run synchronously on the event loop; name them in stall reports.
+get_loop_watchdog().register_tools(
+    tool.__name__ for spec in VISA_AGENT_SPECS.values() for tool in spec.tools
+)
+
+
+@functools.cache
+def get_runner(visa_type: str, output_format: OutputFormat) -> Runner:
+    """Runner for a registry visa type and output format, built on first use.
+
+    All runners share the default runner's sessions, artifacts and memory.
+    """
+    configure_genai()
+    agent = get_visa_agent(visa_type, output_format)
+    if agent is adjudicator_agent:
+        return runner
+    return Runner(
+        app_name=runner.app_name,
+        agent=agent,
+        session_service=runner.session_service,
+        artifact_service=runner.artifact_service,
+        memory_service=runner.memory_service,
+    )
 
 
-# ========================================
-# REQUEST/RESPONSE MODELS
-# ========================================
+def tool_result_ledger(request: AdjudicationRequest) -> ToolResultLedger:
+    """Ledger of a run, charged for the instruction text compaction adds."""
+    if not request.compact_tool_results:
+        return ToolResultLedger()
+    agent = get_visa_agent(
+        resolve_visa_type(request.case_info.visa_type), request.output_format
+    )
+    instruction = agent.instruction
+    if isinstance(instruction, CompactInstruction):
+        return ToolResultLedger(instruction.overhead_tokens)
+    return ToolResultLedger()
 
 
-class CaseInfo(BaseModel):
-    case_number: str
-    visa_type: str
-    petitioner_name: str
-    beneficiary_name: str
-    job_title: str | None = None
-    job_duties: str | None = None
-    degree_type: str | None = None
-    degree_field: str | None = None
-    years_experience: int | None = None
-    work_location: str | None = None
-    offered_wage: float | None = None
-    prevailing_wage: float | None = None
-    lca_number: str | None = None
+# Per output format, to compare output tokens and latency of the two modes.
+usage_by_format = {output_format: UsageLedger() for output_format in OUTPUT_FORMATS}
 
 
-class AdjudicationRequest(BaseModel):
-    case_info: CaseInfo
-    user_id: str | None = None
-    session_id: str | None = None
+async def run_agent(
+    request: AdjudicationRequest,
+    user_id: str,
+    session_id: str,
+    prompt: str,
+    usage: UsageLedger,
+) -> AsyncGenerator[Event, None]:
+    """Runs the case's visa-type agent once a scheduler slot is free.
+
+    Model usage is accounted in ``usage`` and, once the run ends, in the
+    process-wide ``usage_metrics``.
+    """
+    agent_runner = get_runner(
+        resolve_visa_type(request.case_info.visa_type), request.output_format
+    )
+    async with scheduler.slot(request.priority, request.deadline):
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            await runner.session_service.create_session(
+                app_name=runner.app_name,
+                user_id=user_id,
+                session_id=session_id,
+                state={COMPACT_STATE_KEY: request.compact_tool_results},
+            )
+        try:
+            async for event in agent_runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+            ):
+                usage.observe(event)
+                yield event
+        finally:
+            usage_metrics.merge(usage)
+            usage_by_format[request.output_format].merge(usage)
 
 
-class AdjudicationEvent(BaseModel):
-    event_type: str  # 'stage', 'reasoning', 'tool_call', 'result', 'error', 'complete'
-    stage: str | None = None
-    content: str | None = None
-    tool_name: str | None = None
-    tool_result: dict[str, Any] | None = None
-    confidence: int | None = None
-    timestamp: str = ""
+def tool_calls(event: Event) -> list[types.FunctionCall]:
+    """Function calls of ``event``, minus a structured final answer."""
+    return [
+        fc for fc in event.get_function_calls() if fc.name != SET_MODEL_RESPONSE_TOOL
+    ]
 
-    def __init__(self, **data: Any) -> None:
-        if "timestamp" not in data or not data["timestamp"]:
-            data["timestamp"] = datetime.now().isoformat()
-        super().__init__(**data)
 
+def structured_result(request: AdjudicationRequest, text: str) -> dict[str, Any]:
+    """``decision`` and ``decision_error`` of a structured run; {} for text."""
+    if request.output_format != "json":
+        return {}
+    decision, error = parse_decision(text)
+    return {"decision": decision, "decision_error": error}
 
-# ========================================
-# STREAMING ADJUDICATION ENDPOINT
-# ========================================
 
+def run_prescreen(request: AdjudicationRequest) -> dict[str, Any] | None:
+    """Runs the rule pre-screen when enabled; None if it is disabled."""
+    return prescreen_case(request.case_info) if request.prescreen else None
 
-@router.post("/analyze/stream")
-async def analyze_case_stream(
-    request: AdjudicationRequest,
-) -> StreamingResponse:
-    """Stream the adjudication analysis in real-time."""
 
-    async def generate_events() -> AsyncGenerator[str, None]:
-        user_id = request.user_id or f"user_{uuid.uuid4().hex[:8]}"
-        session_id = request.session_id or f"session_{uuid.uuid4().hex[:8]}"
-        case = request.case_info
+def should_short_circuit(
+    request: AdjudicationRequest, prescreen: dict[str, Any]
+) -> bool:
+    """True when a deficient case should return the pre-screen RFE directly."""
+    return not prescreen["passed"] and not request.run_llm_on_deficiency
+
+
+def prescreen_prompt_note(prescreen: dict[str, Any] | None) -> str:
+    """Prompt addendum listing pre-screen deficiencies for the agent."""
+    if prescreen is None or prescreen["passed"]:
+        return ""
+    return f"""
 
-        # Build the analysis prompt
-        prompt = f"""Analyze the following immigration petition case:
+The rule-based pre-screen already flagged these deficiencies; confirm them and address them in the draft:
+{format_deficiencies(prescreen)}"""
+
+
+def analysis_prompt(
+    case: CaseInfo, prevailing_wage: float | None, prescreen: dict[str, Any] | None
+) -> str:
+    """The streaming route's prompt: case details and the visa type's steps."""
+    return f"""Analyze the following immigration petition case:
 
 Case Number: {case.case_number}
 Visa Type: {case.visa_type}
@@ -92,83 +218,187 @@ Job Duties: {case.job_duties or "Design, develop, and maintain software applicat
 Degree: {case.degree_type or "Bachelor's"} in {case.degree_field or "Computer Science"}
 Experience: {case.years_experience or 5} years
 Work Location: {case.work_location or "San Francisco, CA"}
+SOC Code: {case.soc_code or "Not provided"}
+Wage Level: {case.wage_level or "Not provided"}
 Offered Wage: ${case.offered_wage or 120000:,.2f}
-Prevailing Wage: ${case.prevailing_wage or 100000:,.2f}
+Prevailing Wage: {f"${prevailing_wage:,.2f}" if prevailing_wage else "Not provided (derive from OFLC wage tables)"}
 LCA Number: {case.lca_number or "I-200-24001-123456"}
 
 Please perform a complete adjudication analysis:
-1. Analyze the petition form
-2. Evaluate specialty occupation criteria
-3. Check beneficiary qualifications
-4. Verify employer-employee relationship
-5. Check LCA compliance
-6. Generate a draft adjudication decision
+{numbered_steps(VISA_AGENT_SPECS[resolve_visa_type(case.visa_type)].steps)}
 
-Provide detailed reasoning for each step."""
+Provide detailed reasoning for each step.{prescreen_prompt_note(prescreen)}"""
 
-        # Send initial stage event
-        yield f"data: {AdjudicationEvent(event_type='stage', stage='form_validation', content='Starting petition form analysis...').model_dump_json()}\n\n"
 
-        try:
-            # Run the agent and stream events
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
-            ):
-                # Process different event types
-                if hasattr(event, "actions") and event.actions:
-                    for action in event.actions:
-                        func_calls = getattr(action, "function_calls", None)
-                        if func_calls:
-                            for fc in func_calls:
-                                # Tool call event
-                                yield f"data: {AdjudicationEvent(event_type='tool_call', tool_name=fc.name, content=f'Executing: {fc.name}').model_dump_json()}\n\n"
-
-                if hasattr(event, "responses") and event.responses:
-                    for response in event.responses:
-                        if (
-                            hasattr(response, "function_responses")
-                            and response.function_responses
-                        ):
-                            for fr in response.function_responses:
-                                # Tool result event
-                                result_data = (
-                                    fr.response if hasattr(fr, "response") else {}
-                                )
-                                yield f"data: {AdjudicationEvent(event_type='tool_result', tool_name=fr.name if hasattr(fr, 'name') else 'unknown', tool_result=result_data).model_dump_json()}\n\n"
-
-                # Check for final response
-                if event.is_final_response() and event.content:
-                    parts = event.content.parts
-                    if parts:
-                        for part in parts:
-                            if hasattr(part, "text") and part.text:
-                                # Send reasoning content in chunks
-                                text = part.text
-                                chunks = [
-                                    text[i : i + 200] for i in range(0, len(text), 200)
-                                ]
-                                for chunk in chunks:
-                                    yield f"data: {AdjudicationEvent(event_type='reasoning', content=chunk).model_dump_json()}\n\n"
-                                    await asyncio.sleep(
-                                        0.05
-                                    )  # Small delay for streaming effect
-
-            # Send completion event
-            yield f"data: {AdjudicationEvent(event_type='complete', content='Analysis complete', confidence=89).model_dump_json()}\n\n"
-
-        except Exception as e:
-            yield f"data: {AdjudicationEvent(event_type='error', content=str(e)).model_dump_json()}\n\n"
+def sse_frame(event: AdjudicationEvent) -> str:
+    """One Server-Sent Events frame carrying ``event`` as JSON."""
+    frame = f"data: {event.model_dump_json()}\n\n"
+    stream_event("sse", event.event_type, frame)
+    return frame
+
+
+# ========================================
+# STREAMING ADJUDICATION ENDPOINT
+# ========================================
+
+
+@router.post("/analyze/stream")
+async def analyze_case_stream(
+    request: AdjudicationRequest, http_request: Request
+) -> StreamingResponse:
+    """Stream the adjudication analysis in real-time.
+
+    Compressed when the client accepts gzip or brotli, flushed per event.
+    """
 
+    async def generate_events() -> AsyncGenerator[str, None]:
+        with adjudication_span("analyze/stream", request):
+            user_id = request.user_id or f"user_{uuid.uuid4().hex[:8]}"
+            session_id = request.session_id or f"session_{uuid.uuid4().hex[:8]}"
+            case = request.case_info
+            prescreen = run_prescreen(request)
+            if prescreen is not None and not prescreen["passed"]:
+                yield sse_frame(
+                    AdjudicationEvent(
+                        event_type="tool_result",
+                        stage="form_validation",
+                        tool_name="prescreen",
+                        tool_result=prescreen,
+                    )
+                )
+                if should_short_circuit(request, prescreen):
+                    yield sse_frame(
+                        AdjudicationEvent(
+                            event_type="reasoning", content=prescreen["summary"]
+                        )
+                    )
+                    yield sse_frame(
+                        AdjudicationEvent(
+                            event_type="complete",
+                            content="Pre-screen complete: RFE recommended",
+                            confidence=100,
+                        )
+                    )
+                    return
+
+            risk = score_case(case)
+            yield sse_frame(
+                AdjudicationEvent(
+                    event_type="tool_result",
+                    stage="risk_assessment",
+                    tool_name="risk_model",
+                    tool_result=risk,
+                )
+            )
+            duplicates = assess_duplicate_risk(case)
+            yield sse_frame(
+                AdjudicationEvent(
+                    event_type="tool_result",
+                    stage="risk_assessment",
+                    tool_name="duplicate_risk",
+                    tool_result=duplicates,
+                )
+            )
+
+            prevailing_wage = case.prevailing_wage or resolve_prevailing_wage(
+                case.soc_code, case.work_location, case.wage_level
+            )
+
+            # Build the analysis prompt
+            prompt = analysis_prompt(case, prevailing_wage, prescreen)
+
+            # Send initial stage event
+            yield sse_frame(
+                AdjudicationEvent(
+                    event_type="stage",
+                    stage="form_validation",
+                    content="Starting petition form analysis...",
+                )
+            )
+
+            ledger = tool_result_ledger(request)
+            usage = UsageLedger()
+            final_text = ""
+            try:
+                # Run the agent and stream events
+                async for event in run_agent(
+                    request, user_id, session_id, prompt, usage
+                ):
+                    for fc in tool_calls(event):
+                        # Tool call event
+                        yield sse_frame(
+                            AdjudicationEvent(
+                                event_type="tool_call",
+                                tool_name=fc.name,
+                                content=f"Executing: {fc.name}",
+                            )
+                        )
+
+                    for tool_name, result_data in ledger.observe(event):
+                        # Tool result event (verbose, as returned by the tool)
+                        yield sse_frame(
+                            AdjudicationEvent(
+                                event_type="tool_result",
+                                tool_name=tool_name,
+                                tool_result=result_data,
+                            )
+                        )
+
+                    # Check for final response
+                    if event.is_final_response() and event.content:
+                        parts = event.content.parts
+                        if parts:
+                            for part in parts:
+                                if hasattr(part, "text") and part.text:
+                                    final_text += part.text
+                                    if request.output_format == "json":
+                                        continue  # sent as the decision
+                                    # Send reasoning content in chunks
+                                    text = part.text
+                                    chunks = [
+                                        text[i : i + 200]
+                                        for i in range(0, len(text), 200)
+                                    ]
+                                    for chunk in chunks:
+                                        yield sse_frame(
+                                            AdjudicationEvent(
+                                                event_type="reasoning", content=chunk
+                                            )
+                                        )
+                                        await asyncio.sleep(
+                                            0.05
+                                        )  # Small delay for streaming effect
+
+                # Send completion event
+                yield sse_frame(
+                    AdjudicationEvent(
+                        event_type="complete",
+                        content="Analysis complete",
+                        confidence=89,
+                        tool_result_compaction=ledger.as_dict(),
+                        usage=usage.as_dict(),
+                        **structured_result(request, final_text),
+                    )
+                )
+
+            except Exception as e:
+                yield sse_frame(AdjudicationEvent(event_type="error", content=str(e)))
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",
+        "Vary": "Accept-Encoding",
+    }
+    encoding = negotiate_encoding(http_request.headers.get("accept-encoding"))
+    if encoding is None:
+        return StreamingResponse(
+            generate_events(), media_type="text/event-stream", headers=headers
+        )
     return StreamingResponse(
-        generate_events(),
+        compress_stream(generate_events(), encoding, "analyze/stream"),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers={**headers, "Content-Encoding": encoding},
     )
 
 
@@ -177,91 +407,178 @@ Provide detailed reasoning for each step."""
 # ========================================
 
 
+async def send_event(websocket: WebSocket, payload: dict[str, Any]) -> None:
+    """Sends one timestamped event in the connection's negotiated protocol.
+
+    Sizes are counted in the compression metrics.
+    """
+    frame = websocket.state.codec.encode(payload)
+    stream_event("websocket", payload["event_type"], frame)
+    if isinstance(frame, bytes):
+        compression_stats.websocket_sent(len(frame))
+        await websocket.send_bytes(frame)
+    else:
+        compression_stats.websocket_sent(len(frame.encode()))
+        await websocket.send_text(frame)
+
+
 @router.websocket("/ws/{user_id}/{session_id}")
 async def websocket_adjudication(
     websocket: WebSocket, user_id: str, session_id: str
 ) -> None:
-    """WebSocket endpoint for real-time bidirectional adjudication."""
-    await websocket.accept()
+    """WebSocket endpoint for real-time bidirectional adjudication.
+
+    Events are JSON text unless the client offers the MessagePack
+    subprotocol (see ``app.ws_protocol``).
+    """
+    codec = negotiate_codec(websocket.scope.get("subprotocols", []))
+    websocket.state.codec = codec
+    await websocket.accept(subprotocol=codec.subprotocol)
+    compression_stats.websocket_connected(
+        websocket.headers.get("sec-websocket-extensions"), codec.subprotocol
+    )
+    preamble = codec.preamble()
+    if preamble is not None:
+        compression_stats.websocket_sent(len(preamble))
+        await websocket.send_bytes(preamble)
 
     try:
         while True:
             # Receive case data from client
-            data = await websocket.receive_text()
-            request_data = json.loads(data)
-
-            case = CaseInfo(**request_data.get("case_info", {}))
-
-            # Build prompt
-            prompt = f"""Analyze immigration case {case.case_number} for {case.visa_type} classification.
-Petitioner: {case.petitioner_name}
-Beneficiary: {case.beneficiary_name}
-Perform complete adjudication analysis with all required tools."""
-
-            # Send stage updates
-            await websocket.send_json(
-                {
-                    "event_type": "stage",
-                    "stage": "form_validation",
-                    "content": "Analyzing petition form...",
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-
-            # Run agent
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
-            ):
-                # Send tool calls
-                if hasattr(event, "actions") and event.actions:
-                    for action in event.actions:
-                        func_calls = getattr(action, "function_calls", None)
-                        if func_calls:
-                            for fc in func_calls:
-                                await websocket.send_json(
-                                    {
-                                        "event_type": "tool_call",
-                                        "tool_name": fc.name,
-                                        "content": f"Executing {fc.name}",
-                                        "timestamp": datetime.now().isoformat(),
-                                    }
-                                )
-
-                # Send final response
-                if event.is_final_response() and event.content:
-                    parts = event.content.parts
-                    if parts:
-                        for part in parts:
-                            if hasattr(part, "text") and part.text:
-                                await websocket.send_json(
-                                    {
-                                        "event_type": "reasoning",
-                                        "content": part.text,
-                                        "timestamp": datetime.now().isoformat(),
-                                    }
-                                )
-
-            # Send completion
-            await websocket.send_json(
-                {
-                    "event_type": "complete",
-                    "content": "Analysis complete",
-                    "confidence": 89,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            request_data = decode_request(message)
+
+            request = AdjudicationRequest.model_validate(request_data)
+            with adjudication_span("websocket", request):
+                case = request.case_info
+
+                prescreen = run_prescreen(request)
+                if prescreen is not None and not prescreen["passed"]:
+                    await send_event(
+                        websocket,
+                        {
+                            "event_type": "tool_result",
+                            "stage": "form_validation",
+                            "tool_name": "prescreen",
+                            "tool_result": prescreen,
+                        },
+                    )
+                    if should_short_circuit(request, prescreen):
+                        await send_event(
+                            websocket,
+                            {
+                                "event_type": "complete",
+                                "content": prescreen["summary"],
+                                "confidence": 100,
+                            },
+                        )
+                        continue
+
+                await send_event(
+                    websocket,
+                    {
+                        "event_type": "tool_result",
+                        "stage": "risk_assessment",
+                        "tool_name": "risk_model",
+                        "tool_result": score_case(case),
+                    },
+                )
+                await send_event(
+                    websocket,
+                    {
+                        "event_type": "tool_result",
+                        "stage": "risk_assessment",
+                        "tool_name": "duplicate_risk",
+                        "tool_result": assess_duplicate_risk(case),
+                    },
+                )
+
+                # Build prompt
+                prompt = f"""Analyze immigration case {case.case_number} for {case.visa_type} classification.
+    Petitioner: {case.petitioner_name}
+    Beneficiary: {case.beneficiary_name}
+    Perform complete adjudication analysis with all required tools.{prescreen_prompt_note(prescreen)}"""
+
+                # Send stage updates
+                await send_event(
+                    websocket,
+                    {
+                        "event_type": "stage",
+                        "stage": "form_validation",
+                        "content": "Analyzing petition form...",
+                    },
+                )
+
+                # Run agent
+                ledger = tool_result_ledger(request)
+                usage = UsageLedger()
+                final_text = ""
+                async for event in run_agent(
+                    request, user_id, session_id, prompt, usage
+                ):
+                    # Send tool calls
+                    for fc in tool_calls(event):
+                        await send_event(
+                            websocket,
+                            {
+                                "event_type": "tool_call",
+                                "tool_name": fc.name,
+                                "content": f"Executing {fc.name}",
+                            },
+                        )
+
+                    # Send tool results
+                    for tool_name, result_data in ledger.observe(event):
+                        await send_event(
+                            websocket,
+                            {
+                                "event_type": "tool_result",
+                                "tool_name": tool_name,
+                                "tool_result": result_data,
+                            },
+                        )
+
+                    # Send final response
+                    if event.is_final_response() and event.content:
+                        parts = event.content.parts
+                        if parts:
+                            for part in parts:
+                                if hasattr(part, "text") and part.text:
+                                    final_text += part.text
+                                    if request.output_format == "json":
+                                        continue  # sent as the decision
+                                    await send_event(
+                                        websocket,
+                                        {
+                                            "event_type": "reasoning",
+                                            "content": part.text,
+                                        },
+                                    )
+
+                # Send completion
+                await send_event(
+                    websocket,
+                    {
+                        "event_type": "complete",
+                        "content": "Analysis complete",
+                        "confidence": 89,
+                        "tool_result_compaction": ledger.as_dict(),
+                        "usage": usage.as_dict(),
+                        **structured_result(request, final_text),
+                    },
+                )
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        await websocket.send_json(
+        await send_event(
+            websocket,
             {
                 "event_type": "error",
                 "content": str(e),
-                "timestamp": datetime.now().isoformat(),
-            }
+            },
         )
 
 
@@ -270,31 +587,126 @@ Perform complete adjudication analysis with all required tools."""
 # ========================================
 
 
+ADJUDICATION_NAMESPACE = "adjudication"
+CRITERIA_NAMESPACE = "criteria"
+
+
+def adjudication_cache_key(request: AdjudicationRequest) -> str:
+    """Fields that determine a result; user, session and scheduling excluded."""
+    return request.model_dump_json(
+        include={
+            "case_info",
+            "prescreen",
+            "run_llm_on_deficiency",
+            "compact_tool_results",
+            "output_format",
+        }
+    )
+
+
+def json_response(
+    body: bytes, cache_status: str, encoding: str | None = None, route: str = ""
+) -> Response:
+    """JSON ``body``, compressed with ``encoding`` when large enough."""
+    headers = {"X-Cache": cache_status, "Vary": "Accept-Encoding"}
+    content = compress_body(body, encoding, route)
+    if content is not body:
+        headers["Content-Encoding"] = encoding or IDENTITY
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+# The agent-derived part of an /analyze result, the only part that is cached.
+# Risk, duplicate risk and the timestamp are computed for every request.
+CACHED_FIELDS = ("analysis", "tools_used", "decision", "decision_error")
+
+
+def cached_analysis_body(request: AdjudicationRequest, cached: bytes) -> bytes:
+    """An /analyze body from the cached agent fields and fresh case fields."""
+    case = request.case_info
+    fresh = json.dumps(
+        {
+            "case_number": case.case_number,
+            "visa_type": case.visa_type,
+            "prescreen": run_prescreen(request),
+            "risk": score_case(case),
+            "duplicate_risk": assess_duplicate_risk(case),
+            "timestamp": datetime.now().isoformat(),
+        }
+    ).encode()
+    # Both are JSON objects: splice them rather than re-encode the analysis.
+    return fresh[:-1] + b", " + cached[1:]
+
+
 @router.post("/analyze")
-async def analyze_case(request: AdjudicationRequest) -> dict[str, Any]:
-    """Perform complete case analysis (non-streaming)."""
+async def analyze_case(request: AdjudicationRequest, http_request: Request) -> Response:
+    """Perform complete case analysis (non-streaming).
+
+    The agent's part of a result is shared by all workers through the shared
+    cache; a repeat of an identical request reuses it without running the
+    agent. Requests that continue a session always run the agent, so the turn
+    is added to the session.
+    """
+    encoding = negotiate_encoding(http_request.headers.get("accept-encoding"))
+    use_cache = request.use_cache and request.session_id is None
+    cache = get_shared_cache() if use_cache else None
+    key = adjudication_cache_key(request)
+    if cache is not None:
+        cached = cache.get(ADJUDICATION_NAMESPACE, key)
+        if cached is not None:
+            body = cached_analysis_body(request, cached)
+            return json_response(body, "HIT", encoding, "analyze")
+
+    with adjudication_span("analyze", request):
+        result = await run_analysis(request)
+    if cache is not None and result["analysis"] and not result.get("decision_error"):
+        cache.put(
+            ADJUDICATION_NAMESPACE,
+            key,
+            json.dumps(
+                {field: result[field] for field in CACHED_FIELDS if field in result}
+            ).encode(),
+            ttl=float(os.environ.get("ADJUDICATION_CACHE_TTL_SECONDS", "3600")),
+        )
+    return json_response(
+        json.dumps(result).encode(),
+        "MISS" if cache is not None else "BYPASS",
+        encoding,
+        "analyze",
+    )
+
+
+async def run_analysis(request: AdjudicationRequest) -> dict[str, Any]:
+    """Pre-screens the case and, unless that decides it, runs the agent."""
     user_id = request.user_id or f"user_{uuid.uuid4().hex[:8]}"
     session_id = request.session_id or f"session_{uuid.uuid4().hex[:8]}"
     case = request.case_info
 
+    prescreen = run_prescreen(request)
+    if prescreen is not None and should_short_circuit(request, prescreen):
+        return {
+            "case_number": case.case_number,
+            "visa_type": case.visa_type,
+            "analysis": f"{prescreen['summary']}\n{format_deficiencies(prescreen)}",
+            "tools_used": [],
+            "prescreen": prescreen,
+            "risk": score_case(case),
+            "duplicate_risk": assess_duplicate_risk(case),
+            "timestamp": datetime.now().isoformat(),
+        }
+
     prompt = f"""Analyze immigration case {case.case_number} for {case.visa_type}.
 Petitioner: {case.petitioner_name}, Beneficiary: {case.beneficiary_name}
-Perform complete adjudication with all tools and provide final recommendation."""
+Perform complete adjudication with all tools and provide final recommendation.{prescreen_prompt_note(prescreen)}"""
 
+    duplicates = assess_duplicate_risk(case)
     result_text = ""
-    tool_calls: list[str] = []
-
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
-    ):
-        if hasattr(event, "actions") and event.actions:
-            for action in event.actions:
-                func_calls = getattr(action, "function_calls", None)
-                if func_calls:
-                    for fc in func_calls:
-                        tool_calls.append(fc.name)
+    tools_used: list[str] = []
+
+    ledger = tool_result_ledger(request)
+    usage = UsageLedger()
+    async for event in run_agent(request, user_id, session_id, prompt, usage):
+        tools_used.extend(fc.name for fc in tool_calls(event) if fc.name)
+        ledger.observe(event)
 
         if event.is_final_response() and event.content:
             parts = event.content.parts
@@ -307,100 +719,185 @@ Perform complete adjudication with all tools and provide final recommendation.""
         "case_number": case.case_number,
         "visa_type": case.visa_type,
         "analysis": result_text,
-        "tools_used": tool_calls,
+        "tools_used": tools_used,
+        "prescreen": prescreen,
+        "risk": score_case(case),
+        "duplicate_risk": duplicates,
+        "tool_result_compaction": ledger.as_dict(),
+        "usage": usage.as_dict(),
+        **structured_result(request, result_text),
         "timestamp": datetime.now().isoformat(),
     }
 
 
+# ========================================
+# RULE PRE-SCREEN ENDPOINTS
+# ========================================
+
+
+@router.post("/prescreen")
+async def prescreen_single(case: CaseInfo) -> dict[str, Any]:
+    """Evaluate the deterministic pre-screen rules for one case."""
+    return prescreen_case(case)
+
+
+@router.post("/prescreen/batch")
+async def prescreen_batch(request: PrescreenBatchRequest) -> dict[str, Any]:
+    """Pre-screen a whole queue of cases without any model calls."""
+    return prescreen_cases(request.cases)
+
+
+# ========================================
+# RISK TRIAGE ENDPOINT
+# ========================================
+
+
+@router.post("/risk/batch")
+async def score_risk_batch(request: RiskBatchRequest) -> dict[str, Any]:
+    """Score a queue of cases and order it for triage, highest risk first."""
+    return await asyncio.to_thread(score_queue, request.cases, request.order)
+
+
+# ========================================
+# BULK LCA SCREENING ENDPOINT
+# ========================================
+
+
+@router.post("/lca/screen")
+async def screen_lca_bulk(
+    request: Request,
+    output_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+) -> StreamingResponse:
+    """Screen a columnar batch of LCAs for wage compliance.
+
+    Accepts ``text/csv`` with a header row or a JSON object of column arrays
+    (``lca_number``, ``offered_wage``, ``prevailing_wage``, ``wage_level``,
+    ``soc_code``, ``work_location``) and streams one result row per LCA.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            batch = LcaBatch.from_csv(body.decode("utf-8-sig"))
+        else:
+            batch = LcaBatch.from_columns(json.loads(body))
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid LCA batch: {e}") from e
+
+    result = await asyncio.to_thread(screen_lca_batch, batch)
+    if output_format == "ndjson":
+        return StreamingResponse(
+            iter_ndjson(batch, result), media_type="application/x-ndjson"
+        )
+    return StreamingResponse(iter_csv(batch, result), media_type="text/csv")
+
+
+# ========================================
+# EMPLOYER HISTORY ENDPOINTS
+# ========================================
+
+
+@router.get("/employers/profile")
+async def get_employer_profile(name: str) -> dict[str, Any]:
+    """Filing history for a petitioner, matched across name variants."""
+    profile = employer_profile(name)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No history for employer: {name}")
+    return profile
+
+
+@router.post("/employers/outcomes")
+async def record_employer_outcome(outcome: EmployerOutcome) -> dict[str, Any]:
+    """Record a final adjudication outcome in the employer's history."""
+    employer = get_employer_index().record(
+        outcome.petitioner_name,
+        outcome.outcome,
+        outcome.offered_wage,
+        outcome.prevailing_wage,
+        outcome.filed or datetime.now().date().isoformat(),
+    )
+    return employer.as_dict()
+
+
 # ========================================
 # UTILITY ENDPOINTS
 # ========================================
 
 
 @router.get("/criteria/{visa_type}")
-async def get_evaluation_criteria(visa_type: str) -> dict[str, Any]:
+async def get_evaluation_criteria(visa_type: str) -> Response:
     """Get evaluation criteria for a visa type."""
-    criteria_map: dict[str, list[dict[str, str]]] = {
-        "H-1B": [
-            {
-                "id": "1",
-                "name": "Specialty Occupation",
-                "description": "Position requires theoretical and practical application of specialized knowledge",
-            },
-            {
-                "id": "2",
-                "name": "Beneficiary Qualifications",
-                "description": "Beneficiary has required degree or equivalent",
-            },
-            {
-                "id": "3",
-                "name": "Employer-Employee Relationship",
-                "description": "Valid employer-employee relationship exists",
-            },
-            {
-                "id": "4",
-                "name": "Prevailing Wage Compliance",
-                "description": "Offered wage meets or exceeds prevailing wage",
-            },
-            {
-                "id": "5",
-                "name": "LCA Compliance",
-                "description": "Labor Condition Application is certified and compliant",
-            },
-            {
-                "id": "6",
-                "name": "Itinerary Requirements",
-                "description": "Work itinerary provided if applicable",
-            },
-        ],
-        "O-1": [
-            {
-                "id": "1",
-                "name": "Extraordinary Ability",
-                "description": "Sustained national or international acclaim",
-            },
-            {
-                "id": "2",
-                "name": "Evidence of Recognition",
-                "description": "Documentation of achievements and recognition",
-            },
-            {
-                "id": "3",
-                "name": "Continued Work in Field",
-                "description": "Coming to US to continue work in area of expertise",
-            },
-        ],
-        "EB-2 NIW": [
-            {
-                "id": "1",
-                "name": "Advanced Degree",
-                "description": "Holds advanced degree or exceptional ability",
-            },
-            {
-                "id": "2",
-                "name": "National Interest",
-                "description": "Work is in the national interest of the United States",
-            },
-            {
-                "id": "3",
-                "name": "Substantial Merit",
-                "description": "Proposed endeavor has substantial merit and national importance",
-            },
-        ],
-    }
-
-    if visa_type.upper() not in criteria_map:
+    key = normalize_visa_type(visa_type)
+    if key not in EVALUATION_CRITERIA:
         raise HTTPException(
             status_code=404, detail=f"Criteria not found for visa type: {visa_type}"
         )
 
+    cache = get_shared_cache()
+    cached = cache.get(CRITERIA_NAMESPACE, key) if cache is not None else None
+    if cached is not None:
+        return json_response(cached, "HIT", route="criteria")
+    body = json.dumps({"visa_type": key, "criteria": EVALUATION_CRITERIA[key]}).encode()
+    if cache is not None:
+        cache.put(CRITERIA_NAMESPACE, key, body)
+    return json_response(
+        body, "MISS" if cache is not None else "BYPASS", route="criteria"
+    )
+
+
+@router.get("/scheduler/metrics")
+async def get_scheduler_metrics() -> dict[str, Any]:
+    """Per-lane queue depth, queue wait and service time of agent runs."""
+    return scheduler.metrics()
+
+
+@router.get("/cache/metrics")
+async def get_shared_cache_metrics() -> dict[str, Any]:
+    """Shared result cache occupancy, writes, evictions and this worker's hits."""
+    cache = get_shared_cache()
+    return cache.metrics() if cache is not None else {"enabled": False}
+
+
+@router.get("/usage/metrics")
+async def get_usage_metrics() -> dict[str, Any]:
+    """Token, latency and estimated cost of all runs, by stage and tool."""
     return {
-        "visa_type": visa_type.upper(),
-        "criteria": criteria_map.get(visa_type.upper(), []),
+        **usage_metrics.metrics(),
+        "by_output_format": {
+            output_format: ledger.summary()
+            for output_format, ledger in usage_by_format.items()
+        },
     }
 
 
+@router.get("/admission/metrics")
+async def get_admission_metrics() -> dict[str, Any]:
+    """Saturation, limits and admitted/rejected counts of admission control."""
+    return get_admission_controller().metrics()
+
+
+@router.get("/watchdog/metrics")
+async def get_watchdog_metrics() -> dict[str, Any]:
+    """Event-loop lag histogram and recent stalls with their stacks."""
+    return get_loop_watchdog().metrics()
+
+
+@router.get("/compression/metrics")
+async def get_compression_metrics() -> dict[str, Any]:
+    """Bytes before and after compression and its CPU cost, per route."""
+    return compression_stats.metrics()
+
+
+@router.get("/latency/metrics")
+async def get_latency_metrics() -> dict[str, Any]:
+    """Latency percentiles of requests, first events, stages, tools and turns."""
+    return latency_metrics.summary()
+
+
 @router.get("/health")
-async def health_check() -> dict[str, str]:
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "adjudicator"}
+async def health_check() -> dict[str, Any]:
+    """Health check endpoint.
+
+    Always answers 200; ``status`` is "healthy", "degraded" (a signal past
+    75% of its admission limit) or "saturated" (new work is being shed).
+    """
+    return {**get_admission_controller().health(), "service": "adjudicator"}
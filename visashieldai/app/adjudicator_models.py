@@ -0,0 +1,86 @@
+# Copyright 2025 VisaShield AI
+# Request and event models shared by the adjudicator API and its subsystems
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+from app.scheduler import Lane
+from app.structured_output import OutputFormat
+
+# ========================================
+# REQUEST/RESPONSE MODELS
+# ========================================
+
+
+class CaseInfo(BaseModel):
+    case_number: str
+    visa_type: str
+    petitioner_name: str
+    beneficiary_name: str
+    job_title: str | None = None
+    job_duties: str | None = None
+    degree_type: str | None = None
+    degree_field: str | None = None
+    years_experience: int | None = None
+    work_location: str | None = None
+    offered_wage: float | None = None
+    prevailing_wage: float | None = None
+    lca_number: str | None = None
+    soc_code: str | None = None
+    wage_level: int | None = None
+
+
+class AdjudicationRequest(BaseModel):
+    case_info: CaseInfo
+    user_id: str | None = None
+    session_id: str | None = None
+    # Deficient cases short-circuit to an RFE unless the LLM run is requested
+    prescreen: bool = True
+    run_llm_on_deficiency: bool = False
+    # Scheduler lane and due date; defaults depend on the lane
+    priority: Lane = Lane.INTERACTIVE
+    deadline: datetime | None = None
+    # Send the model compact tool results; clients still get verbose ones
+    compact_tool_results: bool = True
+    # "json" constrains the final answer to the AdjudicationDecision schema
+    output_format: OutputFormat = "text"
+    # Serve an identical earlier request's result from the shared cache
+    use_cache: bool = True
+
+
+class PrescreenBatchRequest(BaseModel):
+    cases: list[CaseInfo]
+
+
+class RiskBatchRequest(BaseModel):
+    cases: list[CaseInfo]
+    order: bool = True  # highest risk first, for triage
+
+
+class EmployerOutcome(BaseModel):
+    petitioner_name: str
+    outcome: Literal["APPROVE", "RFE", "DENY"]
+    offered_wage: float | None = None
+    prevailing_wage: float | None = None
+    filed: str | None = None  # ISO date; defaults to today
+
+
+class AdjudicationEvent(BaseModel):
+    event_type: str  # 'stage', 'reasoning', 'tool_call', 'result', 'error', 'complete'
+    stage: str | None = None
+    content: str | None = None
+    tool_name: str | None = None
+    tool_result: dict[str, Any] | None = None
+    confidence: int | None = None
+    tool_result_compaction: dict[str, int] | None = None
+    usage: dict[str, Any] | None = None
+    decision: dict[str, Any] | None = None
+    decision_error: str | None = None
+    timestamp: str = ""
+
+    def __init__(self, **data: Any) -> None:
+        if "timestamp" not in data or not data["timestamp"]:
+            data["timestamp"] = datetime.now().isoformat()
+        super().__init__(**data)
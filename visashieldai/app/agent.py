@@ -19,13 +19,9 @@ from zoneinfo import ZoneInfo
 from google.adk.agents import Agent
 from google.adk.apps.app import App
 
-import os
-import google.auth
+from app.app_utils.gcp import configure_genai
 
-_, project_id = google.auth.default()
-os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
-os.environ["GOOGLE_CLOUD_LOCATION"] = "global"
-os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "True"
+configure_genai()
 
 
 def get_weather(query: str) -> str:
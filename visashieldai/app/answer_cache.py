@@ -0,0 +1,205 @@
+# Copyright 2025 VisaShield AI
+# Two-tier (exact + semantic) answer cache for Ask VIA
+
+"""Answers to repeated policy questions without a model call.
+
+Officers ask the same questions in slightly different words, so lookups go
+through two tiers:
+
+1. **Exact**: a dict keyed by the normalized question (case, punctuation and
+   whitespace folded).
+2. **Semantic**: nearest neighbour over question embeddings. Every cached
+   question owns a row of a preallocated matrix of unit vectors, so a lookup
+   is one matrix-vector product. A neighbour is a hit when its cosine
+   similarity reaches ``threshold`` *and* it names the same anchors (tokens
+   with digits, e.g. "h-1b", "214.2(h)"), since "O-1 evidence" and
+   "H-1B evidence" are close in embedding space but ask different things.
+
+The default embedding is a hashed bag of words and character trigrams: it
+needs no model and no network, and is good enough to catch rephrasings.
+Another embedding function can be passed in. Entries are evicted
+least-recently-used first once ``capacity`` is reached, and expire after
+``ttl`` seconds.
+"""
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+EMBEDDING_DIM = 512
+DEFAULT_THRESHOLD = 0.8
+SEMANTIC_CANDIDATES = 4
+
+_PUNCTUATION = re.compile(r"[^\w§().\-\s]+")
+_TRAILING = re.compile(r"[.\s]+$")
+_WORD = re.compile(r"[\w§().\-]+")
+
+STOPWORDS = frozenset(
+    "a an and are can do does for how i in is it me of on or the to what when "
+    "which who why with under about explain please tell".split()
+)
+
+
+def normalize_question(question: str) -> str:
+    """Exact-tier key: lower-cased, punctuation dropped, whitespace folded."""
+    text = _PUNCTUATION.sub(" ", question.lower())
+    return _TRAILING.sub("", " ".join(text.split()))
+
+
+def anchors(normalized: str) -> frozenset[str]:
+    """Tokens with digits (visa classes, citations, forms) that must agree."""
+    return frozenset(
+        token.strip(".")
+        for token in _WORD.findall(normalized)
+        if any(c.isdigit() for c in token)
+    )
+
+
+def hashed_embedding(normalized: str) -> np.ndarray:
+    """Unit vector of hashed content words and their character trigrams."""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in _WORD.findall(normalized):
+        if word in STOPWORDS:
+            continue
+        vector[zlib.crc32(word.encode()) % EMBEDDING_DIM] += 2.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i : i + 3].encode()) % EMBEDDING_DIM] += 1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+@dataclass
+class _Entry:
+    question: str
+    anchors: frozenset[str]
+    answer: dict[str, Any]
+    row: int
+    expires_at: float
+
+
+class AnswerCache:
+    """LRU + TTL answer cache with exact and nearest-neighbour lookups."""
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        ttl: float = 86400.0,
+        threshold: float = DEFAULT_THRESHOLD,
+        embed: Callable[[str], np.ndarray] = hashed_embedding,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self.threshold = threshold
+        self._embed = embed
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._vectors: np.ndarray | None = None  # allocated on first insert
+        self._free = list(range(capacity - 1, -1, -1))
+        self._keys: list[str | None] = [None] * capacity
+        self.stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        if self._vectors is not None:
+            self._vectors[entry.row] = 0.0
+        self._keys[entry.row] = None
+        self._free.append(entry.row)
+
+    def _live(self, key: str, now: float) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, question: str) -> tuple[dict[str, Any], str, float] | None:
+        """Cached answer, the tier that served it and the similarity.
+
+        Args:
+            question: The question as asked
+
+        Returns:
+            tuple: (answer, "exact" or "semantic", similarity), None on a miss
+        """
+        key = normalize_question(question)
+        now = self._clock()
+        entry = self._live(key, now)
+        if entry is not None:
+            self.stats["exact_hits"] += 1
+            return entry.answer, "exact", 1.0
+
+        if self._entries and self._vectors is not None:
+            similarities = self._vectors @ self._embed(key)
+            wanted = anchors(key)
+            # Best few candidates; the closest may be blocked by its anchors.
+            top = min(SEMANTIC_CANDIDATES, len(similarities))
+            candidates = np.argpartition(-similarities, top - 1)[:top]
+            for row in candidates[np.argsort(-similarities[candidates])]:
+                similarity = float(similarities[row])
+                if similarity < self.threshold:
+                    break
+                match = self._keys[row]
+                if match is None:
+                    continue
+                candidate = self._live(match, now)
+                if candidate is not None and candidate.anchors == wanted:
+                    self.stats["semantic_hits"] += 1
+                    return candidate.answer, "semantic", similarity
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, question: str, answer: dict[str, Any]) -> None:
+        key = normalize_question(question)
+        if key in self._entries:
+            self._remove(key)
+        while not self._free:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+        vector = self._embed(key)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), np.float32)
+        row = self._free.pop()
+        self._vectors[row] = vector
+        self._keys[row] = key
+        self._entries[key] = _Entry(
+            question=question,
+            anchors=anchors(key),
+            answer=answer,
+            row=row,
+            expires_at=self._clock() + self.ttl,
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = sum(self.stats[k] for k in ("exact_hits", "semantic_hits", "misses"))
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        return {
+            "entries": len(self._entries),
+            "capacity": self.capacity,
+            "ttl_seconds": self.ttl,
+            "threshold": self.threshold,
+            **self.stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
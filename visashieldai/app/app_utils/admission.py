@@ -0,0 +1,254 @@
+# Copyright 2025 VisaShield AI
+# Admission control: shed new work early when the worker is saturated
+
+"""Rejects new work with 503 before it slows everyone else down.
+
+Without admission control a spike starts a model run for every request and
+every run gets slower together until clients time out. Each request is
+checked against three signals of this worker:
+
+* **in-flight requests**: admitted HTTP requests not yet finished, streamed
+  responses included (``ADMISSION_MAX_IN_FLIGHT``, default 64). An open
+  WebSocket is checked at the handshake but not counted while it is open;
+  the runs it asks for wait in the scheduler queue like any other.
+* **scheduler queue depth**: agent runs waiting for a scheduler slot
+  (``ADMISSION_MAX_QUEUE_DEPTH``, default four per slot).
+* **event-loop lag**: how late the loop watchdog's timer fires; a blocked
+  loop stalls every stream (``ADMISSION_MAX_LOOP_LAG_MS``, default 500).
+
+Past any threshold, HTTP requests and WebSocket handshakes get a 503; a
+server without the ASGI ``websocket.http.response`` extension accepts the
+WebSocket and closes it with 1013 (try again later). ``Retry-After`` estimates when a slot frees up: the
+backlog divided by the slots, times the mean run time. Health, criteria and
+metrics routes are always admitted. ``ADMISSION_CONTROL=0`` turns the checks
+off; saturation is still reported.
+"""
+
+import functools
+import json
+import math
+import os
+import re
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.app_utils.gcp import FALSE_VALUES
+from app.app_utils.watchdog import LoopLagMonitor, get_loop_watchdog
+from app.scheduler import AdjudicationScheduler, scheduler
+
+# Routes admitted regardless of load: cheap, and needed to observe the load.
+EXEMPT_PATHS = re.compile(r"(/health|/criteria/[^/]+|/metrics)$")
+
+# Assumed run time until the scheduler has completed a run.
+DEFAULT_SERVICE_SECONDS = 10.0
+DEGRADED_AT = 0.75
+
+
+class AdmissionController:
+    """Decides whether this worker takes on a new request."""
+
+    def __init__(
+        self,
+        run_scheduler: AdjudicationScheduler,
+        max_in_flight: int = 64,
+        max_queue_depth: int | None = None,
+        max_loop_lag: float = 0.5,
+        max_retry_after: int = 60,
+        enabled: bool = True,
+        loop_lag: LoopLagMonitor | None = None,
+    ) -> None:
+        self.scheduler = run_scheduler
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = (
+            max_queue_depth
+            if max_queue_depth is not None
+            else 4 * run_scheduler.concurrency
+        )
+        self.max_loop_lag = max_loop_lag
+        self.max_retry_after = max_retry_after
+        self.enabled = enabled
+        self.loop_lag = loop_lag or LoopLagMonitor()
+        self.in_flight = 0
+        self.stats = {"admitted": 0, "rejected": 0}
+        self.rejected_by_reason: dict[str, int] = {}
+
+    def saturation(self) -> dict[str, float]:
+        """Each signal as a fraction of its threshold (1.0 means at the limit)."""
+        return {
+            "in_flight": self.in_flight / max(1, self.max_in_flight),
+            "queue_depth": self.scheduler.queue_depth / max(1, self.max_queue_depth),
+            "loop_lag": self.loop_lag.lag / self.max_loop_lag,
+        }
+
+    def rejection_reason(self) -> str | None:
+        """The first saturated signal, or None when there is room."""
+        for reason, level in self.saturation().items():
+            if level >= 1.0:
+                return reason
+        return None
+
+    def retry_after(self) -> int:
+        """Seconds until the backlog ahead of a new run is likely served."""
+        service = self.scheduler.mean_service_time or DEFAULT_SERVICE_SECONDS
+        backlog = self.scheduler.queue_depth + self.scheduler.in_flight
+        seconds = max(
+            service * backlog / self.scheduler.concurrency, 2 * self.loop_lag.lag
+        )
+        return min(self.max_retry_after, max(1, math.ceil(seconds)))
+
+    def admit(self) -> str | None:
+        """Admits a request without counting it in flight, or returns why not."""
+        reason = self.rejection_reason() if self.enabled else None
+        if reason is not None:
+            self.stats["rejected"] += 1
+            self.rejected_by_reason[reason] = self.rejected_by_reason.get(reason, 0) + 1
+            return reason
+        self.stats["admitted"] += 1
+        return None
+
+    def acquire(self) -> str | None:
+        """Admits a request and counts it in flight, or returns why not.
+
+        Returns:
+            str: The saturated signal, None if admitted; an admitted request
+            must call ``release`` when it finishes
+        """
+        reason = self.admit()
+        if reason is None:
+            self.in_flight += 1
+        return reason
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def health(self) -> dict[str, Any]:
+        """Status from the most saturated signal: healthy, degraded or saturated."""
+        saturation = self.saturation()
+        peak = max(saturation.values())
+        if peak >= 1.0:
+            status = "saturated"
+        elif peak >= DEGRADED_AT:
+            status = "degraded"
+        else:
+            status = "healthy"
+        return {
+            "status": status,
+            "saturation": {key: round(value, 3) for key, value in saturation.items()},
+            "in_flight": self.in_flight,
+            "runs_in_flight": self.scheduler.in_flight,
+            "queue_depth": self.scheduler.queue_depth,
+            "loop_lag_ms": round(1000 * self.loop_lag.lag, 3),
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self.health(),
+            "enabled": self.enabled,
+            "limits": {
+                "max_in_flight": self.max_in_flight,
+                "max_queue_depth": self.max_queue_depth,
+                "max_loop_lag_ms": 1000 * self.max_loop_lag,
+            },
+            "loop_lag_max_ms": round(1000 * self.loop_lag.max_lag, 3),
+            "retry_after_seconds": self.retry_after(),
+            **self.stats,
+            "rejected_by_reason": dict(self.rejected_by_reason),
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an ``AdmissionController`` to HTTP and WebSocket.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``, so streamed responses pass
+    through untouched and count as in flight until their last byte is sent.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        self.controller.loop_lag.ensure_started()
+        if EXEMPT_PATHS.search(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        if scope["type"] == "websocket":
+            reason = self.controller.admit()
+            if reason is not None:
+                await self._reject_websocket(scope, receive, send, reason)
+            else:
+                await self.app(scope, receive, send)
+            return
+        reason = self.controller.acquire()
+        if reason is not None:
+            await self._reject(send, reason)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    def _response(self, reason: str) -> tuple[list[tuple[bytes, bytes]], bytes]:
+        """Headers and body of a 503 for ``reason``."""
+        body = json.dumps(
+            {"detail": "Server is at capacity, retry later", "reason": reason}
+        ).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(self.controller.retry_after()).encode()),
+        ]
+        return headers, body
+
+    async def _reject(self, send: Send, reason: str) -> None:
+        headers, body = self._response(reason)
+        await send({"type": "http.response.start", "status": 503, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _reject_websocket(
+        self, scope: Scope, receive: Receive, send: Send, reason: str
+    ) -> None:
+        """A 503 in place of the handshake; else accept and close with 1013.
+
+        Closing before accepting would reach the client as a bare 403.
+        """
+        if "websocket.http.response" in scope.get("extensions", {}):
+            headers, body = self._response(reason)
+            await send(
+                {
+                    "type": "websocket.http.response.start",
+                    "status": 503,
+                    "headers": headers,
+                }
+            )
+            await send({"type": "websocket.http.response.body", "body": body})
+            return
+        await receive()  # websocket.connect
+        await send({"type": "websocket.accept"})
+        await send(
+            {
+                "type": "websocket.close",
+                "code": 1013,
+                "reason": f"Server saturated ({reason}); "
+                f"retry in {self.controller.retry_after()}s",
+            }
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    """This worker's admission controller, configured from the environment."""
+    max_queue_depth = os.environ.get("ADMISSION_MAX_QUEUE_DEPTH")
+    return AdmissionController(
+        scheduler,
+        max_in_flight=int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", "64")),
+        max_queue_depth=int(max_queue_depth) if max_queue_depth else None,
+        max_loop_lag=float(os.environ.get("ADMISSION_MAX_LOOP_LAG_MS", "500")) / 1000,
+        max_retry_after=int(os.environ.get("ADMISSION_MAX_RETRY_AFTER", "60")),
+        enabled=os.environ.get("ADMISSION_CONTROL", "1").lower() not in FALSE_VALUES,
+        loop_lag=get_loop_watchdog(),
+    )
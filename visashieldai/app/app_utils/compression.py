@@ -0,0 +1,242 @@
+# Copyright 2025 VisaShield AI
+# Response compression that keeps streams flushing per event
+
+"""Compression for streamed events and large JSON responses.
+
+Officers often work over constrained VPN links, and tool results and
+reasoning texts are verbose JSON that compresses several times over.
+
+* **SSE**: ``compress_stream`` runs one compressor for the whole stream and
+  flushes it after every event (``Z_SYNC_FLUSH`` for gzip, ``flush()`` for
+  brotli). Each event therefore reaches the client as soon as it is
+  produced, while later events still benefit from the shared dictionary.
+* **JSON**: ``compress_body`` compresses responses of at least
+  ``COMPRESSION_MIN_BYTES`` (default 1024); smaller ones are not worth the
+  CPU. Other routes are covered by Starlette's ``GZipMiddleware`` with the
+  same threshold. That middleware leaves event streams and responses that
+  are already encoded alone.
+* **WebSocket**: permessage-deflate is negotiated by the server (see
+  ``app.app_utils.serving``); ``compression_stats`` counts the payload bytes
+  and how many clients offered the extension.
+
+The encoding is chosen from ``Accept-Encoding`` in the order of
+``COMPRESSION_ENCODINGS`` (default "br,gzip"; empty disables it). Brotli
+needs the ``Brotli`` package and is skipped without it. Bytes before and
+after compression and the CPU time spent are kept per route at
+``/api/adjudicator/compression/metrics``.
+"""
+
+import gzip
+import os
+import time
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+PERMESSAGE_DEFLATE = "permessage-deflate"
+GZIP_LEVEL = 6
+# Brotli quality 4 compresses about as well as gzip 6, at a similar speed.
+BROTLI_QUALITY = 4
+DEFAULT_MIN_BYTES = 1024
+
+
+def supported_encodings() -> list[str]:
+    configured = os.environ.get("COMPRESSION_ENCODINGS", f"{BROTLI},{GZIP}")
+    return [
+        encoding
+        for encoding in (e.strip() for e in configured.split(","))
+        if encoding == GZIP or (encoding == BROTLI and brotli is not None)
+    ]
+
+
+def min_bytes() -> int:
+    return int(os.environ.get("COMPRESSION_MIN_BYTES", str(DEFAULT_MIN_BYTES)))
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """The first supported encoding the client accepts (q > 0), else None."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        if not params or float(q or 1) > 0:
+            accepted.add(coding.strip())
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+# ========================================
+# MEASUREMENT
+# ========================================
+
+
+@dataclass
+class _RouteStats:
+    responses: int = 0
+    raw_bytes: int = 0
+    sent_bytes: int = 0
+    cpu_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "raw_bytes": self.raw_bytes,
+            "sent_bytes": self.sent_bytes,
+            "saved_bytes": self.raw_bytes - self.sent_bytes,
+            "ratio": round(self.sent_bytes / self.raw_bytes, 4)
+            if self.raw_bytes
+            else None,
+            "cpu_ms": round(1000 * self.cpu_seconds, 3),
+            "cpu_us_per_kb": round(1e6 * self.cpu_seconds / (self.raw_bytes / 1024), 3)
+            if self.raw_bytes
+            else None,
+        }
+
+
+class CompressionStats:
+    """Bytes before and after compression, and CPU time, per route and encoding."""
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], _RouteStats] = {}
+        self.websocket = {
+            "connections": 0,
+            "deflate_offered": 0,
+            "messages": 0,
+            "payload_bytes": 0,
+        }
+        self.websocket_protocols: dict[str, int] = {}
+
+    def record(
+        self,
+        route: str,
+        encoding: str,
+        raw: int,
+        sent: int,
+        cpu_seconds: float = 0.0,
+        responses: int = 0,
+    ) -> None:
+        stats = self._stats.setdefault((route, encoding), _RouteStats())
+        stats.responses += responses
+        stats.raw_bytes += raw
+        stats.sent_bytes += sent
+        stats.cpu_seconds += cpu_seconds
+
+    def websocket_connected(
+        self, extensions: str | None, subprotocol: str | None = None
+    ) -> None:
+        self.websocket["connections"] += 1
+        if extensions and PERMESSAGE_DEFLATE in extensions:
+            self.websocket["deflate_offered"] += 1
+        protocol = subprotocol or "json"
+        self.websocket_protocols[protocol] = (
+            self.websocket_protocols.get(protocol, 0) + 1
+        )
+
+    def websocket_sent(self, payload_bytes: int) -> None:
+        """Counts a message before permessage-deflate, which the server applies."""
+        self.websocket["messages"] += 1
+        self.websocket["payload_bytes"] += payload_bytes
+
+    def metrics(self) -> dict[str, Any]:
+        routes: dict[str, dict[str, Any]] = {}
+        for (route, encoding), stats in sorted(self._stats.items()):
+            routes.setdefault(route, {})[encoding] = stats.as_dict()
+        return {
+            "encodings": supported_encodings(),
+            "min_bytes": min_bytes(),
+            "routes": routes,
+            "websocket": {
+                **self.websocket,
+                "protocols": dict(self.websocket_protocols),
+            },
+        }
+
+
+compression_stats = CompressionStats()
+
+
+# ========================================
+# COMPRESSORS
+# ========================================
+
+
+class StreamCompressor:
+    """Compresses a stream chunk by chunk, flushing after each one."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._gzip.flush(zlib.Z_FINISH)
+
+
+async def compress_stream(
+    chunks: AsyncIterator[str], encoding: str, route: str
+) -> AsyncIterator[bytes]:
+    """``chunks`` encoded with ``encoding``, one flushed block per chunk."""
+    compressor = StreamCompressor(encoding)
+    raw = sent = 0
+    cpu = 0.0
+    try:
+        async for chunk in chunks:
+            data = chunk.encode()
+            started = time.perf_counter()
+            block = compressor.compress(data)
+            cpu += time.perf_counter() - started
+            raw += len(data)
+            sent += len(block)
+            yield block
+        block = compressor.finish()
+        sent += len(block)
+        yield block
+    finally:
+        compression_stats.record(route, encoding, raw, sent, cpu, responses=1)
+
+
+def compress_body(body: bytes, encoding: str | None, route: str) -> bytes:
+    """``body`` compressed with ``encoding``, recorded under ``route``.
+
+    Bodies under ``COMPRESSION_MIN_BYTES``, or without an encoding, are
+    returned as they are and recorded as "identity".
+    """
+    if encoding is None or len(body) < min_bytes():
+        compression_stats.record(route, IDENTITY, len(body), len(body), responses=1)
+        return body
+    started = time.perf_counter()
+    if encoding == BROTLI:
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, GZIP_LEVEL)
+    compression_stats.record(
+        route,
+        encoding,
+        len(body),
+        len(compressed),
+        time.perf_counter() - started,
+        responses=1,
+    )
+    return compressed
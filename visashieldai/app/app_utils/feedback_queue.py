@@ -0,0 +1,218 @@
+# Copyright 2025 VisaShield AI
+# Bounded, batched feedback ingestion off the request path
+
+"""Feedback ingestion through a bounded queue and a background flusher.
+
+``/feedback`` used to write every submission to Cloud Logging from the
+request thread. Now the route only enqueues the entry. A background task
+sends entries in batches of up to ``batch_size``, or whatever is queued once
+``flush_interval`` seconds pass, to each configured sink:
+
+* ``cloud_logging``: one Cloud Logging ``batch().commit()`` per batch
+  (standard logging offline, see ``app.app_utils.gcp``).
+* ``jsonl``: appended to ``FEEDBACK_JSONL_PATH``, one JSON object per line.
+
+Sinks block, so they run in a worker thread. When the queue is full,
+``offer`` waits up to ``enqueue_timeout`` seconds for room and then returns
+False. The route answers 503 so clients back off instead of growing memory
+without bound. ``close`` flushes everything queued; the app calls it on
+shutdown.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+from app.app_utils.gcp import get_cloud_logger
+
+logger = logging.getLogger(__name__)
+
+# Log name feedback entries have always been written under.
+FEEDBACK_LOG_NAME = "app.fast_api_app"
+
+
+class FeedbackSink(Protocol):
+    name: str
+
+    def write(self, batch: Sequence[dict[str, Any]]) -> None: ...
+
+
+class CloudLoggingSink:
+    """One Cloud Logging API call per batch."""
+
+    name = "cloud_logging"
+
+    def __init__(self, logger_name: str) -> None:
+        self.logger_name = logger_name
+
+    def write(self, batch: Sequence[dict[str, Any]]) -> None:
+        cloud_logger = get_cloud_logger(self.logger_name)
+        if not hasattr(cloud_logger, "batch"):  # offline stand-in
+            for entry in batch:
+                cloud_logger.log_struct(entry, severity="INFO")
+            return
+        with cloud_logger.batch() as cloud_batch:
+            for entry in batch:
+                cloud_batch.log_struct(entry, severity="INFO")
+
+
+class JsonlFileSink:
+    """Appends each batch to a local JSON Lines file."""
+
+    name = "jsonl"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, batch: Sequence[dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(entry, default=str) + "\n" for entry in batch)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class FeedbackQueue:
+    """Bounded async queue drained in batches by one background task."""
+
+    def __init__(
+        self,
+        sinks: Sequence[FeedbackSink],
+        max_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        enqueue_timeout: float = 0.05,
+    ) -> None:
+        self.sinks = list(sinks)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flusher: asyncio.Task[None] | None = None
+        self.stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "flushed": 0,
+            "batches": 0,
+            "sink_failures": 0,
+        }
+
+    def _ensure_started(self) -> asyncio.Queue[dict[str, Any]]:
+        # Created on first use, inside the serving event loop.
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(self.max_size)
+            self._loop = loop
+            self._flusher = None
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run(self._queue))
+        return self._queue
+
+    async def offer(self, entry: dict[str, Any]) -> bool:
+        """Enqueues ``entry``; False if the queue stayed full (backpressure)."""
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(entry), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.stats["rejected"] += 1
+                return False
+        self.stats["accepted"] += 1
+        return True
+
+    async def _next_batch(self, queue: asyncio.Queue[dict[str, Any]]) -> list[Any]:
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        for sink in self.sinks:
+            try:
+                await asyncio.to_thread(sink.write, batch)
+            except Exception:
+                self.stats["sink_failures"] += 1
+                logger.exception(
+                    "Feedback sink %s dropped %d entries", sink.name, len(batch)
+                )
+        self.stats["flushed"] += len(batch)
+        self.stats["batches"] += 1
+
+    async def _run(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        while True:
+            batch = await self._next_batch(queue)
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Flushes every queued entry and stops the flusher."""
+        if self._queue is None:
+            return
+        if self._flusher is not None and not self._flusher.done():
+            # The flusher may hold a partial batch; let it finish first.
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Feedback flush timed out after %.0fs", timeout)
+            self._flusher.cancel()
+        self._flusher = None
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        if remaining:
+            await self._write(remaining)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "sinks": [sink.name for sink in self.sinks],
+            **self.stats,
+        }
+
+
+def create_sinks(names: str, logger_name: str) -> list[FeedbackSink]:
+    """Sinks named in a comma-separated list, e.g. "cloud_logging,jsonl"."""
+    sinks: list[FeedbackSink] = []
+    for name in filter(None, (n.strip() for n in names.split(","))):
+        if name == CloudLoggingSink.name:
+            sinks.append(CloudLoggingSink(logger_name))
+        elif name == JsonlFileSink.name:
+            sinks.append(
+                JsonlFileSink(os.environ.get("FEEDBACK_JSONL_PATH", "feedback.jsonl"))
+            )
+        else:
+            raise ValueError(f"Unknown feedback sink: {name}")
+    return sinks
+
+
+@functools.lru_cache(maxsize=1)
+def get_feedback_queue() -> FeedbackQueue:
+    """Process-wide feedback queue configured from the environment."""
+    return FeedbackQueue(
+        create_sinks(
+            os.environ.get("FEEDBACK_SINKS", CloudLoggingSink.name), FEEDBACK_LOG_NAME
+        ),
+        max_size=int(os.environ.get("FEEDBACK_QUEUE_SIZE", "10000")),
+        batch_size=int(os.environ.get("FEEDBACK_BATCH_SIZE", "100")),
+        flush_interval=float(os.environ.get("FEEDBACK_FLUSH_SECONDS", "2")),
+    )
@@ -0,0 +1,88 @@
+# Copyright 2025 VisaShield AI
+# Lazily created Google Cloud configuration and clients, with offline fallbacks
+
+"""Google Cloud setup done on first use instead of at import.
+
+Importing the app used to resolve credentials, point google-genai at Vertex
+AI and create a Cloud Logging client before serving anything. That cost
+every cold start a metadata-server round trip, and the app could not import
+without credentials. Each of those steps now happens on first use and is
+cached.
+
+Set ``OFFLINE_MODE=1`` to run without Google Cloud at all. Vertex AI is not
+configured, feedback goes to standard logging, and telemetry and artifacts
+stay local. Deterministic endpoints (pre-screen, risk, LCA screening,
+criteria) work as usual; model calls need a local model.
+"""
+
+import functools
+import logging
+import os
+from typing import Any
+
+FALSE_VALUES = ("", "0", "false", "no")
+
+
+def offline_mode() -> bool:
+    return os.environ.get("OFFLINE_MODE", "").lower() not in FALSE_VALUES
+
+
+@functools.lru_cache(maxsize=1)
+def project_id() -> str | None:
+    """GOOGLE_CLOUD_PROJECT, else the default credentials' project.
+
+    Returns:
+        str: The project id, None offline or without credentials
+    """
+    if offline_mode():
+        return None
+    project = os.environ.get("GOOGLE_CLOUD_PROJECT")
+    if project:
+        return project
+    import google.auth
+    from google.auth.exceptions import DefaultCredentialsError
+
+    try:
+        _, project = google.auth.default()
+    except DefaultCredentialsError:
+        logging.warning("No Google Cloud credentials found; Vertex AI is disabled")
+        return None
+    return project
+
+
+@functools.lru_cache(maxsize=1)
+def configure_genai() -> str | None:
+    """Points google-genai at Vertex AI in the project, once per process.
+
+    Runs before the first model call; explicit environment settings win.
+
+    Returns:
+        str: The project id, None if Vertex AI was not configured
+    """
+    project = project_id()
+    if project is None:
+        return None
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project)
+    os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "global")
+    os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
+    return project
+
+
+class _StdLogger:
+    """Stand-in for a Cloud Logging logger that writes to standard logging."""
+
+    def __init__(self, name: str) -> None:
+        self._logger = logging.getLogger(name)
+
+    def log_struct(self, info: dict[str, Any], severity: str = "INFO") -> None:
+        self._logger.log(logging.getLevelName(severity), "%s", info)
+
+
+@functools.lru_cache(maxsize=8)
+def get_cloud_logger(name: str) -> Any:
+    """Cloud Logging logger, created on first use; standard logging offline."""
+    if offline_mode() or project_id() is None:
+        return _StdLogger(name)
+    from google.cloud import logging as google_cloud_logging
+
+    return google_cloud_logging.Client().logger(name)
@@ -0,0 +1,141 @@
+# Copyright 2025 VisaShield AI
+# Multi-worker serving: worker count from the CPU quota, shared sessions
+
+"""Runs the API in one or more uvicorn worker processes.
+
+One Python process uses one core for JSON encoding, pydantic validation and
+tool execution. ``python -m app.app_utils.serving`` starts one worker unless
+``WEB_CONCURRENCY`` or ``--workers`` asks for more. Several workers are not
+the default because much state is still per process: admission counts, the
+scheduler's ``ADJUDICATOR_MAX_CONCURRENT_RUNS`` slots, latency histograms and
+usage metrics, and outcomes recorded in the employer index. Each worker
+reports and enforces only its own share. ``quota_workers`` is how many
+workers the container's CPU quota (cgroup ``cpu.max``, else the CPUs this
+process may run on) could keep busy; it is logged at startup.
+
+Sessions are kept in a database that every worker reaches through
+``SESSION_SERVICE_URI`` (``postgresql+asyncpg://...`` across instances). With
+several workers and no URI, sessions go to a SQLite file in the container. A
+WebSocket or SSE follow-up that lands on another worker then still finds its
+session. Results are shared through ``app.shared_cache``.
+"""
+
+import argparse
+import functools
+import math
+import os
+import tempfile
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+from app.app_utils.gcp import FALSE_VALUES
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+DEFAULT_SQLITE_URI = "sqlite+aiosqlite:///" + os.path.join(
+    tempfile.gettempdir(), "visashield_sessions.db"
+)
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota() -> float | None:
+    """CPUs granted by the cgroup CPU quota, or None when unlimited."""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota_v1, period_v1 = _read(CGROUP_V1_QUOTA), _read(CGROUP_V1_PERIOD)
+    if quota_v1 and period_v1 and int(quota_v1) > 0:
+        return int(quota_v1) / int(period_v1)
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may be scheduled on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def quota_workers() -> int:
+    """Workers the CPU quota could keep busy: the quota rounded up, capped by the CPUs."""
+    cpus = available_cpus()
+    quota = cpu_quota()
+    if quota is None:
+        return cpus
+    return max(1, min(cpus, math.ceil(quota)))
+
+
+def worker_count() -> int:
+    """``WEB_CONCURRENCY``, else one worker while state is per process."""
+    configured = os.environ.get("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return 1
+
+
+def session_service_uri(workers: int = 1) -> str | None:
+    """``SESSION_SERVICE_URI``; a SQLite file when several workers need one."""
+    uri = os.environ.get("SESSION_SERVICE_URI")
+    if uri:
+        return uri
+    return DEFAULT_SQLITE_URI if workers > 1 else None
+
+
+@functools.lru_cache(maxsize=1)
+def get_session_service() -> BaseSessionService:
+    """Session service of this worker, shared by every runner in it."""
+    uri = session_service_uri()
+    if uri is None:
+        return InMemorySessionService()
+    # SQLAlchemy costs a third of a second to import; only load it when used.
+    from google.adk.sessions.database_session_service import DatabaseSessionService
+
+    return DatabaseSessionService(db_url=uri)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the API with N workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8080")))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--app", default="app.fast_api_app:app")
+    args = parser.parse_args()
+
+    workers = args.workers or worker_count()
+    if workers < quota_workers():
+        print(
+            f"Serving with {workers} worker(s); the CPU quota allows "
+            f"{quota_workers()}. Per-worker state is described in "
+            "app.app_utils.serving."
+        )
+    uri = session_service_uri(workers)
+    if uri is not None:
+        # Workers are spawned, so they read the URI from the environment.
+        os.environ["SESSION_SERVICE_URI"] = uri
+    uvicorn.run(
+        args.app,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        # Compresses WebSocket events for clients that offer the extension
+        ws_per_message_deflate=os.environ.get("WS_PER_MESSAGE_DEFLATE", "1").lower()
+        not in FALSE_VALUES,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,21 @@
 import logging
 import os
 
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
 
 def setup_telemetry() -> str | None:
     """Configure OpenTelemetry and GenAI telemetry with GCS upload."""
 
+    # Sample whole adjudications: child spans follow their root's decision.
+    # Must be set before the tracer provider is created.
+    os.environ.setdefault("OTEL_TRACES_SAMPLER", "parentbased_traceidratio")
+    os.environ.setdefault(
+        "OTEL_TRACES_SAMPLER_ARG", os.environ.get("TRACE_SAMPLE_RATIO", "1.0")
+    )
+
     bucket = os.environ.get("LOGS_BUCKET_NAME")
     capture_content = os.environ.get(
         "OTEL_INSTRUMENTATION_GENAI_CAPTURE_MESSAGE_CONTENT", "false"
@@ -49,3 +60,27 @@ def setup_telemetry() -> str | None:
         )
 
     return bucket
+
+
+def setup_trace_export() -> str | None:
+    """Append finished spans as JSON lines to ``TRACE_EXPORT_PATH``, if set.
+
+    ``{pid}`` in the path is replaced by the process id, giving each worker
+    its own file. Spans are written in batches by a background thread.
+    """
+    path = os.environ.get("TRACE_EXPORT_PATH")
+    if not path:
+        return None
+    path = path.replace("{pid}", str(os.getpid()))
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    exporter = ConsoleSpanExporter(
+        out=open(path, "a", encoding="utf-8"),
+        formatter=lambda span: span.to_json(indent=None) + "\n",
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    logging.info("Exporting trace spans to %s", path)
+    return path
@@ -0,0 +1,244 @@
+# Copyright 2025 VisaShield AI
+# Event-loop lag histogram and blocked-loop stack capture
+
+"""Finds the code that blocks the event loop.
+
+Every SSE stream, WebSocket and request of a worker shares one event loop.
+Synchronous work on it (a tool, a file write, a slow pydantic dump) stalls
+all of them at once. The watchdog has two parts:
+
+* A timer on the loop wakes every ``interval`` seconds and records how late
+  it woke in a histogram of loop lag. The timer is the ``LoopLagMonitor``
+  that admission control reads.
+* A daemon thread checks the timer's heartbeat. When the loop has not run
+  the timer for ``block_threshold`` seconds, the thread captures the loop
+  thread's stack while it is still blocked. It logs a warning with the stack
+  and the routes and tools found in it, and keeps the report for
+  ``/api/adjudicator/watchdog/metrics``. Once the loop resumes, the report
+  gets the stall's full duration.
+
+Overhead is one timer callback and one thread wake-up per interval. Stacks
+are only walked during a stall. ``LOOP_BLOCK_THRESHOLD_MS`` (default 250)
+sets the threshold; ``LOOP_WATCHDOG=0`` keeps lag sampling but stops the
+thread.
+"""
+
+import asyncio
+import bisect
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from types import FrameType
+from typing import Any
+
+from app.app_utils.gcp import FALSE_VALUES
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the lag histogram buckets, in milliseconds.
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+MAX_STACK_FRAMES = 40
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag with a periodic timer.
+
+    Lag rises at once to a new peak and decays geometrically, so one long
+    stall sheds load immediately and recovery is gradual.
+    """
+
+    def __init__(self, interval: float = 0.1, decay: float = 0.8) -> None:
+        self.interval = interval
+        self.decay = decay
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._task = loop.create_task(self._run(loop))
+
+    async def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.observe(max(0.0, loop.time() - started - self.interval))
+
+    def observe(self, lag: float) -> None:
+        self.lag = max(lag, self.lag * self.decay + lag * (1 - self.decay))
+        self.max_lag = max(self.max_lag, lag)
+
+
+def _code_name(frame: FrameType) -> str:
+    return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+
+
+class LoopWatchdog(LoopLagMonitor):
+    """Lag histogram plus a thread that captures stacks of a blocked loop."""
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        max_reports: int = 50,
+        watch: bool = True,
+    ) -> None:
+        super().__init__(interval)
+        self.block_threshold = block_threshold
+        self.watch = watch
+        self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.lag_total = 0.0
+        self.reports: collections.deque[dict[str, Any]] = collections.deque(
+            maxlen=max_reports
+        )
+        self.stalls = 0
+        self.heartbeat = time.monotonic()
+        self._routes: dict[str, str] = {}
+        self._tools: set[str] = set()
+        self._loop_thread: int | None = None
+        self._open_report: dict[str, Any] | None = None
+        self._thread: threading.Thread | None = None
+
+    # Context for reports
+
+    def register_routes(self, routes: Iterable[Any]) -> None:
+        """Maps route endpoints to "METHOD path" so stacks name their route."""
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is None:
+                continue
+            methods = ",".join(sorted(getattr(route, "methods", None) or ["WS"]))
+            self._routes[endpoint.__qualname__] = f"{methods} {route.path}"
+
+    def register_tools(self, names: Iterable[str]) -> None:
+        self._tools.update(names)
+
+    def _route_of(self, qualname: str) -> str | None:
+        # Nested generators and closures belong to their enclosing endpoint.
+        parts = qualname.split(".<locals>.")
+        for n in range(len(parts), 0, -1):
+            route = self._routes.get(".<locals>.".join(parts[:n]))
+            if route is not None:
+                return route
+        return None
+
+    # Loop side
+
+    def ensure_started(self) -> None:
+        super().ensure_started()
+        self._loop_thread = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        if self.watch and (self._thread is None or not self._thread.is_alive()):
+            self._thread = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    def observe(self, lag: float) -> None:
+        super().observe(lag)
+        self.heartbeat = time.monotonic()
+        self.samples += 1
+        self.lag_total += lag
+        self.histogram[bisect.bisect_left(LAG_BUCKETS_MS, 1000 * lag)] += 1
+        report = self._open_report
+        if report is not None:
+            self._open_report = None
+            report["blocked_ms"] = round(1000 * lag, 1)
+            logger.warning(
+                "Event loop resumed after %.0f ms (routes: %s, tools: %s)",
+                1000 * lag,
+                ", ".join(report["routes"]) or "none",
+                ", ".join(report["tools"]) or "none",
+            )
+
+    # Watchdog thread
+
+    def _watch(self) -> None:
+        reported_beat = 0.0
+        while True:
+            time.sleep(min(self.interval, self.block_threshold / 2))
+            beat = self.heartbeat
+            stalled = time.monotonic() - beat - self.interval
+            running = self._loop is not None and self._loop.is_running()
+            if running and stalled > self.block_threshold and beat != reported_beat:
+                reported_beat = beat
+                self.capture(stalled)
+
+    def capture(self, stalled: float) -> dict[str, Any] | None:
+        """Records the loop thread's current stack as a stall report."""
+        frame = sys._current_frames().get(self._loop_thread or -1)
+        if frame is None:
+            return None
+        report = self.describe(frame)
+        report["detected_after_ms"] = round(1000 * stalled, 1)
+        report["blocked_ms"] = None  # set when the loop resumes
+        report["at"] = time.time()
+        self.stalls += 1
+        self.reports.append(report)
+        self._open_report = report
+        logger.warning(
+            "Event loop blocked for %.0f ms so far (routes: %s, tools: %s)\n%s",
+            1000 * stalled,
+            ", ".join(report["routes"]) or "none",
+            ", ".join(report["tools"]) or "none",
+            "\n".join(report["stack"]),
+        )
+        return report
+
+    def describe(self, frame: FrameType | None) -> dict[str, Any]:
+        """Stack (innermost last) with the routes and tools it passes through."""
+        stack: list[str] = []
+        routes: list[str] = []
+        tools: list[str] = []
+        while frame is not None:
+            name = _code_name(frame)
+            stack.append(f"{frame.f_code.co_filename}:{frame.f_lineno} {name}")
+            route = self._route_of(name)
+            if route is not None and route not in routes:
+                routes.append(route)
+            if (
+                frame.f_code.co_name in self._tools
+                and frame.f_code.co_name not in tools
+            ):
+                tools.append(frame.f_code.co_name)
+            frame = frame.f_back
+        stack.reverse()
+        return {
+            "routes": routes,
+            "tools": tools,
+            "stack": stack[-MAX_STACK_FRAMES:],
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        buckets = [f"le_{bound}ms" for bound in LAG_BUCKETS_MS] + ["gt_5000ms"]
+        return {
+            "interval_ms": 1000 * self.interval,
+            "block_threshold_ms": 1000 * self.block_threshold,
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "samples": self.samples,
+            "lag_avg_ms": round(
+                1000 * self.lag_total / self.samples if self.samples else 0, 3
+            ),
+            "lag_max_ms": round(1000 * self.max_lag, 3),
+            "lag_histogram": dict(zip(buckets, self.histogram, strict=True)),
+            "stalls": self.stalls,
+            "recent_stalls": list(self.reports),
+        }
+
+
+@functools.lru_cache(maxsize=1)
+def get_loop_watchdog() -> LoopWatchdog:
+    """This worker's loop watchdog, configured from the environment."""
+    return LoopWatchdog(
+        block_threshold=float(os.environ.get("LOOP_BLOCK_THRESHOLD_MS", "250")) / 1000,
+        watch=os.environ.get("LOOP_WATCHDOG", "1").lower() not in FALSE_VALUES,
+    )
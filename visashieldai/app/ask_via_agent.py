@@ -0,0 +1,88 @@
+# Copyright 2025 VisaShield AI
+# Ask VIA policy question-answering agent
+
+"""Lightweight agent answering officers' immigration policy questions.
+
+The agent has no tools and a small instruction. It answers in the
+``AskViaAnswer`` schema and cites sources by id from ``POLICY_SOURCES``. The
+API resolves those ids to titles and links, so answers never carry
+model-written URLs.
+"""
+
+from typing import Any
+
+from google.adk.agents import Agent
+from pydantic import BaseModel, Field
+
+from app.stub_model import agent_model
+
+ECFR_214_2 = (
+    "https://www.ecfr.gov/current/title-8/chapter-I/subchapter-B/part-214/section-214.2"
+)
+ECFR_204_5 = (
+    "https://www.ecfr.gov/current/title-8/chapter-I/subchapter-B/part-204/section-204.5"
+)
+INA = (
+    "https://www.uscis.gov/laws-and-policy/legislation/immigration-and-nationality-act"
+)
+PRECEDENTS = "https://www.justice.gov/eoir/ag-bia-decisions"
+
+# id: (title, url, what the source covers)
+POLICY_SOURCES: dict[str, tuple[str, str, str]] = {
+    "S1": ("INA § 101(a)(15)(H)(i)(b)", INA, "H-1B specialty occupation classification"),
+    "S2": ("8 CFR § 214.2(h)", ECFR_214_2, "H-1B petition requirements, specialty occupation criteria, LCA"),
+    "S3": ("USCIS Policy Manual Vol. 2, Part H", "https://www.uscis.gov/policy-manual/volume-2-part-h", "USCIS guidance on H-1B adjudication"),
+    "S4": ("H-1B Specialty Occupations", "https://www.uscis.gov/working-in-the-united-states/h-1b-specialty-occupations", "H-1B program overview, cap and registration"),
+    "S5": ("8 CFR § 214.2(o)", ECFR_214_2, "O-1 extraordinary ability criteria and evidence"),
+    "S6": ("O-1 Visa: Individuals with Extraordinary Ability or Achievement", "https://www.uscis.gov/working-in-the-united-states/temporary-workers/o-1-visa-individuals-with-extraordinary-ability-or-achievement", "O-1 program overview"),
+    "S7": ("8 CFR § 204.5(k)", ECFR_204_5, "EB-2 advanced degree and exceptional ability"),
+    "S8": ("Employment-Based Immigration: Second Preference EB-2", "https://www.uscis.gov/working-in-the-united-states/permanent-workers/employment-based-immigration-second-preference-eb-2", "EB-2 and national interest waiver overview"),
+    "S9": ("Matter of Dhanasar, 26 I&N Dec. 884 (AAO 2016)", PRECEDENTS, "National interest waiver three-prong framework"),
+    "S10": ("Matter of Simeio Solutions, LLC, 26 I&N Dec. 542 (AAO 2015)", PRECEDENTS, "Amended H-1B petitions for new worksites"),
+    "S11": ("Matter of Defensor, 25 I&N Dec. 749 (AAO 2012)", PRECEDENTS, "Employer-employee relationship and right to control"),
+    "S12": ("FLAG Wage Search", "https://flag.dol.gov/wage-data/wage-search", "OFLC prevailing wage levels by SOC code and area"),
+}  # fmt: skip
+
+SOURCE_CATALOG = "\n".join(
+    f"[{source_id}] {title}: {covers}"
+    for source_id, (title, _, covers) in POLICY_SOURCES.items()
+)
+
+
+class AskViaAnswer(BaseModel):
+    answer: str = Field(description="Direct answer in at most five sentences")
+    source_ids: list[str] = Field(description="Ids of the catalog sources relied on")
+    confidence: float = Field(description="Confidence in the answer, 0-1")
+
+
+def resolve_sources(source_ids: list[str]) -> list[dict[str, Any]]:
+    """Catalog entries for the cited ids, in citation order, unknown ids dropped."""
+    sources = []
+    for source_id in dict.fromkeys(source_ids):
+        if source_id in POLICY_SOURCES:
+            title, url, covers = POLICY_SOURCES[source_id]
+            sources.append(
+                {"id": source_id, "title": title, "url": url, "snippet": covers}
+            )
+    return sources
+
+
+ASK_VIA_INSTRUCTION = (
+    """You are Ask VIA, the VisaShield AI policy assistant for USCIS officers and immigration attorneys.
+
+Answer immigration law and policy questions accurately and concisely. Do not
+decide individual cases; say when a question needs case-specific review.
+Cite sources only by id from this catalog, and only the ones that support the
+answer. If no catalog source applies, cite none and lower your confidence.
+
+"""
+    + SOURCE_CATALOG
+)
+
+ask_via_agent = Agent(
+    name="ask_via_agent",
+    model=agent_model("gemini-2.0-flash"),
+    description="Immigration policy question answering with cited sources",
+    instruction=ASK_VIA_INSTRUCTION,
+    output_schema=AskViaAnswer,
+)
@@ -0,0 +1,157 @@
+# Copyright 2025 VisaShield AI
+# FastAPI endpoints for Ask VIA policy questions
+
+"""Ask VIA question answering with a two-tier answer cache.
+
+A question is answered from ``AnswerCache`` when an identical or
+near-identical question was answered recently. Otherwise ``ask_via_agent``
+answers it in a throwaway session. Concurrent misses for the same normalized
+question share one agent run.
+"""
+
+import asyncio
+import functools
+import os
+import time
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+from app.answer_cache import DEFAULT_THRESHOLD, AnswerCache, normalize_question
+from app.app_utils.gcp import configure_genai
+from app.ask_via_agent import AskViaAnswer, ask_via_agent, resolve_sources
+from app.scheduler import Lane, scheduler
+
+router = APIRouter(prefix="/api/ask-via", tags=["ask-via"])
+
+runner = InMemoryRunner(agent=ask_via_agent, app_name="ask_via")
+
+# Low-confidence answers are returned but not reused.
+MIN_CACHE_CONFIDENCE = 0.5
+
+
+class AskViaRequest(BaseModel):
+    question: str
+    user_id: str | None = None
+    use_cache: bool = True
+
+
+@functools.lru_cache(maxsize=1)
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache, sized from the environment."""
+    return AnswerCache(
+        capacity=int(os.environ.get("ASK_VIA_CACHE_SIZE", "1024")),
+        ttl=float(os.environ.get("ASK_VIA_CACHE_TTL_SECONDS", "86400")),
+        threshold=float(
+            os.environ.get("ASK_VIA_SIMILARITY_THRESHOLD", str(DEFAULT_THRESHOLD))
+        ),
+    )
+
+
+async def answer_question(question: str, user_id: str) -> dict[str, Any]:
+    """Runs the Ask VIA agent on ``question`` in a fresh session."""
+    configure_genai()
+    session_id = f"ask_{uuid.uuid4().hex[:12]}"
+    await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    text = ""
+    try:
+        async with scheduler.slot(Lane.INTERACTIVE):
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=types.Content(
+                    role="user", parts=[types.Part(text=question)]
+                ),
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    text += "".join(p.text for p in event.content.parts if p.text)
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+    try:
+        answer = AskViaAnswer.model_validate_json(text)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Malformed answer from Ask VIA: {e.errors()[0]['msg']}",
+        ) from e
+    return {
+        "answer": answer.answer,
+        "sources": resolve_sources(answer.source_ids),
+        "confidence": answer.confidence,
+    }
+
+
+# Agent runs in flight, keyed by normalized question.
+_inflight: dict[str, "asyncio.Future[dict[str, Any]]"] = {}
+
+
+@router.post("/ask")
+async def ask(request: AskViaRequest) -> dict[str, Any]:
+    """Answer a policy question, from the cache when possible."""
+    started = time.perf_counter()
+    question = request.question.strip()
+    if not question:
+        raise HTTPException(status_code=422, detail="Question is empty")
+    cache = get_answer_cache()
+
+    def respond(
+        answer: dict[str, Any], cached: str | None, similarity: float | None = None
+    ) -> dict[str, Any]:
+        return {
+            "question": question,
+            **answer,
+            "cached": cached,
+            "similarity": similarity,
+            "latency_ms": round(1000 * (time.perf_counter() - started), 3),
+        }
+
+    if request.use_cache:
+        hit = cache.get(question)
+        if hit is not None:
+            answer, tier, similarity = hit
+            return respond(answer, tier, round(similarity, 4))
+
+    key = normalize_question(question)
+    pending = _inflight.get(key)
+    if pending is not None:
+        return respond(await asyncio.shield(pending), "coalesced")
+
+    future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        answer = await answer_question(question, request.user_id or "officer")
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # retrieved here; waiters re-raise it
+        raise
+    else:
+        future.set_result(answer)
+    finally:
+        del _inflight[key]
+        if not future.done():
+            # This request was cancelled; its waiters must not wait forever.
+            future.set_exception(
+                HTTPException(
+                    status_code=503,
+                    detail="The request answering this question was cancelled",
+                    headers={"Retry-After": "1"},
+                )
+            )
+            future.exception()
+    if answer["confidence"] >= MIN_CACHE_CONFIDENCE:
+        cache.put(question, answer)
+    return respond(answer, None)
+
+
+@router.get("/cache/metrics")
+async def get_cache_metrics() -> dict[str, Any]:
+    """Answer cache size, hit rates by tier, evictions and expirations."""
+    return get_answer_cache().metrics()
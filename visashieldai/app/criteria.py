@@ -0,0 +1,99 @@
+# Copyright 2025 VisaShield AI
+# Evaluation criteria registry per visa classification
+
+import re
+
+EVALUATION_CRITERIA: dict[str, list[dict[str, str]]] = {
+    "H-1B": [
+        {
+            "id": "1",
+            "name": "Specialty Occupation",
+            "description": "Position requires theoretical and practical application of specialized knowledge",
+        },
+        {
+            "id": "2",
+            "name": "Beneficiary Qualifications",
+            "description": "Beneficiary has required degree or equivalent",
+        },
+        {
+            "id": "3",
+            "name": "Employer-Employee Relationship",
+            "description": "Valid employer-employee relationship exists",
+        },
+        {
+            "id": "4",
+            "name": "Prevailing Wage Compliance",
+            "description": "Offered wage meets or exceeds prevailing wage",
+        },
+        {
+            "id": "5",
+            "name": "LCA Compliance",
+            "description": "Labor Condition Application is certified and compliant",
+        },
+        {
+            "id": "6",
+            "name": "Itinerary Requirements",
+            "description": "Work itinerary provided if applicable",
+        },
+    ],
+    "O-1": [
+        {
+            "id": "1",
+            "name": "Extraordinary Ability",
+            "description": "Sustained national or international acclaim",
+        },
+        {
+            "id": "2",
+            "name": "Evidence of Recognition",
+            "description": "Documentation of achievements and recognition",
+        },
+        {
+            "id": "3",
+            "name": "Continued Work in Field",
+            "description": "Coming to US to continue work in area of expertise",
+        },
+    ],
+    "EB-2 NIW": [
+        {
+            "id": "1",
+            "name": "Advanced Degree",
+            "description": "Holds advanced degree or exceptional ability",
+        },
+        {
+            "id": "2",
+            "name": "National Interest",
+            "description": "Work is in the national interest of the United States",
+        },
+        {
+            "id": "3",
+            "name": "Substantial Merit",
+            "description": "Proposed endeavor has substantial merit and national importance",
+        },
+    ],
+}
+
+
+# Spellings of each classification, keyed with punctuation and spaces removed.
+VISA_TYPE_ALIASES = {
+    "H1B": "H-1B",
+    "O1": "O-1",
+    "O1A": "O-1",
+    "EB2NIW": "EB-2 NIW",
+    "NIW": "EB-2 NIW",
+}
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+
+
+def normalize_visa_type(visa_type: str) -> str:
+    """Registry key for a visa type ("h1b" -> "H-1B"); others are upper-cased."""
+    key = visa_type.strip().upper()
+    return VISA_TYPE_ALIASES.get(_NON_ALNUM.sub("", key), key)
+
+
+def get_criterion(visa_type: str, criterion_id: str) -> dict[str, str] | None:
+    """Returns a single criterion for a visa type, or None if unknown."""
+    for criterion in EVALUATION_CRITERIA.get(normalize_visa_type(visa_type), []):
+        if criterion["id"] == criterion_id:
+            return criterion
+    return None
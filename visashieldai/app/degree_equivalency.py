@@ -0,0 +1,258 @@
+# Copyright 2025 VisaShield AI
+# Foreign degree to US equivalency knowledge base
+
+"""US equivalency of foreign degrees for ``check_beneficiary_qualifications``.
+
+The reference table (``app/data/degree_equivalency.csv`` by default,
+``DEGREE_EQUIVALENCY_PATH`` to override) maps country x institution type x
+degree x program length to a US equivalency. Every degree name and alias is
+normalized ("B.Tech" -> "btech") and indexed by ``(country, degree)``, so a
+lookup is one dict probe plus a scan of the few rows for that degree.
+
+Misspelled degree names fall back to trigram candidates from the same country,
+filtered by bounded edit distance. Fuzzy resolutions are cached, so repeats
+cost the same as exact hits.
+"""
+
+import csv
+import functools
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "degree_equivalency.csv"
+)
+
+ANY_INSTITUTION = "any"
+BACHELORS_YEARS = 4
+# 8 CFR 214.2(h)(4)(iii)(D)(5): three years of experience per missing year of
+# university study.
+EXPERIENCE_YEARS_PER_STUDY_YEAR = 3
+FUZZY_CANDIDATES = 8
+
+COUNTRY_ALIASES = {
+    "us": "united states", "usa": "united states", "united states of america": "united states",
+    "uk": "united kingdom", "great britain": "united kingdom", "england": "united kingdom",
+    "scotland": "united kingdom", "wales": "united kingdom", "korea": "south korea",
+    "republic of korea": "south korea", "prc": "china", "russian federation": "russia",
+}  # fmt: skip
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_degree(name: str) -> str:
+    """Case- and punctuation-insensitive key ("B.Sc. (Hons)" -> "bschons")."""
+    return _NON_ALNUM.sub("", name.lower())
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_country(name: str) -> str:
+    key = " ".join(_NON_ALNUM.sub(" ", name.lower()).split())
+    return COUNTRY_ALIASES.get(key, key)
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or ``limit + 1`` once it is known to exceed limit.
+
+    Only the diagonal band of width ``2 * limit + 1`` is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost if cost < over else over
+        if min(current[lo - 1 : hi + 1]) > limit:
+            return over
+        previous = current
+    return previous[-1]
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"#{key}#"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class Equivalency:
+    """One row of the reference table."""
+
+    country: str
+    institution_type: str
+    degree: str
+    duration_years: int  # 0 when the row applies to any program length
+    us_equivalency: str
+    us_years: int  # US-equivalent years of university study
+
+
+class DegreeEquivalencyIndex:
+    """Hash index over the degree-equivalency reference table."""
+
+    def __init__(self, rows: list[Equivalency], aliases: list[list[str]]) -> None:
+        self._rows: dict[tuple[str, str], list[Equivalency]] = {}
+        self._grams: dict[str, dict[str, list[str]]] = {}
+        for row, names in zip(rows, aliases, strict=True):
+            country = normalize_country(row.country)
+            for name in (row.degree, *names):
+                key = normalize_degree(name)
+                entries = self._rows.setdefault((country, key), [])
+                if row not in entries:
+                    entries.append(row)
+                    postings = self._grams.setdefault(country, {})
+                    for gram in _trigrams(key):
+                        postings.setdefault(gram, []).append(key)
+        self._match = functools.lru_cache(maxsize=8192)(self._resolve_key)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "DegreeEquivalencyIndex":
+        rows: list[Equivalency] = []
+        aliases: list[list[str]] = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                rows.append(
+                    Equivalency(
+                        country=record["country"],
+                        institution_type=record["institution_type"].lower()
+                        or ANY_INSTITUTION,
+                        degree=record["degree"],
+                        duration_years=int(record["duration_years"] or 0),
+                        us_equivalency=record["us_equivalency"],
+                        us_years=int(record["us_years"]),
+                    )
+                )
+                aliases.append(
+                    [
+                        a.strip()
+                        for a in (record.get("aliases") or "").split(";")
+                        if a.strip()
+                    ]
+                )
+        return cls(rows, aliases)
+
+    def _resolve_key(self, country: str, key: str) -> tuple[str, bool] | None:
+        """Indexed degree key for ``key`` and whether it was a fuzzy match."""
+        if (country, key) in self._rows:
+            return key, False
+        postings = self._grams.get(country)
+        if not postings or not key:
+            return None
+        grams = _trigrams(key)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(postings.get(gram, ()))
+        limit = max(1, len(key) // 4)
+        # Count filter: each edit destroys at most three of the key's trigrams.
+        min_shared = len(grams) - 3 * limit
+        best, best_distance = None, limit + 1
+        for candidate, count in shared.most_common(FUZZY_CANDIDATES):
+            if count < min_shared:
+                break
+            distance = bounded_edit_distance(key, candidate, best_distance - 1)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+                if distance == 1:
+                    break
+        return (best, True) if best is not None else None
+
+    def lookup(
+        self,
+        country: str,
+        degree: str,
+        duration_years: int = 0,
+        institution_type: str = "",
+    ) -> tuple[Equivalency, bool] | None:
+        """Best matching row and whether the degree name was fuzzy-matched."""
+        country_key = normalize_country(country)
+        match = self._match(country_key, normalize_degree(degree))
+        if match is None:
+            return None
+        key, fuzzy = match
+        institution = institution_type.lower()
+
+        def rank(row: Equivalency) -> tuple[bool, bool, bool]:
+            return (
+                row.duration_years != duration_years,
+                row.duration_years != 0,
+                row.institution_type not in (institution, ANY_INSTITUTION),
+            )
+
+        return min(self._rows[(country_key, key)], key=rank), fuzzy
+
+
+@functools.lru_cache(maxsize=1)
+def get_degree_index() -> DegreeEquivalencyIndex:
+    """Loads the configured reference table once per process."""
+    return DegreeEquivalencyIndex.from_csv(
+        os.environ.get("DEGREE_EQUIVALENCY_PATH", DEFAULT_TABLE_PATH)
+    )
+
+
+def evaluate_degree(
+    degree_type: str,
+    country: str = "United States",
+    duration_years: int = 0,
+    institution_type: str = "",
+    years_experience: int = 0,
+) -> dict[str, Any]:
+    """US equivalency of a degree, including the education-plus-experience rule.
+
+    Args:
+        degree_type: Degree name as stated on the credential
+        country: Country that awarded the degree
+        duration_years: Program length in years, 0 if unknown
+        institution_type: university, college, polytechnic, ... if known
+        years_experience: Progressive work experience in years
+
+    Returns:
+        dict: Equivalency, status and how the table row was matched
+    """
+    found = get_degree_index().lookup(
+        country, degree_type, duration_years, institution_type
+    )
+    if found is None:
+        return {
+            "us_equivalency": "UNDETERMINED",
+            "status": "REQUIRES CREDENTIAL EVALUATION",
+            "match": None,
+        }
+    row, fuzzy = found
+    result: dict[str, Any] = {
+        "us_equivalency": row.us_equivalency,
+        "us_years": row.us_years,
+        "status": "VERIFIED",
+        "match": {
+            "country": row.country,
+            "degree": row.degree,
+            "institution_type": row.institution_type,
+            "duration_years": row.duration_years or None,
+            "fuzzy": fuzzy,
+        },
+    }
+    if row.duration_years and duration_years and row.duration_years != duration_years:
+        result["status"] = "DURATION MISMATCH"
+    elif row.us_years < BACHELORS_YEARS:
+        needed = (BACHELORS_YEARS - row.us_years) * EXPERIENCE_YEARS_PER_STUDY_YEAR
+        if years_experience >= needed:
+            result["us_equivalency"] = "Bachelor's Degree (education and experience)"
+            result["status"] = "EQUIVALENT WITH EXPERIENCE"
+        else:
+            result["status"] = "NOT EQUIVALENT"
+        result["experience_years_required"] = needed
+    return result
@@ -0,0 +1,684 @@
+# Copyright 2025 VisaShield AI
+# MinHash/LSH near-duplicate index over petition free text
+
+"""Near-duplicate detection for mass-filing patterns.
+
+Free text (job title and duties) is reduced to word 3-shingles, hashed, and
+summarized by a MinHash signature computed for whole batches in NumPy. The
+signature is cut into LSH bands; petitions sharing any band key become
+candidates, so a lookup touches a few buckets instead of every past filing.
+Candidates are then ranked by estimated Jaccard similarity (the fraction of
+equal signature slots).
+
+The index lives in a directory of append-only ``.npz`` segments: ``save``
+writes only the rows added since the last save, and ``load`` concatenates the
+segments. Segment names carry a timestamp, the process id and a counter, so
+workers sharing the directory never overwrite each other's segments. Run
+``python -m app.duplicate_index --help`` to build an index from a filing export
+or cluster a season's filings offline.
+
+Requests only look cases up. ``DuplicateRecorder`` adds adjudicated cases from
+a background task, so hashing, array growth, band merges and segment writes
+stay off the event loop.
+"""
+
+import argparse
+import asyncio
+import csv
+import functools
+import glob
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+from app.adjudicator_models import CaseInfo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "duplicate_index"
+)
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: candidates from roughly 0.7 Jaccard upwards
+SHINGLE_WORDS = 3
+SIMILARITY_THRESHOLD = 0.7
+HIGH_SIMILARITY = 0.9
+RELATED_PETITIONERS = 3
+FLUSH_ROWS = 256
+MERGE_ROWS = 4096
+
+_SHIFT = np.uint64(32)
+_EMPTY = np.uint32(0xFFFFFFFF)  # signature slot value for text without words
+_CHUNK_CELLS = 1 << 23  # shingles x permutations per hashing chunk
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=65536)
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode())
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """Distinct 32-bit hashes of the word 3-shingles of ``text``."""
+    words = np.array(
+        [_word_hash(word) for word in _WORD.findall(text.lower())], dtype=np.uint64
+    )
+    if len(words) < SHINGLE_WORDS:
+        shingles = words[:1] if len(words) == 1 else words[:1] * 31 + words[1:]
+    else:
+        shingles = (
+            words[:-2] * np.uint64(0x9E3779B1)
+            + words[1:-1] * np.uint64(0x85EBCA77)
+            + words[2:]
+        )
+    return np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+
+def case_text(case: CaseInfo) -> str:
+    """Free text compared across petitions."""
+    return f"{case.job_title or ''} {case.job_duties or ''}"
+
+
+class DuplicateIndex:
+    """MinHash signatures bucketed by LSH band for sublinear candidate lookup.
+
+    One thread at a time may add rows while others query. Added rows are
+    written past the visible end of the arrays, and merges are built aside,
+    so the lock is only held to publish them.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.num_perm, self.bands, self.seed = num_perm, bands, seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(
+            1, 1 << 63, num_perm // bands, dtype=np.uint64
+        ) | np.uint64(1)
+
+        self.case_numbers: list[str] = []
+        self.petitioners: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._band_keys = np.empty((0, bands), dtype=np.uint64)
+        self._size = 0
+        self._persisted = 0
+        # Rows [0, _sorted_rows) are searchable through per-band sorted keys;
+        # later rows sit in per-band dicts until MERGE_ROWS accumulate.
+        self._sorted_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._sorted_rows_of = np.empty((bands, 0), dtype=np.int64)
+        self._sorted_rows = 0
+        self._recent: list[dict[int, list[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.RLock()
+        self._segment_ids = itertools.count()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, case_number: str) -> bool:
+        return case_number in self._positions
+
+    @property
+    def pending(self) -> int:
+        """Rows added since the last ``save``."""
+        return self._size - self._persisted
+
+    @property
+    def signatures(self) -> np.ndarray:
+        return self._signatures[: self._size]
+
+    # ----------------------------------------
+    # Signatures
+    # ----------------------------------------
+
+    def signatures_for(self, texts: Sequence[str]) -> np.ndarray:
+        """MinHash signatures for a batch of texts, one row per text."""
+        result = np.full((len(texts), self.num_perm), _EMPTY, dtype=np.uint32)
+        shingles = [shingle_hashes(text) for text in texts]
+        start = 0
+        while start < len(texts):
+            stop, cells = start, 0
+            while stop < len(texts) and (
+                stop == start
+                or cells + len(shingles[stop]) * self.num_perm <= _CHUNK_CELLS
+            ):
+                cells += len(shingles[stop]) * self.num_perm
+                stop += 1
+            docs = [i for i in range(start, stop) if len(shingles[i])]
+            if docs:
+                lengths = np.array([len(shingles[i]) for i in docs])
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                values = np.concatenate([shingles[i] for i in docs])
+                # Multiply-shift hashing, laid out (permutation x shingle) so the
+                # per-document minimum reduces over contiguous memory.
+                hashed = (self._a[:, None] * values + self._b[:, None]) >> _SHIFT
+                result[docs] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            start = stop
+        return result
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One uint64 bucket key per (row, band)."""
+        rows = signatures.reshape(
+            len(signatures), self.bands, self.num_perm // self.bands
+        )
+        rows = rows.astype(np.uint64)
+        return (rows * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    # ----------------------------------------
+    # Updates
+    # ----------------------------------------
+
+    def add(
+        self,
+        case_numbers: Sequence[str],
+        petitioners: Sequence[str],
+        texts: Sequence[str],
+    ) -> None:
+        """Indexes a batch of filings; case numbers already present are skipped."""
+        seen: set[str] = set()
+        keep = []
+        for i, case_number in enumerate(case_numbers):
+            if case_number not in self._positions and case_number not in seen:
+                seen.add(case_number)
+                keep.append(i)
+        if not keep:
+            return
+        signatures = self.signatures_for([texts[i] for i in keep])
+        self._append(
+            [case_numbers[i] for i in keep], [petitioners[i] for i in keep], signatures
+        )
+
+    def _append(
+        self,
+        case_numbers: Sequence[str],
+        petitioners: Sequence[str],
+        signatures: np.ndarray,
+    ) -> None:
+        first = self._size
+        needed = first + len(signatures)
+        stored, keys = self._signatures, self._band_keys
+        if needed > len(stored):
+            capacity = max(needed, 2 * len(stored), 1024)
+            stored = np.empty((capacity, self.num_perm), dtype=np.uint32)
+            stored[:first] = self._signatures[:first]
+            keys = np.empty((capacity, self.bands), dtype=np.uint64)
+            keys[:first] = self._band_keys[:first]
+        # Rows past _size are invisible to queries until published below.
+        stored[first:needed] = signatures
+        keys[first:needed] = self.band_keys(signatures)
+        new_rows = range(first, needed)
+        row_keys = keys[first:needed].tolist()
+
+        with self._lock:
+            self._signatures, self._band_keys = stored, keys
+            for row, case_number in zip(new_rows, case_numbers, strict=True):
+                self._positions[case_number] = row
+            self.case_numbers.extend(case_numbers)
+            self.petitioners.extend(petitioners)
+            for row, band_keys in zip(new_rows, row_keys, strict=True):
+                if stored[row, 0] == _EMPTY:
+                    continue
+                for band, key in enumerate(band_keys):
+                    self._recent[band].setdefault(key, []).append(row)
+            self._size = needed
+
+        if self._size - self._sorted_rows >= MERGE_ROWS:
+            self._merge()
+
+    def _merge(self) -> None:
+        """Rebuilds the sorted per-band keys over every row."""
+        size = self._size
+        keys = self._band_keys[:size].T
+        rows = np.flatnonzero(self._signatures[:size, 0] != _EMPTY)
+        order = np.argsort(keys[:, rows], axis=1, kind="stable")
+        sorted_rows_of = rows[order]
+        sorted_keys = np.take_along_axis(keys[:, rows], order, axis=1)
+        with self._lock:
+            self._sorted_rows_of, self._sorted_keys = sorted_rows_of, sorted_keys
+            self._sorted_rows = size
+            self._recent = [{} for _ in range(self.bands)]
+
+    # ----------------------------------------
+    # Queries
+    # ----------------------------------------
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        """Rows sharing at least one LSH band with ``signature``."""
+        if signature[0] == _EMPTY:
+            return np.empty(0, dtype=np.int64)
+        keys = self.band_keys(signature[None, :])[0]
+        found: list[np.ndarray] = []
+        with self._lock:
+            for band in range(self.bands):
+                key = keys[band : band + 1]
+                sorted_keys = self._sorted_keys[band]
+                lo = int(sorted_keys.searchsorted(key, side="left")[0])
+                hi = int(sorted_keys.searchsorted(key, side="right")[0])
+                if hi > lo:
+                    found.append(self._sorted_rows_of[band, lo:hi])
+                recent = self._recent[band].get(int(key[0]))
+                if recent:
+                    found.append(np.asarray(recent, dtype=np.int64))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def similar(
+        self,
+        text: str,
+        threshold: float = SIMILARITY_THRESHOLD,
+        exclude: str | None = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """Indexed filings whose estimated Jaccard similarity meets ``threshold``."""
+        signature = self.signatures_for([text])[0]
+        with self._lock:
+            rows = self.candidates(signature)
+            if exclude is not None and exclude in self._positions:
+                rows = rows[rows != self._positions[exclude]]
+            if not len(rows):
+                return []
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            hits = np.flatnonzero(similarity >= threshold)
+            hits = hits[np.argsort(-similarity[hits], kind="stable")][:limit]
+            return [
+                {
+                    "case_number": self.case_numbers[rows[i]],
+                    "petitioner_name": self.petitioners[rows[i]],
+                    "similarity": round(float(similarity[i]), 3),
+                }
+                for i in hits.tolist()
+            ]
+
+    def clusters(self, threshold: float = SIMILARITY_THRESHOLD) -> list[list[int]]:
+        """Groups indexed rows into near-duplicate clusters (size > 1).
+
+        Each LSH bucket is verified against its first member, and verified
+        pairs are merged with union-find, so the cost grows with the number of
+        rows rather than the number of pairs.
+        """
+        parent = np.arange(self._size)
+
+        def find(row: int) -> int:
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        signatures = self.signatures
+        valid = np.flatnonzero(signatures[:, 0] != _EMPTY)
+        for band in range(self.bands):
+            keys = self._band_keys[valid, band]
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            sizes = np.diff(np.r_[starts, len(sorted_keys)])
+            for start, size in zip(
+                starts[sizes > 1].tolist(), sizes[sizes > 1].tolist(), strict=True
+            ):
+                members = valid[order[start : start + size]]
+                head = members[0]
+                similarity = (signatures[members[1:]] == signatures[head]).mean(axis=1)
+                root = find(head)
+                for row in members[1:][similarity >= threshold].tolist():
+                    other = find(row)
+                    if other != root:
+                        parent[other] = root
+
+        roots = np.array([find(row) for row in range(self._size)], dtype=np.int64)
+        groups: dict[int, list[int]] = {}
+        for row, root in enumerate(roots.tolist()):
+            groups.setdefault(root, []).append(row)
+        return sorted(
+            (rows for rows in groups.values() if len(rows) > 1), key=len, reverse=True
+        )
+
+    # ----------------------------------------
+    # Persistence
+    # ----------------------------------------
+
+    def save(self, path: str | None = None) -> None:
+        """Writes rows added since the last save as a new segment."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("DuplicateIndex has no path to save to")
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w") as f:
+                json.dump(
+                    {"num_perm": self.num_perm, "bands": self.bands, "seed": self.seed},
+                    f,
+                )
+        with self._lock:
+            size = self._size
+            rows = slice(self._persisted, size)
+            case_numbers = self.case_numbers[rows]
+            petitioners = self.petitioners[rows]
+            signatures = self._signatures[rows]
+        if not case_numbers:
+            return
+        # Unique per process and save, and in creation order when sorted.
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(self._segment_ids)}"
+        target = os.path.join(path, f"segment-{name}.npz")
+        tmp = f"{target}.tmp.npz"
+        np.savez(
+            tmp,
+            case_numbers=np.array(case_numbers, dtype=str),
+            petitioners=np.array(petitioners, dtype=str),
+            signatures=signatures,
+        )
+        os.replace(tmp, target)
+        self._persisted = size
+
+    @classmethod
+    def load(cls, path: str) -> "DuplicateIndex":
+        """Opens an index directory, or starts an empty one there.
+
+        A case number saved by more than one worker keeps its first row.
+        """
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return cls(path)
+        with open(meta_path) as f:
+            index = cls(path, **json.load(f))
+        case_numbers: list[str] = []
+        petitioners: list[str] = []
+        signatures = [np.empty((0, index.num_perm), dtype=np.uint32)]
+        for segment in sorted(glob.glob(os.path.join(path, "segment-*.npz"))):
+            with np.load(segment) as data:
+                case_numbers.extend(data["case_numbers"].tolist())
+                petitioners.extend(data["petitioners"].tolist())
+                signatures.append(data["signatures"])
+        first_rows: dict[str, int] = {}
+        for row, case_number in enumerate(case_numbers):
+            first_rows.setdefault(case_number, row)
+        keep = list(first_rows.values())
+        index._append(
+            list(first_rows),
+            [petitioners[row] for row in keep],
+            np.concatenate(signatures)[keep],
+        )
+        if index._sorted_rows < len(index):
+            index._merge()
+        index._persisted = index._size
+        return index
+
+
+@functools.lru_cache(maxsize=1)
+def get_duplicate_index() -> DuplicateIndex:
+    """Opens the configured index once per process."""
+    return DuplicateIndex.load(
+        os.environ.get("DUPLICATE_INDEX_PATH", DEFAULT_INDEX_DIR)
+    )
+
+
+# ========================================
+# BACKGROUND RECORDING
+# ========================================
+
+
+class DuplicateRecorder:
+    """Adds adjudicated cases to an index from one background task.
+
+    ``record`` only enqueues the case. The task adds queued cases in batches
+    in a worker thread, and saves a segment once ``flush_rows`` rows are
+    pending. A full queue drops the case: it is still screened, just not
+    remembered. ``close`` adds and saves whatever is left; the app calls it
+    on shutdown. ``_add`` holds a lock, because a cancelled task's worker
+    thread may still be adding its batch when ``close`` drains the queue.
+    """
+
+    def __init__(
+        self,
+        index: DuplicateIndex,
+        max_size: int = 10000,
+        batch_size: int = 256,
+        flush_rows: int = FLUSH_ROWS,
+    ) -> None:
+        self.index = index
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_rows = flush_rows
+        self._queue: asyncio.Queue[CaseInfo] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._add_lock = threading.Lock()
+        self.stats = {"recorded": 0, "dropped": 0, "saves": 0, "failures": 0}
+
+    def _ensure_started(self) -> asyncio.Queue[CaseInfo]:
+        # Created on first use, inside the serving event loop.
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(self.max_size)
+            self._loop = loop
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(self._queue))
+        return self._queue
+
+    def record(self, case: CaseInfo) -> bool:
+        """Queues ``case`` for indexing; False if the queue is full."""
+        try:
+            queue = self._ensure_started()
+        except RuntimeError:  # no event loop, e.g. a script: add inline
+            self._add([case], save=False)
+            return True
+        try:
+            queue.put_nowait(case)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+        return True
+
+    def _add(self, cases: Sequence[CaseInfo], save: bool) -> None:
+        index = self.index
+        with self._add_lock:
+            try:
+                index.add(
+                    [case.case_number for case in cases],
+                    [case.petitioner_name for case in cases],
+                    [case_text(case) for case in cases],
+                )
+                self.stats["recorded"] += len(cases)
+                if (
+                    index.path
+                    and index.pending
+                    and (save or index.pending >= self.flush_rows)
+                ):
+                    index.save()
+                    self.stats["saves"] += 1
+            except Exception:
+                self.stats["failures"] += 1
+                logger.exception("Duplicate index dropped %d cases", len(cases))
+
+    async def _run(self, queue: asyncio.Queue[CaseInfo]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._add, batch, False)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Indexes every queued case, saves pending rows and stops the task."""
+        if self._queue is not None and self._task is not None:
+            if not self._task.done():
+                try:
+                    await asyncio.wait_for(self._queue.join(), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "Duplicate index drain timed out after %.0fs", timeout
+                    )
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+        remaining = []
+        while self._queue is not None and not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        await asyncio.to_thread(self._add, remaining, True)
+
+
+@functools.lru_cache(maxsize=1)
+def get_duplicate_recorder() -> DuplicateRecorder:
+    """Process-wide recorder for the configured index."""
+    return DuplicateRecorder(get_duplicate_index())
+
+
+def assess_duplicate_risk(case: CaseInfo, record: bool = True) -> dict[str, Any]:
+    """Looks up near-duplicate filings for a case and optionally indexes it.
+
+    Args:
+        case: The case being adjudicated
+        record: Queue the case to be added to the index after the lookup
+
+    Returns:
+        dict: Duplicate risk level, the closest matches and how many distinct
+        petitioners filed them
+    """
+    started = time.perf_counter()
+    index = get_duplicate_index()
+    text = case_text(case)
+    matches = index.similar(text, exclude=case.case_number)
+    petitioners = {m["petitioner_name"] for m in matches} | {case.petitioner_name}
+    top = matches[0]["similarity"] if matches else 0.0
+    if top >= HIGH_SIMILARITY or len(petitioners) > RELATED_PETITIONERS:
+        level = "HIGH"
+    elif matches:
+        level = "MEDIUM"
+    else:
+        level = "LOW"
+
+    if record and case.case_number not in index:
+        get_duplicate_recorder().record(case)
+
+    return {
+        "case_number": case.case_number,
+        "duplicate_risk": level,
+        "max_similarity": top,
+        "distinct_petitioners": len(petitioners),
+        "matches": matches,
+        "indexed_filings": len(index),
+        "elapsed_us": round((time.perf_counter() - started) * 1e6, 1),
+    }
+
+
+# ========================================
+# OFFLINE BUILD AND CLUSTERING
+# ========================================
+
+
+def _read_filings(path: str) -> Iterator[dict[str, Any]]:
+    with open(path, newline="") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def build(paths: Iterable[str], index: DuplicateIndex, batch: int = 10_000) -> None:
+    """Adds every filing in the CSV/NDJSON exports to ``index`` in batches."""
+    rows: list[dict[str, Any]] = []
+    for path in paths:
+        for row in _read_filings(path):
+            rows.append(row)
+            if len(rows) == batch:
+                _add_rows(index, rows)
+                rows = []
+    _add_rows(index, rows)
+
+
+def _add_rows(index: DuplicateIndex, rows: list[dict[str, Any]]) -> None:
+    index.add(
+        [str(row["case_number"]) for row in rows],
+        [str(row.get("petitioner_name") or "") for row in rows],
+        [f"{row.get('job_title') or ''} {row.get('job_duties') or ''}" for row in rows],
+    )
+
+
+def write_clusters(index: DuplicateIndex, threshold: float, out: Any) -> int:
+    """Writes one CSV row per clustered filing; returns the cluster count."""
+    writer = csv.writer(out)
+    writer.writerow(
+        ["cluster", "size", "distinct_petitioners", "case_number", "petitioner_name"]
+    )
+    clusters = index.clusters(threshold)
+    for number, rows in enumerate(clusters):
+        petitioners = {index.petitioners[row] for row in rows}
+        for row in rows:
+            writer.writerow(
+                [
+                    number,
+                    len(rows),
+                    len(petitioners),
+                    index.case_numbers[row],
+                    index.petitioners[row],
+                ]
+            )
+    return len(clusters)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="Index CSV/NDJSON filing exports")
+    build_cmd.add_argument("inputs", nargs="+")
+    cluster_cmd = commands.add_parser("cluster", help="Cluster indexed filings")
+    cluster_cmd.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    cluster_cmd.add_argument("--output", help="CSV output (default: stdout)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    index = DuplicateIndex.load(args.index)
+    if args.command == "build":
+        before = len(index)
+        build(args.inputs, index)
+        index.save()
+        print(
+            f"Indexed {len(index) - before:,} filings ({len(index):,} total) "
+            f"in {time.perf_counter() - started:.1f} s"
+        )
+    else:
+        if args.output:
+            with open(args.output, "w", newline="") as out:
+                count = write_clusters(index, args.threshold, out)
+        else:
+            count = write_clusters(index, args.threshold, sys.stdout)
+        print(
+            f"Found {count:,} clusters among {len(index):,} filings "
+            f"in {time.perf_counter() - started:.1f} s",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# Copyright 2025 VisaShield AI
+# Petitioner entity resolution and per-employer filing history
+
+"""Employer index keyed by normalized petitioner name.
+
+``petitioner_name`` arrives as free text ("Acme Corp", "ACME Corporation,
+Inc."). Names are normalized (case, punctuation and legal suffixes dropped)
+and looked up in a dict, so known spellings resolve in O(1). Unseen spellings
+fall back to character-trigram candidates scored by Dice similarity. The
+result, match or miss, is kept in a bounded LRU so repeated lookups are exact
+again, while arbitrary names from callers cannot grow memory.
+
+Each employer carries running aggregates (petitions, approvals, RFEs,
+denials, wage margins) updated in place as outcomes are recorded. Outcomes are
+appended to an NDJSON journal (``EMPLOYER_HISTORY_PATH``) and replayed in a
+thread at app startup; ``python -m app.employer_index import`` loads a historical export.
+"""
+
+import argparse
+import csv
+import functools
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, TextIO
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "employer_history.ndjson"
+)
+
+OUTCOMES = ("APPROVE", "RFE", "DENY")
+MATCH_THRESHOLD = 0.8
+MAX_POSTINGS = 64
+# Fuzzy lookups (matches and misses) remembered per index.
+FUZZY_CACHE_SIZE = 4096
+# Adverse rates are only reported once an employer has this many petitions.
+MIN_HISTORY = 5
+# Most recent spellings kept per employer; names come from callers.
+MAX_ALIASES = 16
+
+LEGAL_SUFFIXES = frozenset(
+    {"inc", "incorporated", "corp", "corporation", "co", "company", "llc", "llp",
+     "lp", "ltd", "limited", "plc", "pllc", "pc", "the"}
+)  # fmt: skip
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=8192)
+def normalize_employer_name(name: str) -> str:
+    """Lowercases, drops punctuation and legal suffixes ("Acme Corp." -> "acme")."""
+    tokens = _TOKEN.findall(name.lower().replace(".", "").replace("&", " and "))
+    core = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return " ".join(core or tokens)
+
+
+def trigrams(key: str) -> frozenset[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass
+class EmployerStats:
+    """Running filing aggregates for one employer."""
+
+    employer_id: int
+    name: str
+    # Insertion-ordered, least recently seen first.
+    aliases: OrderedDict[str, None] = field(default_factory=OrderedDict)
+    petitions: int = 0
+    approved: int = 0
+    rfe: int = 0
+    denied: int = 0
+    wage_margin_total: float = 0.0
+    wage_margin_count: int = 0
+    wage_margin_min: float | None = None
+    last_filed: str | None = None
+
+    def add_alias(self, name: str) -> None:
+        """Remembers a spelling, evicting the least recently seen past MAX_ALIASES."""
+        self.aliases[name] = None
+        self.aliases.move_to_end(name)
+        if len(self.aliases) > MAX_ALIASES:
+            self.aliases.popitem(last=False)
+
+    def record(
+        self, outcome: str, wage_margin: float | None, filed: str | None
+    ) -> None:
+        self.petitions += 1
+        if outcome == "APPROVE":
+            self.approved += 1
+        elif outcome == "RFE":
+            self.rfe += 1
+        elif outcome == "DENY":
+            self.denied += 1
+        if wage_margin is not None:
+            self.wage_margin_total += wage_margin
+            self.wage_margin_count += 1
+            if self.wage_margin_min is None or wage_margin < self.wage_margin_min:
+                self.wage_margin_min = wage_margin
+        if filed and (self.last_filed is None or filed > self.last_filed):
+            self.last_filed = filed
+
+    @property
+    def adverse_rate(self) -> float:
+        """Share of petitions ending in an RFE or denial."""
+        return (self.rfe + self.denied) / self.petitions if self.petitions else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        def rate(count: int) -> float:
+            return round(count / self.petitions, 3) if self.petitions else 0.0
+
+        return {
+            "employer_id": self.employer_id,
+            "name": self.name,
+            "aliases": sorted(self.aliases),
+            "petitions": self.petitions,
+            "approval_rate": rate(self.approved),
+            "rfe_rate": rate(self.rfe),
+            "denial_rate": rate(self.denied),
+            "avg_wage_margin_pct": round(
+                100 * self.wage_margin_total / self.wage_margin_count, 1
+            )
+            if self.wage_margin_count
+            else None,
+            "min_wage_margin_pct": round(100 * self.wage_margin_min, 1)
+            if self.wage_margin_min is not None
+            else None,
+            "last_filed": self.last_filed,
+            "sufficient_history": self.petitions >= MIN_HISTORY,
+        }
+
+
+class EmployerIndex:
+    """Resolves petitioner names to employers and keeps their aggregates."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.employers: list[EmployerStats] = []
+        self._by_key: dict[str, int] = {}
+        self._grams: list[frozenset[str]] = []
+        self._postings: dict[str, list[int]] = {}
+        # Fuzzy lookup results by normalized name; None is a miss.
+        self._fuzzy: OrderedDict[str, int | None] = OrderedDict()
+        self._journal: TextIO | None = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.employers)
+
+    def resolve(self, name: str) -> EmployerStats | None:
+        """The employer ``name`` refers to, or None if it is unknown."""
+        key = normalize_employer_name(name)
+        employer_id = self._by_key.get(key)
+        if employer_id is None:
+            # Bulk scoring resolves from worker threads.
+            with self._lock:
+                if key in self._fuzzy:
+                    self._fuzzy.move_to_end(key)
+                    employer_id = self._fuzzy[key]
+                else:
+                    employer_id = self._fuzzy[key] = self._fuzzy_match(key)
+                    if len(self._fuzzy) > FUZZY_CACHE_SIZE:
+                        self._fuzzy.popitem(last=False)
+            if employer_id is None:
+                return None
+        return self.employers[employer_id]
+
+    def _fuzzy_match(self, key: str) -> int | None:
+        grams = trigrams(key)
+        # Prefix filter: a Dice score >= MATCH_THRESHOLD needs an overlap of at
+        # least t = threshold / (2 - threshold) of the query's trigrams, so any
+        # match shares one of its len - ceil(t * len) + 1 rarest trigrams. Only
+        # those posting lists are scanned, skipping ubiquitous ones ("tec",
+        # "ons", ...) that would make every lookup linear.
+        overlap = MATCH_THRESHOLD / (2 - MATCH_THRESHOLD)
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: set[int] = set()
+        for gram in rarest[: len(grams) - math.ceil(overlap * len(grams)) + 1]:
+            postings = self._postings.get(gram, ())
+            if len(postings) <= MAX_POSTINGS:
+                candidates.update(postings)
+
+        best, best_score = None, MATCH_THRESHOLD
+        for employer_id in candidates:
+            other = self._grams[employer_id]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score >= best_score:
+                best, best_score = employer_id, score
+        return best
+
+    def _add(self, name: str) -> EmployerStats:
+        key = normalize_employer_name(name)
+        employer = EmployerStats(len(self.employers), name)
+        self.employers.append(employer)
+        self._by_key[key] = employer.employer_id
+        self._grams.append(trigrams(key))
+        for gram in self._grams[-1]:
+            self._postings.setdefault(gram, []).append(employer.employer_id)
+        # A new employer may be a closer match for remembered lookups.
+        self._fuzzy.clear()
+        return employer
+
+    def record(
+        self,
+        petitioner_name: str,
+        outcome: str,
+        offered_wage: float | None = None,
+        prevailing_wage: float | None = None,
+        filed: str | None = None,
+        journal: bool = True,
+    ) -> EmployerStats:
+        """Folds one adjudication outcome into the employer's aggregates."""
+        outcome = outcome.upper()
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome: {outcome}")
+        margin = (
+            (offered_wage - prevailing_wage) / prevailing_wage
+            if offered_wage and prevailing_wage
+            else None
+        )
+        with self._lock:
+            employer = self.resolve(petitioner_name) or self._add(petitioner_name)
+            if petitioner_name != employer.name:
+                employer.add_alias(petitioner_name)
+            employer.record(outcome, margin, filed)
+            if journal and self.path:
+                entry = {
+                    "petitioner_name": petitioner_name,
+                    "outcome": outcome,
+                    "offered_wage": offered_wage,
+                    "prevailing_wage": prevailing_wage,
+                    "filed": filed,
+                }
+                if self._journal is None:
+                    self._journal = open(self.path, "a", buffering=1)
+                self._journal.write(json.dumps(entry) + "\n")
+        return employer
+
+    @classmethod
+    def load(cls, path: str) -> "EmployerIndex":
+        """Replays the outcome journal at ``path`` (which may not exist yet)."""
+        index = cls(path)
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        index.record(**json.loads(line), journal=False)
+        return index
+
+
+@functools.lru_cache(maxsize=1)
+def get_employer_index() -> EmployerIndex:
+    """Loads the configured employer history once per process."""
+    return EmployerIndex.load(
+        os.environ.get("EMPLOYER_HISTORY_PATH", DEFAULT_HISTORY_PATH)
+    )
+
+
+def employer_profile(petitioner_name: str) -> dict[str, Any] | None:
+    """Aggregated filing history for a petitioner, or None if it is unknown."""
+    employer = get_employer_index().resolve(petitioner_name)
+    return employer.as_dict() if employer else None
+
+
+def employer_adverse_rate(petitioner_name: str) -> float:
+    """RFE/denial rate for employers with enough history, otherwise 0."""
+    employer = get_employer_index().resolve(petitioner_name)
+    if employer is None or employer.petitions < MIN_HISTORY:
+        return 0.0
+    return employer.adverse_rate
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["import"])
+    parser.add_argument(
+        "csv",
+        help="Outcome export: petitioner_name,outcome[,offered_wage,prevailing_wage,filed]",
+    )
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH)
+    args = parser.parse_args(argv)
+
+    index = EmployerIndex.load(args.history)
+    before = len(index)
+    with open(args.csv, newline="") as f:
+        rows = 0
+        for row in csv.DictReader(f):
+            index.record(
+                row["petitioner_name"],
+                row["outcome"],
+                float(row["offered_wage"]) if row.get("offered_wage") else None,
+                float(row["prevailing_wage"]) if row.get("prevailing_wage") else None,
+                row.get("filed") or date.today().isoformat(),
+            )
+            rows += 1
+    print(f"Imported {rows:,} outcomes; {len(index) - before:,} new employers")
+
+
+if __name__ == "__main__":
+    main()
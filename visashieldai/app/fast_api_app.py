@@ -12,63 +12,124 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-import google.auth
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 from google.adk.cli.fast_api import get_fast_api_app
-from google.cloud import logging as google_cloud_logging
 
 from app.adjudicator_api import router as adjudicator_router
-from app.app_utils.telemetry import setup_telemetry
+from app.app_utils import serving
+from app.app_utils.admission import AdmissionMiddleware, get_admission_controller
+from app.app_utils.compression import GZIP_LEVEL, min_bytes
+from app.app_utils.feedback_queue import get_feedback_queue
+from app.app_utils.gcp import offline_mode
+from app.app_utils.telemetry import setup_telemetry, setup_trace_export
 from app.app_utils.typing import Feedback
-
+from app.app_utils.watchdog import get_loop_watchdog
+from app.ask_via_api import router as ask_via_router
+from app.duplicate_index import get_duplicate_index, get_duplicate_recorder
+from app.employer_index import get_employer_index
+from app.latency import latency_metrics
+
+# Credentials, Vertex AI and the Cloud Logging client are resolved on first
+# use (app.app_utils.gcp), so importing this module needs no network.
 setup_telemetry()
-_, project_id = google.auth.default()
-logging_client = google_cloud_logging.Client()
-logger = logging_client.logger(__name__)
 allow_origins = (
     os.getenv("ALLOW_ORIGINS", "").split(",") if os.getenv("ALLOW_ORIGINS") else None
 )
 
 # Artifact bucket for ADK (created by Terraform, passed via env var)
-logs_bucket_name = os.environ.get("LOGS_BUCKET_NAME")
+logs_bucket_name = None if offline_mode() else os.environ.get("LOGS_BUCKET_NAME")
 
 AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-# In-memory session configuration - no persistent storage
-session_service_uri = None
+# In-memory sessions unless SESSION_SERVICE_URI names a shared database
+session_service_uri = serving.session_service_uri()
 
 artifact_service_uri = f"gs://{logs_bucket_name}" if logs_bucket_name else None
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    get_loop_watchdog().ensure_started()
+    # Load indexes before the first request instead of during it.
+    await asyncio.to_thread(get_duplicate_index)
+    await asyncio.to_thread(get_employer_index)
+    yield
+    # Write out feedback and index segments still queued before the worker exits.
+    await get_feedback_queue().close()
+    await get_duplicate_recorder().close()
+
+
 app: FastAPI = get_fast_api_app(
     agents_dir=AGENT_DIR,
     web=True,
     artifact_service_uri=artifact_service_uri,
     allow_origins=allow_origins,
     session_service_uri=session_service_uri,
-    otel_to_cloud=True,
+    otel_to_cloud=not offline_mode(),
+    lifespan=lifespan,
 )
+# After ADK has installed its tracer provider
+setup_trace_export()
 app.title = "visashieldai"
 app.description = "API for interacting with the Agent visashieldai"
 
-# Include adjudicator API routes
+# Include adjudicator and Ask VIA API routes
 app.include_router(adjudicator_router)
+app.include_router(ask_via_router)
+
+# Large JSON from every route; event streams and encoded responses pass through
+app.add_middleware(GZipMiddleware, minimum_size=min_bytes(), compresslevel=GZIP_LEVEL)
+# Shed new work with 503 once this worker is saturated
+app.add_middleware(AdmissionMiddleware, controller=get_admission_controller())
 
 
 @app.post("/feedback")
-def collect_feedback(feedback: Feedback) -> dict[str, str]:
+async def collect_feedback(feedback: Feedback) -> dict[str, str]:
     """Collect and log feedback.
 
+    The entry is queued and written in batches in the background, so the
+    response does not wait on the logging backend.
+
     Args:
         feedback: The feedback data to log
 
     Returns:
         Success message
     """
-    logger.log_struct(feedback.model_dump(), severity="INFO")
+    if not await get_feedback_queue().offer(feedback.model_dump()):
+        raise HTTPException(
+            status_code=503,
+            detail="Feedback queue is full, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     return {"status": "success"}
 
 
+@app.get("/feedback/metrics")
+async def get_feedback_metrics() -> dict[str, Any]:
+    """Queue depth, accepted, rejected and flushed feedback entries."""
+    return get_feedback_queue().metrics()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """Adjudication latency histograms in the Prometheus text format."""
+    return PlainTextResponse(
+        latency_metrics.prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+# Stall reports name the route whose code blocked the event loop
+get_loop_watchdog().register_routes(app.routes)
+
+
 # Main execution
 if __name__ == "__main__":
     import uvicorn
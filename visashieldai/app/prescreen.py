@@ -0,0 +1,221 @@
+# Copyright 2025 VisaShield AI
+# Deterministic rule-based pre-screen run before any model call
+
+"""Declarative deficiency rules evaluated against ``CaseInfo``.
+
+Obviously deficient petitions (missing LCA number, offered wage below the
+prevailing wage, ...) do not need a multi-turn agent run to reach an RFE. The
+rules below are compiled once into per-visa-type tuples of predicates, so a
+pre-screen is a handful of attribute reads and comparisons. Each rule points
+at a criterion in ``app.criteria.EVALUATION_CRITERIA`` so the result lines up
+with what the frontend already shows.
+"""
+
+import functools
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app.adjudicator_models import CaseInfo
+from app.criteria import get_criterion, normalize_visa_type
+from app.degree_equivalency import get_degree_index, normalize_degree
+from app.prevailing_wage import resolve_prevailing_wage
+
+# US-equivalent years of study of a master's degree: a bachelor's plus two.
+ADVANCED_DEGREE_YEARS = 6
+ADVANCED_DEGREE_PREFIXES = ("master", "doctor", "phd")
+
+
+@functools.lru_cache(maxsize=1024)
+def is_advanced_degree(degree: str) -> bool:
+    """Whether ``degree`` names a US master's degree or higher.
+
+    Spellings are resolved through the degree-equivalency table
+    ("M.Sc.", "MEng", "Doctor of Philosophy", ...); any name starting with
+    "master" or "doctor" also counts.
+    """
+    if normalize_degree(degree).startswith(ADVANCED_DEGREE_PREFIXES):
+        return True
+    found = get_degree_index().lookup("United States", degree)
+    return found is not None and found[0].us_years >= ADVANCED_DEGREE_YEARS
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single declarative pre-screen rule.
+
+    Attributes:
+        rule_id: Stable identifier reported in results
+        visa_type: Visa classification the rule applies to
+        criterion_id: Criterion in the registry the rule evidences
+        field: CaseInfo field the rule reads
+        op: Operator name from OPERATORS
+        message: Deficiency text used when the rule fails
+        value: Operand for the operator, if any
+    """
+
+    rule_id: str
+    visa_type: str
+    criterion_id: str
+    field: str
+    op: str
+    message: str
+    value: Any = None
+
+
+RULES: tuple[Rule, ...] = (
+    Rule("H1B-001", "H-1B", "1", "job_duties", "required", "Job duties are not described"),
+    Rule("H1B-002", "H-1B", "2", "degree_type", "required", "Beneficiary degree type is missing"),
+    Rule("H1B-003", "H-1B", "2", "degree_field", "required", "Beneficiary field of study is missing"),
+    Rule("H1B-004", "H-1B", "3", "work_location", "required", "Work location is missing"),
+    Rule("H1B-005", "H-1B", "4", "offered_wage", "required", "Offered wage is missing"),
+    Rule("H1B-006", "H-1B", "4", "offered_wage", "meets_prevailing_wage", "Offered wage is below the prevailing wage"),
+    Rule("H1B-007", "H-1B", "5", "lca_number", "required", "LCA number is missing"),
+    Rule("O1-001", "O-1", "3", "job_duties", "required", "Intended work in the field is not described"),
+    Rule("NIW-001", "EB-2 NIW", "1", "degree_type", "required", "Beneficiary degree type is missing"),
+    Rule("NIW-002", "EB-2 NIW", "1", "degree_type", "advanced_degree", "Degree is not an advanced degree or equivalent", 5),
+)  # fmt: skip
+
+
+# ========================================
+# RULE COMPILATION
+# ========================================
+
+Predicate = Callable[[CaseInfo], bool]
+
+
+def _required(rule: Rule) -> Predicate:
+    field = rule.field
+
+    def check(case: CaseInfo) -> bool:
+        value = getattr(case, field)
+        return value is not None and value != ""
+
+    return check
+
+
+def _meets_prevailing_wage(rule: Rule) -> Predicate:
+    field = rule.field
+
+    def check(case: CaseInfo) -> bool:
+        offered = getattr(case, field)
+        prevailing = case.prevailing_wage or resolve_prevailing_wage(
+            case.soc_code, case.work_location, case.wage_level
+        )
+        # Unknown wages are left to the agent; only a known shortfall fails.
+        return offered is None or not prevailing or offered >= prevailing
+
+    return check
+
+
+def _advanced_degree(rule: Rule) -> Predicate:
+    field, min_years = rule.field, rule.value
+
+    def check(case: CaseInfo) -> bool:
+        degree = getattr(case, field)
+        if not degree:
+            return True  # reported by the "required" rule
+        if is_advanced_degree(degree):
+            return True
+        # A bachelor's plus five years of progressive experience qualifies.
+        return (case.years_experience or 0) >= min_years
+
+    return check
+
+
+OPERATORS: dict[str, Callable[[Rule], Predicate]] = {
+    "required": _required,
+    "meets_prevailing_wage": _meets_prevailing_wage,
+    "advanced_degree": _advanced_degree,
+}
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule: Rule
+    criterion: str
+    predicate: Predicate
+
+
+def compile_rules(rules: Iterable[Rule]) -> dict[str, tuple[CompiledRule, ...]]:
+    """Groups rules by visa type and binds each to its predicate."""
+    compiled: dict[str, list[CompiledRule]] = {}
+    for rule in rules:
+        criterion = get_criterion(rule.visa_type, rule.criterion_id)
+        if criterion is None:
+            raise ValueError(f"{rule.rule_id}: unknown criterion {rule.criterion_id}")
+        compiled.setdefault(rule.visa_type.upper(), []).append(
+            CompiledRule(rule, criterion["name"], OPERATORS[rule.op](rule))
+        )
+    return {visa_type: tuple(rules) for visa_type, rules in compiled.items()}
+
+
+COMPILED_RULES = compile_rules(RULES)
+
+
+# ========================================
+# EVALUATION
+# ========================================
+
+
+def prescreen_case(case: CaseInfo) -> dict[str, Any]:
+    """Evaluates the pre-screen rules for a case.
+
+    Args:
+        case: The case to screen
+
+    Returns:
+        dict: ``passed`` plus, for deficient cases, an RFE-style result listing
+        the failed criteria
+    """
+    started = time.perf_counter()
+    rules = COMPILED_RULES.get(normalize_visa_type(case.visa_type), ())
+    deficiencies = [
+        {
+            "rule_id": compiled.rule.rule_id,
+            "criterion_id": compiled.rule.criterion_id,
+            "criterion": compiled.criterion,
+            "issue": compiled.rule.message,
+        }
+        for compiled in rules
+        if not compiled.predicate(case)
+    ]
+    result: dict[str, Any] = {
+        "case_number": case.case_number,
+        "visa_type": case.visa_type,
+        "passed": not deficiencies,
+        "rules_evaluated": len(rules),
+        "deficiencies": deficiencies,
+    }
+    if deficiencies:
+        failed = sorted({d["criterion"] for d in deficiencies})
+        result.update(
+            recommendation="RFE",
+            summary=f"Request for Evidence recommended: {len(deficiencies)} deficiencies across {', '.join(failed)}.",
+            requires_human_review=True,
+        )
+    result["elapsed_us"] = round((time.perf_counter() - started) * 1e6, 1)
+    return result
+
+
+def prescreen_cases(cases: Iterable[CaseInfo]) -> dict[str, Any]:
+    """Pre-screens a queue of cases and summarizes the outcome."""
+    started = time.perf_counter()
+    results = [prescreen_case(case) for case in cases]
+    deficient = sum(1 for result in results if not result["passed"])
+    return {
+        "total": len(results),
+        "deficient": deficient,
+        "passed": len(results) - deficient,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "results": results,
+    }
+
+
+def format_deficiencies(result: dict[str, Any]) -> str:
+    """Renders pre-screen deficiencies as prompt or summary text."""
+    return "\n".join(
+        f"- {d['criterion']}: {d['issue']} ({d['rule_id']})"
+        for d in result["deficiencies"]
+    )
@@ -0,0 +1,293 @@
+# Copyright 2025 VisaShield AI
+# OFLC prevailing-wage index backing LCA compliance checks
+
+"""Compact, memory-mapped index over the DOL OFLC prevailing-wage tables.
+
+The OFLC publishes wages as CSV exports with one row per area x SOC code and
+four wage levels. Those files run to millions of rows, so they are compiled
+once into a columnar binary file:
+
+    header | row keys (u64, sorted) | level 1..4 wages (f64 columns)
+           | location keys (u64, sorted) | location areas (u64)
+
+Row keys are ``area * 1_000_000 + soc`` and location keys are 64-bit hashes of
+normalized ``"city|st"`` strings. At runtime the file is mapped read-only and
+both lookups are a binary search over a ``memoryview`` of the mapping, so
+startup does not parse anything. A cold lookup costs a few microseconds and
+repeat lookups are served from an LRU cache in well under one.
+
+Build the index with:
+
+    python -m app.prevailing_wage --wages ALC_Export.csv --geography Geography.csv
+"""
+
+import argparse
+import bisect
+import csv
+import functools
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Any
+
+MAGIC = b"VSPW"
+VERSION = 1
+WAGE_LEVELS = 4
+HOURS_PER_YEAR = 2080
+HEADER = struct.Struct("<4sHHQQQ")
+LOOKUP_CACHE_SIZE = 65536
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "prevailing_wage.idx"
+)
+
+_LOCATION_SUFFIXES = re.compile(
+    r"\s+(county|city|town|township|borough|parish|municipality|census area)$"
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def soc_key(soc_code: str) -> int | None:
+    """Converts an SOC code such as ``15-1252`` or ``15-1252.00`` to an int."""
+    digits = soc_code.strip().replace("-", "")[:6]
+    if len(digits) != 6 or not digits.isdigit():
+        return None
+    return int(digits)
+
+
+def normalize_location(place: str, state: str) -> str:
+    """Normalizes a place name and state abbreviation into an index key."""
+    name = _NON_ALNUM.sub(" ", place.lower()).strip()
+    name = _LOCATION_SUFFIXES.sub("", " ".join(name.split()))
+    return f"{name}|{state.strip().lower()}"
+
+
+def location_key(normalized: str) -> int:
+    """Hashes a normalized location into a stable 64-bit key."""
+    digest = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def parse_work_location(work_location: str) -> tuple[str, str] | None:
+    """Splits a ``"City, ST"`` work location into its place and state parts."""
+    place, sep, state = work_location.rpartition(",")
+    if not sep or not place.strip() or not state.strip():
+        return None
+    return place, state.split()[0]
+
+
+class PrevailingWageIndex:
+    """Read-only view over a compiled prevailing-wage index file."""
+
+    def __init__(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise RuntimeError("Prevailing-wage index requires a little-endian host")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, levels, n_rows, n_locations, _ = HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != MAGIC or version != VERSION or levels != WAGE_LEVELS:
+            self._mmap.close()
+            raise ValueError(f"Not a prevailing-wage index (v{VERSION}): {path}")
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+
+        def column(fmt: Any, count: int) -> memoryview:
+            nonlocal offset
+            start, offset = offset, offset + 8 * count
+            return view[start:offset].cast(fmt)
+
+        self.row_keys = column("Q", n_rows)
+        self.level_wages = [column("d", n_rows) for _ in range(WAGE_LEVELS)]
+        self.location_keys = column("Q", n_locations)
+        self.location_areas = column("Q", n_locations)
+        self._views = [
+            view,
+            self.row_keys,
+            *self.level_wages,
+            self.location_keys,
+            self.location_areas,
+        ]
+        # Work locations and SOC codes repeat heavily across petitions, so
+        # repeat lookups skip normalization, hashing and both searches.
+        self._cached_lookup = functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)(
+            self._lookup
+        )
+
+    def __len__(self) -> int:
+        return len(self.row_keys)
+
+    def close(self) -> None:
+        """Releases the column views and unmaps the file."""
+        self._cached_lookup.cache_clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def resolve_area(self, work_location: str) -> int | None:
+        """Maps a ``"City, ST"`` or ``"County, ST"`` location to an OFLC area."""
+        parts = parse_work_location(work_location)
+        if parts is None:
+            return None
+        key = location_key(normalize_location(*parts))
+        i = bisect.bisect_left(self.location_keys, key)
+        if i < len(self.location_keys) and self.location_keys[i] == key:
+            return self.location_areas[i]
+        return None
+
+    def wage_for_area(self, area: int, soc_code: str, wage_level: int) -> float | None:
+        """Returns the annual prevailing wage for an area, SOC code and level."""
+        soc = soc_key(soc_code)
+        if soc is None or not 1 <= wage_level <= WAGE_LEVELS:
+            return None
+        key = area * 1_000_000 + soc
+        i = bisect.bisect_left(self.row_keys, key)
+        if i == len(self.row_keys) or self.row_keys[i] != key:
+            return None
+        wage = self.level_wages[wage_level - 1][i]
+        return wage if wage > 0 else None
+
+    def lookup(
+        self, soc_code: str, work_location: str, wage_level: int
+    ) -> float | None:
+        """Returns the annual prevailing wage for a work location, or None."""
+        return self._cached_lookup(soc_code, work_location, wage_level)
+
+    def _lookup(
+        self, soc_code: str, work_location: str, wage_level: int
+    ) -> float | None:
+        area = self.resolve_area(work_location)
+        if area is None:
+            return None
+        return self.wage_for_area(area, soc_code, wage_level)
+
+
+@functools.lru_cache(maxsize=1)
+def get_prevailing_wage_index() -> PrevailingWageIndex | None:
+    """Opens the configured index once per process; None if it is not built."""
+    path = os.environ.get("PREVAILING_WAGE_INDEX_PATH", DEFAULT_INDEX_PATH)
+    if not os.path.exists(path):
+        return None
+    return PrevailingWageIndex(path)
+
+
+def resolve_prevailing_wage(
+    soc_code: str | None, work_location: str | None, wage_level: int | None
+) -> float | None:
+    """Looks up the OFLC prevailing wage, returning None when it is unknown."""
+    if not soc_code or not work_location or not wage_level:
+        return None
+    index = get_prevailing_wage_index()
+    if index is None:
+        return None
+    return index.lookup(soc_code, work_location, wage_level)
+
+
+# ========================================
+# INDEX COMPILATION
+# ========================================
+
+
+def _parse_wage(value: str | None, hours_per_year: int) -> float:
+    try:
+        wage = float((value or "").replace(",", "").replace("$", ""))
+    except ValueError:
+        return 0.0
+    # OFLC exports hourly rates; annual figures are passed through as-is.
+    return round(wage * hours_per_year, 2) if wage < 1000 else wage
+
+
+def _read_geography(path: str) -> dict[int, int]:
+    """Builds location key -> area from the OFLC geography export.
+
+    County/town names take precedence; the principal cities named in the area
+    title (e.g. "San Francisco-Oakland-Hayward, CA") fill in the gaps.
+    """
+    counties: dict[int, int] = {}
+    cities: dict[int, int] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            area = int(row["Area"])
+            state = row["StateAb"]
+            county = row.get("CountyTownName") or ""
+            if county:
+                counties[location_key(normalize_location(county, state))] = area
+            area_name = (row.get("AreaName") or "").rpartition(",")[0]
+            for city in area_name.split("-"):
+                if city.strip():
+                    key = location_key(normalize_location(city, state))
+                    cities.setdefault(key, area)
+    return {**cities, **counties}
+
+
+def compile_index(
+    wages_csv: str,
+    geography_csv: str,
+    output_path: str,
+    hours_per_year: int = HOURS_PER_YEAR,
+) -> dict[str, Any]:
+    """Compiles OFLC wage and geography CSVs into a binary index file.
+
+    Args:
+        wages_csv: OFLC wage export with Area, SocCode and Level1-Level4 columns
+        geography_csv: OFLC geography export with Area, AreaName, StateAb and
+            CountyTownName columns
+        output_path: Destination of the compiled index
+        hours_per_year: Multiplier used to annualize hourly wages
+
+    Returns:
+        dict: Row and location counts written to the index
+    """
+    rows: dict[int, tuple[float, ...]] = {}
+    with open(wages_csv, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            soc = soc_key(row["SocCode"])
+            if soc is None:
+                continue
+            rows[int(row["Area"]) * 1_000_000 + soc] = tuple(
+                _parse_wage(row.get(f"Level{level}"), hours_per_year)
+                for level in range(1, WAGE_LEVELS + 1)
+            )
+    locations = _read_geography(geography_csv)
+
+    keys = sorted(rows)
+    location_keys = sorted(locations)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(
+            HEADER.pack(MAGIC, VERSION, WAGE_LEVELS, len(keys), len(location_keys), 0)
+        )
+        out.write(array("Q", keys).tobytes())
+        for level in range(WAGE_LEVELS):
+            out.write(array("d", (rows[key][level] for key in keys)).tobytes())
+        out.write(array("Q", location_keys).tobytes())
+        out.write(array("Q", (locations[key] for key in location_keys)).tobytes())
+    os.replace(tmp_path, output_path)
+    get_prevailing_wage_index.cache_clear()
+    return {"rows": len(keys), "locations": len(location_keys), "path": output_path}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wages", required=True, help="OFLC ALC/EDC wage CSV")
+    parser.add_argument("--geography", required=True, help="OFLC geography CSV")
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--hours-per-year", type=int, default=HOURS_PER_YEAR)
+    args = parser.parse_args(argv)
+    stats = compile_index(
+        args.wages, args.geography, args.output, hours_per_year=args.hours_per_year
+    )
+    print(f"Wrote {stats['rows']:,} wages / {stats['locations']:,} locations")
+
+
+if __name__ == "__main__":
+    main()
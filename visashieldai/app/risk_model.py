@@ -0,0 +1,280 @@
+# Copyright 2025 VisaShield AI
+# Vectorized case risk scoring for triage ordering
+
+"""Logistic risk model over engineered ``CaseInfo`` features.
+
+Features are extracted column-wise into a NumPy matrix, so scoring a queue is
+one matrix-vector product plus a sigmoid. Each ``CaseInfo`` field is read once
+into a column. Text features are computed once per distinct value, and
+missing-field counts are NumPy comparisons over the columns. Weights live in a JSON file
+(``app/data/risk_model.json`` by default, ``RISK_MODEL_PATH`` to override) so a
+retrained model can be dropped in without a code change.
+"""
+
+import functools
+import json
+import operator
+import os
+import re
+import time
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.adjudicator_models import CaseInfo
+from app.employer_index import employer_adverse_rate
+from app.prescreen import is_advanced_degree
+from app.prevailing_wage import resolve_prevailing_wage
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "risk_model.json"
+)
+
+FEATURES = (
+    "wage_margin_ratio",
+    "wage_unknown",
+    "experience_decades",
+    "advanced_degree",
+    "degree_field_mismatch",
+    "remote_work",
+    "client_site",
+    "missing_field_ratio",
+    "entry_wage_level",
+    "employer_adverse_rate",
+)
+
+REQUIRED_FIELDS = (
+    "job_title",
+    "job_duties",
+    "degree_type",
+    "degree_field",
+    "years_experience",
+    "work_location",
+    "offered_wage",
+    "lca_number",
+)
+
+# Degree-field keywords and the job-title terms they customarily lead to.
+RELATED_TERMS: dict[str, frozenset[str]] = {
+    "computer": frozenset(
+        {"software", "developer", "engineer", "programmer", "data", "systems",
+         "cloud", "devops", "security", "network", "architect"}
+    ),
+    "information": frozenset(
+        {"systems", "data", "analyst", "developer", "software", "security", "network"}
+    ),
+    "electrical": frozenset({"engineer", "hardware", "electronics", "embedded"}),
+    "mechanical": frozenset({"engineer", "design", "manufacturing"}),
+    "mathematics": frozenset({"data", "analyst", "scientist", "quantitative", "actuary"}),
+    "statistics": frozenset({"data", "analyst", "scientist", "statistician"}),
+    "finance": frozenset({"financial", "analyst", "accountant", "auditor"}),
+    "accounting": frozenset({"accountant", "auditor", "financial"}),
+    "business": frozenset({"analyst", "manager", "consultant"}),
+}  # fmt: skip
+RELATED_TERMS["software"] = RELATED_TERMS["computer"]
+
+_WORD = re.compile(r"[a-z]+")
+_CLIENT_SITE = re.compile(r"client|third[- ]party|various|multiple|end[- ]client")
+
+
+@functools.lru_cache(maxsize=4096)
+def _field_mismatch(degree_field: str, job_title: str) -> float:
+    degree_terms = set(_WORD.findall(degree_field.lower()))
+    job_terms = set(_WORD.findall(job_title.lower()))
+    if not degree_terms or not job_terms:
+        return 0.0
+    related = set(degree_terms)
+    for term in degree_terms:
+        related |= RELATED_TERMS.get(term, frozenset())
+    return 0.0 if related & job_terms else 1.0
+
+
+@functools.lru_cache(maxsize=4096)
+def _location_flags(work_location: str) -> tuple[float, float]:
+    location = work_location.lower()
+    return float("remote" in location), float(bool(_CLIENT_SITE.search(location)))
+
+
+# Every field extract_features reads.
+COLUMNS = (
+    *REQUIRED_FIELDS,
+    "prevailing_wage",
+    "soc_code",
+    "wage_level",
+    "petitioner_name",
+)
+
+
+def _per_value(values: Collection[Any], feature: Callable[[Any], float]) -> np.ndarray:
+    """``feature`` of each value, computed once per distinct value."""
+    computed = {value: feature(value) for value in set(values)}
+    return np.fromiter(
+        map(computed.__getitem__, values), dtype=np.float64, count=len(values)
+    )
+
+
+def _is_none(column: np.ndarray) -> np.ndarray:
+    return column == None  # noqa: E711 (elementwise)
+
+
+def _numbers(column: np.ndarray) -> np.ndarray:
+    """A column of optional numbers as float64, with None as 0."""
+    return np.where(_is_none(column), 0, column).astype(np.float64)
+
+
+def extract_features(cases: Sequence[CaseInfo]) -> np.ndarray:
+    """Builds the (cases x FEATURES) feature matrix."""
+    column = {
+        name: np.fromiter(
+            map(operator.attrgetter(name), cases), dtype=object, count=len(cases)
+        )
+        for name in COLUMNS
+    }
+
+    offered = _numbers(column["offered_wage"])
+    prevailing = _numbers(column["prevailing_wage"])
+    for i in np.flatnonzero(prevailing <= 0).tolist():
+        prevailing[i] = (
+            resolve_prevailing_wage(
+                column["soc_code"][i],
+                column["work_location"][i],
+                column["wage_level"][i],
+            )
+            or 0.0
+        )
+    known = (offered > 0) & (prevailing > 0)
+    margin = np.divide(
+        offered - prevailing, prevailing, out=np.zeros_like(offered), where=known
+    )
+    missing = np.zeros(len(cases))
+    for name in REQUIRED_FIELDS:
+        missing += _is_none(column[name]) | (column[name] == "")
+
+    return np.column_stack(
+        [
+            np.clip(margin, -1.0, 1.0),
+            (~known).astype(np.float64),
+            np.clip(_numbers(column["years_experience"]), 0, 20) / 10.0,
+            _per_value(
+                column["degree_type"],
+                lambda d: is_advanced_degree(d or ""),
+            ),
+            _per_value(
+                list(zip(column["degree_field"], column["job_title"], strict=True)),
+                lambda pair: _field_mismatch(pair[0] or "", pair[1] or ""),
+            ),
+            _per_value(column["work_location"], lambda w: _location_flags(w or "")[0]),
+            _per_value(column["work_location"], lambda w: _location_flags(w or "")[1]),
+            missing / len(REQUIRED_FIELDS),
+            np.equal(column["wage_level"], 1),
+            _per_value(column["petitioner_name"], employer_adverse_rate),
+        ]
+    ).astype(np.float64)
+
+
+@dataclass(frozen=True)
+class RiskModel:
+    """Logistic model loaded from a serialized weight file."""
+
+    features: tuple[str, ...]
+    weights: np.ndarray
+    bias: float
+    tiers: tuple[tuple[str, float], ...]
+
+    @classmethod
+    def load(cls, path: str) -> "RiskModel":
+        with open(path) as f:
+            spec = json.load(f)
+        if tuple(spec["features"]) != FEATURES:
+            raise ValueError(f"Risk model features do not match FEATURES: {path}")
+        tiers = sorted(spec["tiers"].items(), key=lambda tier: -tier[1])
+        return cls(
+            features=FEATURES,
+            weights=np.asarray(spec["weights"], dtype=np.float64),
+            bias=float(spec["bias"]),
+            tiers=tuple(tiers),
+        )
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """Risk probabilities for a feature matrix."""
+        return 1.0 / (1.0 + np.exp(-(features @ self.weights + self.bias)))
+
+    def tier(self, scores: np.ndarray) -> np.ndarray:
+        """Tier names (e.g. HIGH/MEDIUM/LOW) for an array of scores."""
+        return np.select(
+            [scores >= threshold for _, threshold in self.tiers],
+            [name for name, _ in self.tiers],
+            default="LOW",
+        )
+
+    def top_factors(
+        self, features: np.ndarray, count: int = 3
+    ) -> list[tuple[str, ...]]:
+        """Names of the features pushing each case's risk up the most."""
+        contributions = features * self.weights
+        count = min(count, len(self.features))
+        # Partition out the top ``count`` per case and sort only those.
+        top = np.argpartition(-contributions, count - 1, axis=1)[:, :count]
+        order = np.argsort(-np.take_along_axis(contributions, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        # Drop non-positive contributions, then resolve names once per distinct
+        # combination instead of once per case.
+        top[np.take_along_axis(contributions, top, axis=1) <= 0] = len(self.features)
+        codes = top @ (len(self.features) + 1) ** np.arange(count)
+        _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        names = [
+            tuple(self.features[j] for j in combo if j < len(self.features))
+            for combo in top[first].tolist()
+        ]
+        return [names[k] for k in inverse.ravel().tolist()]
+
+
+@functools.lru_cache(maxsize=1)
+def get_risk_model() -> RiskModel:
+    return RiskModel.load(os.environ.get("RISK_MODEL_PATH", DEFAULT_MODEL_PATH))
+
+
+def score_cases(cases: Sequence[CaseInfo], order: bool = False) -> list[dict[str, Any]]:
+    """Scores a queue of cases, optionally sorted highest risk first."""
+    if not cases:
+        return []
+    model = get_risk_model()
+    features = extract_features(cases)
+    scores = model.score(features)
+    rows = zip(
+        (case.case_number for case in cases),
+        np.round(scores, 4).tolist(),
+        model.tier(scores).tolist(),
+        model.top_factors(features),
+        strict=True,
+    )
+    results = [
+        {
+            "case_number": case_number,
+            "risk_score": score,
+            "risk_tier": tier,
+            "top_factors": factors,
+        }
+        for case_number, score, tier, factors in rows
+    ]
+    if order:
+        return [results[i] for i in np.argsort(-scores, kind="stable").tolist()]
+    return results
+
+
+def score_case(case: CaseInfo) -> dict[str, Any]:
+    """Scores a single case inline."""
+    return score_cases([case])[0]
+
+
+def score_queue(cases: Sequence[CaseInfo], order: bool = True) -> dict[str, Any]:
+    """Scores and orders a triage queue, reporting the elapsed time."""
+    started = time.perf_counter()
+    results = score_cases(cases, order=order)
+    return {
+        "scored": len(results),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "results": results,
+    }
@@ -0,0 +1,240 @@
+# Copyright 2025 VisaShield AI
+# Deadline-aware scheduler with priority lanes in front of the agent runner
+
+"""Admission of agent runs by lane, deadline and weighted fair share.
+
+Every adjudication competes for the same runner and model quota. Runs are
+admitted through a fixed number of slots:
+
+* Each lane (interactive, premium, batch) keeps its own earliest-deadline-first
+  heap.
+* Free slots go to the non-empty lane with the lowest stride "pass" value, so
+  lanes share capacity in proportion to their weights.
+* A lane left waiting longer than ``starvation_after`` seconds is served next
+  regardless of weight, so a bulk import cannot be starved indefinitely and
+  cannot starve anyone else either.
+* ``interactive_reserved`` slots are kept for the interactive lane. Premium and
+  batch runs together never hold more than the remaining slots, so an
+  interactive request does not wait for a long batch run to finish.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any
+
+
+class Lane(str, Enum):
+    INTERACTIVE = "interactive"
+    PREMIUM = "premium"
+    BATCH = "batch"
+
+
+LANE_WEIGHTS = {Lane.INTERACTIVE: 6, Lane.PREMIUM: 3, Lane.BATCH: 1}
+
+# Deadlines assumed when a request does not carry one. Premium processing has
+# a 15-day clock; interactive work is due immediately.
+DEFAULT_DEADLINES = {
+    Lane.INTERACTIVE: timedelta(0),
+    Lane.PREMIUM: timedelta(days=15),
+    Lane.BATCH: timedelta(days=30),
+}
+
+STRIDE = 1_000_000
+
+
+@dataclass(order=True)
+class _Ticket:
+    deadline: float
+    seq: int
+    enqueued_at: float = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+@dataclass
+class LaneStats:
+    admitted: int = 0
+    completed: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    service_time_total: float = 0.0
+    service_time_max: float = 0.0
+
+    def as_dict(self, queued: int, running: int) -> dict[str, Any]:
+        return {
+            "queued": queued,
+            "running": running,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "queue_wait_avg_ms": round(
+                1000 * self.queue_wait_total / self.admitted if self.admitted else 0, 3
+            ),
+            "queue_wait_max_ms": round(1000 * self.queue_wait_max, 3),
+            "service_time_avg_ms": round(
+                1000 * self.service_time_total / self.completed
+                if self.completed
+                else 0,
+                3,
+            ),
+            "service_time_max_ms": round(1000 * self.service_time_max, 3),
+        }
+
+
+class AdjudicationScheduler:
+    """Grants a bounded number of concurrent agent runs across lanes."""
+
+    def __init__(
+        self,
+        concurrency: int,
+        weights: dict[Lane, int] | None = None,
+        starvation_after: float = 30.0,
+        interactive_reserved: int = 1,
+    ) -> None:
+        self.concurrency = concurrency
+        # Other lanes must keep at least one slot.
+        self.interactive_reserved = max(0, min(interactive_reserved, concurrency - 1))
+        self.weights = weights or LANE_WEIGHTS
+        self.starvation_after = starvation_after
+        self._queues: dict[Lane, list[_Ticket]] = {lane: [] for lane in Lane}
+        self._pass: dict[Lane, int] = dict.fromkeys(Lane, 0)
+        self._waiting_since: dict[Lane, float] = {}
+        self._running: dict[Lane, int] = dict.fromkeys(Lane, 0)
+        self._stats: dict[Lane, LaneStats] = {lane: LaneStats() for lane in Lane}
+        self._seq = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def mean_service_time(self) -> float | None:
+        """Average seconds a run holds its slot, None before any completes."""
+        completed = sum(stats.completed for stats in self._stats.values())
+        if not completed:
+            return None
+        return sum(s.service_time_total for s in self._stats.values()) / completed
+
+    @asynccontextmanager
+    async def slot(
+        self, lane: Lane, deadline: datetime | None = None
+    ) -> AsyncIterator[None]:
+        """Waits for a run slot in ``lane``; holds it for the ``async with`` body."""
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.monotonic()
+        due = (deadline or datetime.now() + DEFAULT_DEADLINES[lane]).timestamp()
+        ticket = _Ticket(due, next(self._seq), enqueued_at, loop.create_future())
+        self._enqueue(lane, ticket)
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.cancelled():
+                self._discard(lane, ticket)
+            else:
+                self._release(lane, time.monotonic())
+            raise
+
+        started = time.monotonic()
+        stats = self._stats[lane]
+        wait = started - enqueued_at
+        stats.queue_wait_total += wait
+        stats.queue_wait_max = max(stats.queue_wait_max, wait)
+        try:
+            yield
+        finally:
+            self._release(lane, started)
+
+    def _enqueue(self, lane: Lane, ticket: _Ticket) -> None:
+        queue = self._queues[lane]
+        if not queue:
+            self._waiting_since[lane] = ticket.enqueued_at
+            # A lane returning from idle must not bank credit while it was away.
+            active = [self._pass[other] for other in Lane if self._queues[other]]
+            if active:
+                self._pass[lane] = max(self._pass[lane], min(active))
+        heapq.heappush(queue, ticket)
+
+    def _discard(self, lane: Lane, ticket: _Ticket) -> None:
+        queue = self._queues[lane]
+        if ticket in queue:
+            queue.remove(ticket)
+            heapq.heapify(queue)
+
+    def _pick_lane(self) -> Lane | None:
+        shared = self.concurrency - self.interactive_reserved
+        others_full = self.in_flight - self._running[Lane.INTERACTIVE] >= shared
+        ready = [
+            lane
+            for lane in Lane
+            if self._queues[lane] and (lane is Lane.INTERACTIVE or not others_full)
+        ]
+        if not ready:
+            return None
+        now = time.monotonic()
+        starving = [
+            lane
+            for lane in ready
+            if now - self._waiting_since[lane] > self.starvation_after
+        ]
+        if starving:
+            return min(starving, key=lambda lane: self._waiting_since[lane])
+        return min(ready, key=lambda lane: (self._pass[lane], -self.weights[lane]))
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.concurrency:
+            lane = self._pick_lane()
+            if lane is None:
+                return
+            queue = self._queues[lane]
+            ticket = heapq.heappop(queue)
+            self._waiting_since[lane] = time.monotonic()
+            if ticket.future.done():  # cancelled while queued
+                continue
+            self._pass[lane] += STRIDE // self.weights[lane]
+            self._running[lane] += 1
+            self._stats[lane].admitted += 1
+            ticket.future.set_result(None)
+
+    def _release(self, lane: Lane, started: float) -> None:
+        service = time.monotonic() - started
+        stats = self._stats[lane]
+        stats.completed += 1
+        stats.service_time_total += service
+        stats.service_time_max = max(stats.service_time_max, service)
+        self._running[lane] -= 1
+        self._dispatch()
+
+    def metrics(self) -> dict[str, Any]:
+        """Per-lane queue depth, queue-wait and service-time metrics."""
+        return {
+            "concurrency": self.concurrency,
+            "interactive_reserved": self.interactive_reserved,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "lanes": {
+                lane.value: self._stats[lane].as_dict(
+                    len(self._queues[lane]), self._running[lane]
+                )
+                for lane in Lane
+            },
+        }
+
+
+scheduler = AdjudicationScheduler(
+    concurrency=int(os.environ.get("ADJUDICATOR_MAX_CONCURRENT_RUNS", "8")),
+    starvation_after=float(os.environ.get("ADJUDICATOR_STARVATION_SECONDS", "30")),
+    interactive_reserved=int(
+        os.environ.get("ADJUDICATOR_INTERACTIVE_RESERVED_RUNS", "1")
+    ),
+)
@@ -0,0 +1,374 @@
+# Copyright 2025 VisaShield AI
+# Memory-mapped result cache shared by every worker process in a container
+
+"""Cross-process cache for adjudication results, tool memos and criteria.
+
+Per-process caches warm once per worker. This one is a single file, mapped
+``MAP_SHARED`` by every worker, so a result computed by one worker is a hit
+for all of them. By default the file lives on ``/dev/shm``, which is tmpfs.
+The file is laid out as:
+
+    header | slot table (buckets x WAYS slots) | data log (ring buffer)
+
+* **Slots** hold a 64-bit key hash, the record's position in the log, its
+  length and its expiry time. A key hashes to one bucket of ``WAYS`` slots,
+  like a set-associative CPU cache, so lookups probe at most ``WAYS`` slots
+  and never need tombstones.
+* **Records** (key bytes + value bytes) are appended to the data log at an
+  ever-growing write position, wrapping modulo the log size. A record is live
+  while fewer than ``data_size`` bytes were written after it. Eviction is
+  therefore FIFO by bytes and costs nothing; a full bucket evicts its oldest
+  slot.
+
+Values are opaque bytes, usually pre-encoded JSON. A hit copies only the
+value's bytes out of the mapping, so an HTTP handler can return them as the
+response body without decoding and re-encoding them. Writers hold an
+exclusive ``flock`` on the file and readers hold a shared one. A thread lock
+covers threads within one process, because ``flock`` does not.
+"""
+
+import fcntl
+import functools
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+MAGIC = b"VSSC"
+VERSION = 1
+WAYS = 8
+# magic, version, ways, buckets, data size, write position, writes, evictions
+HEADER = struct.Struct("<4sHHQQQQQ")
+# key hash (0 = empty), log position, record length, expires at (0 = never)
+SLOT = struct.Struct("<QQI4xd")
+RECORD = struct.Struct("<II")  # key length, value length
+
+# A single value may use at most this fraction of the log.
+MAX_VALUE_FRACTION = 4
+
+DEFAULT_SIZE_MB = 64
+DEFAULT_SLOTS = 65536
+DEFAULT_PATH = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "visashield_shared_cache.bin",
+)
+
+
+def key_hash(namespace: str, key: str) -> int:
+    """Nonzero 64-bit hash of a namespaced key."""
+    digest = hashlib.blake2b(f"{namespace}\0{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class SharedCache:
+    """Size-bounded key/value store in a file mapped by every worker."""
+
+    def __init__(
+        self,
+        path: str,
+        size_bytes: int = DEFAULT_SIZE_MB << 20,
+        slots: int = DEFAULT_SLOTS,
+    ) -> None:
+        self.path = path
+        self._size_bytes = size_bytes
+        self._buckets = max(1, slots // WAYS)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "rejected": 0}
+        self._open()
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self._fd).st_size
+            header = os.pread(self._fd, HEADER.size, 0)
+            if len(header) == HEADER.size and header[:4] == MAGIC:
+                _, version, ways, buckets, data_size, *_ = HEADER.unpack(header)
+            else:
+                version = ways = buckets = data_size = 0
+            if (
+                version != VERSION
+                or ways != WAYS
+                or size != self._file_size(buckets, data_size)
+            ):
+                # First worker in: lay out an empty cache with our geometry.
+                buckets = self._buckets
+                data_size = self._size_bytes
+                size = self._file_size(buckets, data_size)
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(
+                    self._fd,
+                    HEADER.pack(MAGIC, VERSION, WAYS, buckets, data_size, 0, 0, 0),
+                    0,
+                )
+            # Later workers adopt the geometry the file already has.
+            self._buckets = buckets
+            self.data_size = data_size
+            self._data_offset = HEADER.size + buckets * WAYS * SLOT.size
+            self._mmap = mmap.mmap(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _file_size(buckets: int, data_size: int) -> int:
+        return HEADER.size + buckets * WAYS * SLOT.size + data_size
+
+    def _ensure_process(self) -> None:
+        # flock locks belong to the open file, which a forked child shares.
+        if os.getpid() != self._pid:
+            self._lock = threading.Lock()
+            self._open()
+
+    def _header(self) -> tuple[int, int, int]:
+        *_, head, writes, evictions = HEADER.unpack_from(self._mmap, 0)
+        return head, writes, evictions
+
+    def _slot_offset(self, bucket: int, way: int) -> int:
+        return HEADER.size + (bucket * WAYS + way) * SLOT.size
+
+    def _live(self, head: int, position: int, expires_at: float, now: float) -> bool:
+        return head - position <= self.data_size and (
+            expires_at == 0 or expires_at > now
+        )
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        """Value bytes stored under ``key``, or None on a miss."""
+        self._ensure_process()
+        wanted = key_hash(namespace, key)
+        encoded = f"{namespace}\0{key}".encode()
+        bucket = wanted % self._buckets
+        now = time.time()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                head = self._header()[0]
+                for way in range(WAYS):
+                    slot_hash, position, _, expires_at = SLOT.unpack_from(
+                        self._mmap, self._slot_offset(bucket, way)
+                    )
+                    if slot_hash != wanted:
+                        continue
+                    if not self._live(head, position, expires_at, now):
+                        self.stats["expired"] += 1
+                        break
+                    start = self._data_offset + position % self.data_size
+                    key_length, value_length = RECORD.unpack_from(self._mmap, start)
+                    start += RECORD.size
+                    if self._mmap[start : start + key_length] != encoded:
+                        break  # hash collision
+                    start += key_length
+                    self.stats["hits"] += 1
+                    return self._mmap[start : start + value_length]
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self.stats["misses"] += 1
+        return None
+
+    def put(
+        self, namespace: str, key: str, value: bytes, ttl: float | None = None
+    ) -> bool:
+        """Stores ``value`` under ``key`` for ``ttl`` seconds (None: until evicted).
+
+        Returns:
+            bool: False if the value is too large to cache
+        """
+        self._ensure_process()
+        encoded = f"{namespace}\0{key}".encode()
+        length = RECORD.size + len(encoded) + len(value)
+        if length > self.data_size // MAX_VALUE_FRACTION:
+            self.stats["rejected"] += 1
+            return False
+        wanted = key_hash(namespace, key)
+        bucket = wanted % self._buckets
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else 0.0
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                head, writes, evictions = self._header()
+                offset = head % self.data_size
+                if offset + length > self.data_size:
+                    head += self.data_size - offset  # records never wrap
+                    offset = 0
+                position = head
+                head += length
+                start = self._data_offset + offset
+                RECORD.pack_into(self._mmap, start, len(encoded), len(value))
+                start += RECORD.size
+                self._mmap[start : start + len(encoded)] = encoded
+                start += len(encoded)
+                self._mmap[start : start + len(value)] = value
+
+                # Same key, else a free or dead slot, else the oldest one.
+                victim, victim_position, evicted = 0, head, False
+                for way in range(WAYS):
+                    slot_hash, slot_position, _, slot_expires = SLOT.unpack_from(
+                        self._mmap, self._slot_offset(bucket, way)
+                    )
+                    if slot_hash == wanted or slot_hash == 0:
+                        victim, evicted = way, False
+                        break
+                    if not self._live(head, slot_position, slot_expires, now):
+                        victim, victim_position, evicted = way, -1, False
+                    elif slot_position < victim_position:
+                        victim, victim_position, evicted = way, slot_position, True
+                SLOT.pack_into(
+                    self._mmap,
+                    self._slot_offset(bucket, victim),
+                    wanted,
+                    position,
+                    length,
+                    expires_at,
+                )
+                HEADER.pack_into(
+                    self._mmap,
+                    0,
+                    MAGIC,
+                    VERSION,
+                    WAYS,
+                    self._buckets,
+                    self.data_size,
+                    head,
+                    writes + 1,
+                    evictions + evicted,
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return True
+
+    def get_json(self, namespace: str, key: str) -> Any | None:
+        value = self.get(namespace, key)
+        return None if value is None else json.loads(value)
+
+    def put_json(
+        self, namespace: str, key: str, value: Any, ttl: float | None = None
+    ) -> bool:
+        return self.put(
+            namespace, key, json.dumps(value, separators=(",", ":")).encode(), ttl
+        )
+
+    def clear(self) -> None:
+        """Drops every entry, for all workers."""
+        self._ensure_process()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._mmap[HEADER.size : self._data_offset] = bytes(
+                    self._data_offset - HEADER.size
+                )
+                HEADER.pack_into(
+                    self._mmap,
+                    0,
+                    MAGIC,
+                    VERSION,
+                    WAYS,
+                    self._buckets,
+                    self.data_size,
+                    0,
+                    0,
+                    0,
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def metrics(self) -> dict[str, Any]:
+        """Shared write and eviction counts plus this worker's hit rate."""
+        self._ensure_process()
+        with self._lock:
+            head, writes, evictions = self._header()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "path": self.path,
+            "slots": self._buckets * WAYS,
+            "data_bytes": self.data_size,
+            "bytes_written": head,
+            "writes": writes,
+            "evictions": evictions,
+            "worker_pid": self._pid,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self._mmap.close()
+        os.close(self._fd)
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_cache() -> SharedCache | None:
+    """Container-wide cache, or None when SHARED_CACHE_SIZE_MB is 0."""
+    size_mb = int(os.environ.get("SHARED_CACHE_SIZE_MB", str(DEFAULT_SIZE_MB)))
+    if size_mb <= 0:
+        return None
+    return SharedCache(
+        os.environ.get("SHARED_CACHE_PATH", DEFAULT_PATH),
+        size_bytes=size_mb << 20,
+        slots=int(os.environ.get("SHARED_CACHE_SLOTS", str(DEFAULT_SLOTS))),
+    )
+
+
+# ========================================
+# TOOL MEMOIZATION
+# ========================================
+
+TOOL_NAMESPACE = "tool"
+
+
+class ToolMemo:
+    """before/after tool callbacks memoizing deterministic tools.
+
+    Only the listed tools are memoized: their results must depend on their
+    arguments and on deployment-time data only. Keys include ``COMMIT_SHA``
+    so a new build never reads an old build's results.
+    """
+
+    def __init__(self, tool_names: Iterable[str], ttl: float = 3600.0) -> None:
+        self.tool_names = frozenset(tool_names)
+        self.ttl = ttl
+        self._hits: set[str] = set()
+
+    def _key(self, tool: BaseTool, args: dict[str, Any]) -> str | None:
+        if tool.name not in self.tool_names:
+            return None
+        build = os.environ.get("COMMIT_SHA", "")
+        return f"{build}:{tool.name}:{json.dumps(args, sort_keys=True, default=str)}"
+
+    def before_tool(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> dict[str, Any] | None:
+        """before_tool_callback answering memoized tools from the shared cache."""
+        cache = get_shared_cache()
+        key = self._key(tool, args)
+        if cache is None or key is None:
+            return None
+        result = cache.get_json(TOOL_NAMESPACE, key)
+        if result is not None and tool_context.function_call_id:
+            self._hits.add(tool_context.function_call_id)
+        return result
+
+    def after_tool(
+        self,
+        tool: BaseTool,
+        args: dict[str, Any],
+        tool_context: ToolContext,
+        tool_response: dict[str, Any],
+    ) -> None:
+        """after_tool_callback storing fresh results; leaves them unchanged."""
+        if tool_context.function_call_id in self._hits:
+            self._hits.discard(tool_context.function_call_id)
+            return
+        cache = get_shared_cache()
+        key = self._key(tool, args)
+        if cache is not None and key is not None and isinstance(tool_response, dict):
+            cache.put_json(TOOL_NAMESPACE, key, tool_response, self.ttl)
@@ -0,0 +1,68 @@
+# Copyright 2025 VisaShield AI
+# Response schema for structured (JSON) adjudication output
+
+"""Schema-constrained final answers for the adjudicator.
+
+With ``output_format="json"`` the run uses ``structured_adjudicator_agent``,
+whose final turn is constrained to ``AdjudicationDecision`` (natively as a
+response schema where the model supports it alongside tools, otherwise through
+ADK's ``set_model_response`` tool). Clients receive the validated decision
+instead of prose to parse, and the constrained answer is much shorter than the
+free-text one, which cuts generation latency.
+
+``parse_decision`` validates the final text with the model's compiled
+pydantic-core validator.
+"""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+OUTPUT_FORMATS = ("text", "json")
+OutputFormat = Literal["text", "json"]
+
+# ADK's stand-in tool for output schemas when the model cannot combine a
+# response schema with function calling.
+SET_MODEL_RESPONSE_TOOL = "set_model_response"
+
+
+class CriterionFinding(BaseModel):
+    criterion: str = Field(description="Criterion evaluated, e.g. specialty occupation")
+    status: Literal["MET", "NOT MET", "REQUIRES REVIEW"]
+    confidence: int = Field(description="Confidence score, 0-100")
+    finding: str = Field(description="One sentence stating the basis for the status")
+    citations: list[str] = Field(description="Reference ids (R1...) relied on")
+
+
+class AdjudicationDecision(BaseModel):
+    recommendation: Literal["APPROVE", "RFE", "DENY"]
+    confidence: int = Field(description="Overall confidence score, 0-100")
+    summary: str = Field(description="At most two sentences")
+    findings: list[CriterionFinding]
+    risk_factors: list[str] = Field(description="Short phrases; empty if none")
+    citations: list[str] = Field(description="Full citations of authorities relied on")
+    requires_human_review: bool
+
+
+STRUCTURED_OUTPUT_INSTRUCTION = """
+
+Your final answer is a JSON object in the required response schema, not prose.
+Give one finding per criterion you evaluated, keep every finding to one
+sentence, and list risk factors as short phrases. Write findings' citations as
+reference ids; write the top-level citations in full."""
+
+
+def parse_decision(text: str) -> tuple[dict[str, Any] | None, str | None]:
+    """Validated decision from a final JSON answer, or the validation error.
+
+    Args:
+        text: Final response text of a structured run
+
+    Returns:
+        tuple: (decision dict, None) if valid, else (None, error message)
+    """
+    try:
+        decision = AdjudicationDecision.model_validate_json(text)
+    except ValidationError as e:
+        return None, f"{e.error_count()} validation error(s): {e.errors()[0]['msg']}"
+    return decision.model_dump(), None
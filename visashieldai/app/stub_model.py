@@ -0,0 +1,175 @@
+# Copyright 2025 VisaShield AI
+# Deterministic stand-in model for offline runs and load tests
+
+"""A local model that drives agents through their tools without any network.
+
+Set ``AGENT_MODEL=stub`` to give the adjudicator and Ask VIA agents a
+``StubLlm`` (any other value names a real model). On each turn the stub
+calls the next tool it has not called yet, with plausible arguments built
+from the tool's schema. Once every tool has run, it answers. A structured
+run answers through ``set_model_response`` and Ask VIA answers in its
+response schema, so every endpoint behaves as it does against Gemini.
+
+``STUB_MODEL_LATENCY_MS`` (default 200) simulates model latency per turn,
+so load tests see realistic time-to-first-event and concurrency. Usage
+metadata estimates tokens at four characters each.
+"""
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from app.structured_output import SET_MODEL_RESPONSE_TOOL
+
+STUB = "stub"
+CHARS_PER_TOKEN = 4
+
+# Argument values by parameter name; the rest are derived from the type.
+STUB_ARGUMENTS: dict[str, Any] = {
+    "case_number": "WAC-25-000001",
+    "visa_type": "H-1B",
+    "petitioner_name": "Acme Analytics Inc",
+    "beneficiary_name": "Jane Doe",
+    "job_title": "Data Scientist",
+    "job_duties": "Design statistical models and machine learning pipelines",
+    "degree_requirement": "Bachelor's degree in Computer Science or related field",
+    "degree_type": "Master's",
+    "degree_field": "Computer Science",
+    "degree_country": "India",
+    "program_years": 2,
+    "years_experience": 4,
+    "soc_code": "15-2051",
+    "lca_number": "I-200-25001-123456",
+    "wage_level": 2,
+    "prevailing_wage": 98000.0,
+    "offered_wage": 112000.0,
+    "work_location": "Austin, TX",
+    "recommendation": "APPROVE",
+    "citation": "8 CFR 214.2(h)(4)(iii)(A)",
+    "field_of_endeavor": "Machine learning research",
+    "evidence_criteria": ["awards", "judging", "scholarly_articles"],
+}
+
+
+def sample(schema: dict[str, Any], name: str = "") -> Any:
+    """A value matching a JSON schema or a dumped ``types.Schema``."""
+    if name in STUB_ARGUMENTS:
+        return STUB_ARGUMENTS[name]
+    if "$ref" in schema:
+        return sample(schema["$defs"][schema["$ref"].rsplit("/", 1)[-1]], name)
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if str(s.get("type")).lower() != "null"]
+        return sample({"$defs": schema.get("$defs", {}), **options[0]}, name)
+    if schema.get("enum"):
+        return schema["enum"][0]
+    kind = str(schema.get("type", "string")).lower()
+    if kind == "object":
+        defs = schema.get("$defs", {})
+        return {
+            key: sample({"$defs": defs, **value}, key)
+            for key, value in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        items = schema.get("items", {})
+        return [sample({"$defs": schema.get("$defs", {}), **items}, name)]
+    if kind == "integer":
+        return 90 if "confidence" in name else 1
+    if kind == "number":
+        return 0.9 if "confidence" in name else 1.0
+    if kind == "boolean":
+        return True
+    return f"Stub {name.replace('_', ' ')}".strip()
+
+
+def _declarations(llm_request: LlmRequest) -> list[types.FunctionDeclaration]:
+    return [
+        declaration
+        for tool in llm_request.config.tools or []
+        if isinstance(tool, types.Tool)
+        for declaration in tool.function_declarations or []
+    ]
+
+
+def _parameters(declaration: types.FunctionDeclaration) -> dict[str, Any]:
+    if declaration.parameters is not None:
+        return declaration.parameters.model_dump(exclude_none=True, mode="json")
+    return dict(declaration.parameters_json_schema or {})
+
+
+def _called(llm_request: LlmRequest) -> set[str]:
+    return {
+        part.function_call.name or ""
+        for content in llm_request.contents
+        for part in content.parts or []
+        if part.function_call
+    }
+
+
+def _estimate_tokens(value: Any) -> int:
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN + 1
+
+
+class StubLlm(BaseLlm):
+    """Calls each declared tool once, in order, then answers."""
+
+    latency: float = 0.2
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        declarations = _declarations(llm_request)
+        called = _called(llm_request)
+        pending = [
+            d
+            for d in declarations
+            if d.name not in called and d.name != SET_MODEL_RESPONSE_TOOL
+        ]
+        structured = next(
+            (d for d in declarations if d.name == SET_MODEL_RESPONSE_TOOL), None
+        )
+        if pending:
+            declaration = pending[0]
+            part = types.Part.from_function_call(
+                name=declaration.name or "",
+                args=sample(_parameters(declaration)),
+            )
+        elif structured is not None:
+            part = types.Part.from_function_call(
+                name=SET_MODEL_RESPONSE_TOOL, args=sample(_parameters(structured))
+            )
+        elif isinstance(llm_request.config.response_schema, type):
+            schema = llm_request.config.response_schema.model_json_schema()  # type: ignore[attr-defined]
+            part = types.Part(text=json.dumps(sample(schema)))
+        else:
+            part = types.Part(
+                text=f"Stub analysis after {len(called)} tool calls. "
+                "Recommendation: APPROVE, subject to officer review."
+            )
+        content = types.Content(role="model", parts=[part])
+        yield LlmResponse(
+            content=content,
+            model_version=STUB,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=_estimate_tokens(
+                    [c.model_dump(exclude_none=True) for c in llm_request.contents]
+                ),
+                candidates_token_count=_estimate_tokens(
+                    part.model_dump(exclude_none=True)
+                ),
+            ),
+        )
+
+
+def agent_model(default: str) -> str | BaseLlm:
+    """``AGENT_MODEL`` ("stub" for ``StubLlm``), else ``default``."""
+    model = os.environ.get("AGENT_MODEL", default)
+    if model != STUB:
+        return model
+    latency = float(os.environ.get("STUB_MODEL_LATENCY_MS", "200")) / 1000
+    return StubLlm(model=STUB, latency=latency)
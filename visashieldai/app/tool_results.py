@@ -0,0 +1,276 @@
+# Copyright 2025 VisaShield AI
+# Compact tool-result representation sent back to the model
+
+"""Compact tool results for the model, verbose ones for the client.
+
+Every function response stays in the conversation and is re-sent on each
+following model turn, so boilerplate in tool results is paid for again and
+again. ``compact_tool_result`` (an ``after_tool_callback``) rewrites a result
+before it reaches the model:
+
+* explanatory prose that is a string literal in the tool's own code is dropped,
+  except under ``IDENTIFYING_KEYS``, which tell list items apart;
+* values that merely echo the tool's arguments, and timestamps, are dropped;
+* legal citations become reference ids (``R1`` ...) resolved once in the
+  agent instruction via ``reference_legend``;
+* keys are shortened through ``KEY_ALIASES`` and empty values are omitted.
+
+``CompactInstruction`` adds ``COMPACT_RESULTS_NOTE`` and the legend to the
+agent instruction only for runs that compact, since they cost prompt tokens
+on every model turn too.
+
+The verbose result is kept by function call id. ``ToolResultLedger`` returns
+it to the endpoints for ``tool_result`` events and tallies estimated prompt
+tokens saved over the run, net of that instruction overhead.
+"""
+
+import functools
+import json
+import types
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from app.structured_output import SET_MODEL_RESPONSE_TOOL
+
+STATE_KEY = "compact_tool_results"
+CHARS_PER_TOKEN = 4  # rough estimate for JSON payloads
+MAX_PENDING = 4096
+
+REFERENCES = {
+    "R1": "INA § 101(a)(15)(H)(i)(b)",
+    "R2": "8 CFR § 214.2(h)",
+    "R3": "USCIS Policy Manual Vol. 2, Part H",
+    "R4": "USCIS Policy Manual Vol. 2, Part H, Chapter 2",
+    "R5": "Matter of Simeio Solutions, LLC, 26 I&N Dec. 542 (AAO 2015)",
+    "R6": "Matter of Defensor, 25 I&N Dec. 749 (AAO 2012)",
+    "R7": "Defensor v. Meissner, 201 F.3d 384 (5th Cir. 2000)",
+    "R8": "USCIS Policy Manual / AAO Decisions Database",
+    "R9": "INA § 101(a)(15)(O)(i)",
+    "R10": "8 CFR § 214.2(o)",
+    "R11": "8 CFR § 214.2(o)(3)(iii)",
+    "R12": "Kazarian v. USCIS, 596 F.3d 1115 (9th Cir. 2010)",
+    "R13": "INA § 203(b)(2)(B)(i)",
+    "R14": "8 CFR § 204.5(k)",
+    "R15": "Matter of Dhanasar, 26 I&N Dec. 884 (AAO 2016)",
+}
+REFERENCE_IDS = {text: ref for ref, text in REFERENCES.items()}
+
+KEY_ALIASES = {
+    "confidence_score": "conf",
+    "confidence": "conf",
+    "overall_status": "st",
+    "validation_status": "st",
+    "status": "st",
+    "overall_determination": "det",
+    "determination": "det",
+    "overall_qualification": "det",
+    "evaluation": "eval",
+    "analysis": "eval",
+    "wage_analysis": "wage",
+    "prevailing_wage": "pw",
+    "prevailing_wage_source": "pw_src",
+    "offered_wage": "ow",
+    "compliant": "ok",
+    "met": "ok",
+    "attestations": "att",
+    "requires_human_review": "review",
+    "completeness_score": "complete",
+    "us_equivalency": "us_eq",
+}
+
+# Keys whose literal values still carry information for the model.
+KEEP_LITERALS = frozenset({"prevailing_wage_source", "us_equivalency"})
+# Labels naming what an item is about; literal, but never boilerplate.
+IDENTIFYING_KEYS = frozenset({"field", "criterion", "name"})
+# Bookkeeping the model never needs.
+DROP_KEYS = frozenset({"timestamp", "generated_at"})
+
+
+def _code_literals(code: types.CodeType) -> set[str]:
+    literals: set[str] = set()
+    for const in code.co_consts:
+        if isinstance(const, str):
+            literals.add(const)
+        elif isinstance(const, types.CodeType):
+            literals |= _code_literals(const)
+    return literals
+
+
+def reference_legend(
+    tools: Iterable[Callable[..., Any]], citations: Iterable[str] = ()
+) -> str:
+    """Legend of the references the tools' code and ``citations`` can cite."""
+    texts = set(citations)
+    for tool in tools:
+        texts |= _code_literals(tool.__code__)
+    return "\n".join(
+        f"[{ref}] {text}" for ref, text in REFERENCES.items() if text in texts
+    )
+
+
+COMPACT_RESULTS_NOTE = """
+Tool results are compact: explanatory boilerplate and echoed arguments are
+omitted and keys are abbreviated (conf=confidence, st=status,
+det=determination, eval=evaluation, pw/ow=prevailing/offered wage,
+ok=compliant or met, att=attestations). Citations appear as reference ids;
+cite them in full in your answers:
+"""
+
+
+@dataclass(frozen=True)
+class CompactInstruction:
+    """Instruction provider adding the compaction note and legend when compacting.
+
+    ``suffix`` follows the legend; ``instruction + text`` appends to it.
+    """
+
+    base: str
+    legend: str
+    suffix: str = ""
+
+    @property
+    def overhead_tokens(self) -> int:
+        """Estimated prompt tokens the note and legend add to each model turn."""
+        return len(COMPACT_RESULTS_NOTE + self.legend) // CHARS_PER_TOKEN
+
+    def __call__(self, context: ReadonlyContext) -> str:
+        if context.state.get(STATE_KEY, True):
+            return self.base + COMPACT_RESULTS_NOTE + self.legend + self.suffix
+        return self.base + self.suffix
+
+    def __add__(self, suffix: str) -> "CompactInstruction":
+        return replace(self, suffix=self.suffix + suffix)
+
+
+@functools.lru_cache(maxsize=64)
+def _prose_literals(tool: BaseTool) -> frozenset[str]:
+    """Sentence-like string literals in the tool's code (not status codes)."""
+    func = getattr(tool, "func", None)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return frozenset()
+    return frozenset(
+        text
+        for text in _code_literals(code)
+        if " " in text and not text.isupper() and text not in REFERENCE_IDS
+    )
+
+
+def compact(value: Any, prose: frozenset[str], echoed: frozenset[str]) -> Any:
+    """Compact form of a tool result; None means the value is omitted."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in DROP_KEYS:
+                continue
+            if key in KEEP_LITERALS:
+                compacted = item
+            elif key in IDENTIFYING_KEYS:
+                compacted = compact(item, frozenset(), echoed)
+            else:
+                compacted = compact(item, prose, echoed)
+            if compacted is not None and compacted not in ("", [], {}):
+                result[KEY_ALIASES.get(key, key)] = compacted
+        return result
+    if isinstance(value, list):
+        items = [compact(item, prose, echoed) for item in value]
+        return [item for item in items if item is not None]
+    if isinstance(value, str):
+        if value in REFERENCE_IDS:
+            return REFERENCE_IDS[value]
+        if value in prose or value in echoed:
+            return None
+    return value
+
+
+def estimate_tokens(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str)) // CHARS_PER_TOKEN
+
+
+# Verbose results awaiting pickup by the endpoint, keyed by function call id.
+_verbose: OrderedDict[str, tuple[dict[str, Any], int]] = OrderedDict()
+
+
+def compact_tool_result(
+    tool: BaseTool,
+    args: dict[str, Any],
+    tool_context: ToolContext,
+    tool_response: dict[str, Any],
+) -> dict[str, Any] | None:
+    """after_tool_callback replacing the model-facing result with its compact form."""
+    if (
+        not tool_context.state.get(STATE_KEY, True)
+        or not isinstance(tool_response, dict)
+        # The structured final answer must keep its schema.
+        or tool.name == SET_MODEL_RESPONSE_TOOL
+    ):
+        return None
+    echoed = frozenset(v for v in args.values() if isinstance(v, str) and v)
+    compacted = compact(tool_response, _prose_literals(tool), echoed)
+    saved = estimate_tokens(tool_response) - estimate_tokens(compacted)
+    if tool_context.function_call_id:
+        _verbose[tool_context.function_call_id] = (tool_response, saved)
+        while len(_verbose) > MAX_PENDING:
+            _verbose.popitem(last=False)
+    return compacted
+
+
+class ToolResultLedger:
+    """Per-run view of tool results and the prompt tokens compaction saved.
+
+    ``instruction_tokens`` is what compaction adds to the instruction of each
+    model turn (``CompactInstruction.overhead_tokens``); it is subtracted from
+    the savings.
+    """
+
+    def __init__(self, instruction_tokens: int = 0) -> None:
+        self.instruction_tokens = instruction_tokens
+        self.tool_results = 0
+        self.result_tokens_saved = 0
+        self.prompt_tokens_saved = 0
+        self.model_turns = 0
+        # ADK echoes a set_model_response answer as a synthetic final event.
+        self._synthetic_final = False
+
+    def observe(self, event: Event) -> list[tuple[str, dict[str, Any]]]:
+        """Verbose (tool name, result) pairs carried by ``event``."""
+        responses = event.get_function_responses()
+        if not responses:
+            if self._synthetic_final:
+                self._synthetic_final = False
+            elif event.author != "user" and event.content is not None:
+                # Each model turn re-sends every compacted result so far,
+                # and the instruction explaining them.
+                self.model_turns += 1
+                self.prompt_tokens_saved += (
+                    self.result_tokens_saved - self.instruction_tokens
+                )
+            return []
+
+        results = []
+        for response in responses:
+            if response.name == SET_MODEL_RESPONSE_TOOL:
+                self._synthetic_final = True
+                continue  # the final answer, not a tool result
+            verbose, saved = _verbose.pop(response.id or "", (None, 0))
+            if verbose is None:
+                verbose = response.response or {}
+            self.tool_results += 1
+            self.result_tokens_saved += saved
+            results.append((response.name or "unknown", verbose))
+        return results
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "tool_results": self.tool_results,
+            "model_turns": self.model_turns,
+            "result_tokens_saved": self.result_tokens_saved,
+            "prompt_tokens_saved": self.prompt_tokens_saved,
+        }
@@ -0,0 +1,300 @@
+# Copyright 2025 VisaShield AI
+# OpenTelemetry spans for adjudications, model turns, tools and stream sends
+
+"""Explicit tracing of one adjudication, to separate model time from ours.
+
+* ``adjudication_span`` is the root span of one request: ``POST /analyze``,
+  ``POST /analyze/stream`` or one message on the WebSocket. When it ends it
+  carries the run's model and tool time and the remainder,
+  ``adjudication.overhead_ms``: pre-screen, risk scoring, scheduling, ADK
+  and serialization.
+* ``start_model_span`` / ``end_model_span`` (model callbacks) add a
+  ``model_turn`` span per model call, with token counts and response sizes.
+* ``start_tool_span`` / ``end_tool_span`` (tool callbacks) add a
+  ``tool <name>`` span per tool execution, with the arguments and the sizes
+  of arguments and result. It covers the tool only, not memoization or
+  compaction.
+* ``stream_event`` adds a ``sse.send`` or ``websocket.send`` event to the
+  root span for every event sent, with its type and size.
+
+The same hooks record request, first-event, stage, tool and model-turn
+durations in ``app.latency.latency_metrics`` for every adjudication, whether
+it is sampled or not.
+
+ADK's own spans (``invocation``, ``call_llm``, ``execute_tool``) are in the
+same trace, so these nest under them. ADK runs its generators in the
+request's context, so the current span changes under the endpoint. The root
+span is therefore kept in a context variable of its own.
+
+Sampling and export are set up by ``app.app_utils.telemetry``:
+``TRACE_SAMPLE_RATIO`` samples whole adjudications, and ``TRACE_EXPORT_PATH``
+writes every finished span as a JSON line for offline analysis. Attributes
+are computed only for spans that are sampled.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from opentelemetry import trace
+
+from app.adjudicator_models import AdjudicationRequest
+from app.criteria import EVALUATION_CRITERIA, normalize_visa_type
+from app.latency import latency_metrics
+from app.usage import TOOL_STAGES
+
+tracer = trace.get_tracer("visashieldai.adjudicator")
+
+MAX_PENDING = 4096
+# Stage of an adjudication before its first tool runs.
+FIRST_STAGE = "form_validation"
+OTHER_VISA_TYPE = "other"
+# Longer attribute values are truncated; tool results are sized, not recorded.
+MAX_ARGUMENTS_CHARS = 2048
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+
+# ========================================
+# ADJUDICATION ROOT SPAN
+# ========================================
+
+
+@dataclass
+class _Adjudication:
+    span: trace.Span
+    started: float
+    endpoint: str
+    visa_type: str
+    stage: str = FIRST_STAGE
+    stage_started: float = 0.0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    first_event_sent: bool = False
+
+    def enter_stage(self, stage: str, now: float) -> None:
+        """Adds the time since the last change to the stage being left."""
+        self.stage_seconds[self.stage] = (
+            self.stage_seconds.get(self.stage, 0.0) + now - self.stage_started
+        )
+        self.stage, self.stage_started = stage, now
+
+    model_ms: float = 0.0
+    model_turns: int = 0
+    tool_ms: float = 0.0
+    tool_calls: int = 0
+    events_sent: int = 0
+    bytes_sent: int = 0
+
+
+_current: ContextVar[_Adjudication | None] = ContextVar("adjudication", default=None)
+
+
+@contextmanager
+def adjudication_span(route: str, request: AdjudicationRequest) -> Iterator[trace.Span]:
+    """Root span of one adjudication; model and tool time are added on exit.
+
+    The request's duration and its last stage are recorded in
+    ``latency_metrics`` when it ends.
+    """
+    case = request.case_info
+    visa_type = normalize_visa_type(case.visa_type)
+    if visa_type not in EVALUATION_CRITERIA:
+        visa_type = OTHER_VISA_TYPE
+    with tracer.start_as_current_span(
+        "adjudicate",
+        attributes={
+            "adjudication.route": route,
+            "adjudication.case_number": case.case_number,
+            "adjudication.visa_type": case.visa_type,
+            "adjudication.output_format": request.output_format,
+            "adjudication.priority": request.priority.value,
+        },
+    ) as span:
+        started = time.perf_counter()
+        current = _Adjudication(span, started, route, visa_type, stage_started=started)
+        token = _current.set(current)
+        try:
+            yield span
+        finally:
+            _current.reset(token)
+            ended = time.perf_counter()
+            current.enter_stage(current.stage, ended)
+            for stage, seconds in current.stage_seconds.items():
+                latency_metrics.record("stage", route, visa_type, stage, seconds)
+            latency_metrics.record("request", route, visa_type, "", ended - started)
+            if span.is_recording():
+                total_ms = 1000 * (ended - started)
+                span.set_attributes(
+                    {
+                        "adjudication.model_turns": current.model_turns,
+                        "adjudication.model_ms": round(current.model_ms, 3),
+                        "adjudication.tool_calls": current.tool_calls,
+                        "adjudication.tool_ms": round(current.tool_ms, 3),
+                        "adjudication.overhead_ms": round(
+                            total_ms - current.model_ms - current.tool_ms, 3
+                        ),
+                        "adjudication.events_sent": current.events_sent,
+                        "adjudication.bytes_sent": current.bytes_sent,
+                    }
+                )
+
+
+def stream_event(transport: str, event_type: str, frame: str | bytes) -> None:
+    """Records one SSE or WebSocket send on the adjudication's root span.
+
+    The first send of an adjudication is its time to first event.
+    """
+    current = _current.get()
+    if current is None:
+        return
+    if not current.first_event_sent:
+        current.first_event_sent = True
+        latency_metrics.record(
+            "first_event",
+            current.endpoint,
+            current.visa_type,
+            "",
+            time.perf_counter() - current.started,
+        )
+    if not current.span.is_recording():
+        return
+    size = len(frame if isinstance(frame, bytes) else frame.encode())
+    current.events_sent += 1
+    current.bytes_sent += size
+    current.span.add_event(
+        f"{transport}.send", {"event_type": event_type, "bytes": size}
+    )
+
+
+# ========================================
+# MODEL AND TOOL CALLBACKS
+# ========================================
+
+# Spans in flight, keyed by (invocation id, agent) or by function call id.
+_model_spans: OrderedDict[tuple[str, str], tuple[trace.Span, float]] = OrderedDict()
+_tool_spans: OrderedDict[str, tuple[trace.Span, float]] = OrderedDict()
+
+
+def _track(
+    pending: OrderedDict[Any, tuple[trace.Span, float]], key: Any, span: trace.Span
+) -> None:
+    pending[key] = (span, time.perf_counter())
+    while len(pending) > MAX_PENDING:
+        pending.popitem(last=False)[1][0].end()
+
+
+def start_model_span(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """before_model_callback opening the model turn's span."""
+    span = tracer.start_span(
+        "model_turn",
+        attributes={
+            "gen_ai.agent.name": callback_context.agent_name,
+            "gen_ai.request.model": llm_request.model or "",
+            "model_turn.contents": len(llm_request.contents),
+        },
+    )
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    _track(_model_spans, key, span)
+
+
+def end_model_span(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> None:
+    """after_model_callback closing the span with tokens and response sizes."""
+    if llm_response.partial:
+        return
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    pending = _model_spans.pop(key, None)
+    if pending is None:
+        return
+    span, started = pending
+    elapsed = time.perf_counter() - started
+    current = _current.get()
+    if current is not None:
+        current.model_turns += 1
+        current.model_ms += 1000 * elapsed
+        latency_metrics.record(
+            "model_turn", current.endpoint, current.visa_type, "", elapsed
+        )
+    if span.is_recording():
+        usage = (
+            llm_response.usage_metadata or types.GenerateContentResponseUsageMetadata()
+        )
+        parts = llm_response.content.parts if llm_response.content else None
+        calls = [p.function_call.name or "" for p in parts or [] if p.function_call]
+        span.set_attributes(
+            {
+                "gen_ai.usage.input_tokens": usage.prompt_token_count or 0,
+                "gen_ai.usage.output_tokens": usage.candidates_token_count or 0,
+                "model_turn.cached_tokens": usage.cached_content_token_count or 0,
+                "model_turn.text_bytes": sum(
+                    len(p.text.encode()) for p in parts or [] if p.text
+                ),
+                "model_turn.function_calls": calls,
+            }
+        )
+        if llm_response.error_code:
+            span.set_status(trace.StatusCode.ERROR, llm_response.error_message)
+    span.end()
+
+
+def start_tool_span(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+) -> None:
+    """before_tool_callback opening the tool's span with its arguments.
+
+    A tool of another stage than the current one moves the adjudication
+    into the tool's stage.
+    """
+    current = _current.get()
+    stage = TOOL_STAGES.get(tool.name)
+    if current is not None and stage is not None and stage != current.stage:
+        current.enter_stage(stage, time.perf_counter())
+    span = tracer.start_span(f"tool {tool.name}", attributes={"tool.name": tool.name})
+    if span.is_recording():
+        arguments = json.dumps(args, separators=(",", ":"), default=str)
+        span.set_attributes(
+            {
+                "tool.arguments": arguments[:MAX_ARGUMENTS_CHARS],
+                "tool.arguments_bytes": len(arguments.encode()),
+            }
+        )
+    _track(_tool_spans, tool_context.function_call_id or "", span)
+
+
+def end_tool_span(
+    tool: BaseTool,
+    args: dict[str, Any],
+    tool_context: ToolContext,
+    tool_response: dict[str, Any],
+) -> None:
+    """after_tool_callback closing the span with the size of the raw result."""
+    pending = _tool_spans.pop(tool_context.function_call_id or "", None)
+    if pending is None:
+        return
+    span, started = pending
+    elapsed = time.perf_counter() - started
+    current = _current.get()
+    if current is not None:
+        current.tool_calls += 1
+        current.tool_ms += 1000 * elapsed
+        latency_metrics.record(
+            "tool", current.endpoint, current.visa_type, tool.name, elapsed
+        )
+    if span.is_recording():
+        span.set_attribute("tool.result_bytes", _json_size(tool_response))
+    span.end()
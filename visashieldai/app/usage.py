@@ -0,0 +1,254 @@
+# Copyright 2025 VisaShield AI
+# Token, latency and cost accounting for agent runs
+
+"""Per-run and process-wide model usage, broken down by stage and tool.
+
+Every model response carries ``usage_metadata`` (prompt, cached and output
+tokens). ``start_model_timer`` / ``record_model_latency`` are the agent's
+``before_model_callback`` / ``after_model_callback``; they stamp each response
+with its model latency in ``custom_metadata``, which ADK copies onto the
+event.
+
+``UsageLedger.observe`` attributes a model turn to the tools it called, or to
+``RESPONSE_TOOL`` for the final answer, and each tool to a processing stage.
+A turn calling several tools splits its tokens and latency evenly between
+them, so the breakdowns add up to the run total. ``run_agent`` merges every
+finished run into ``usage_metrics`` for the metrics endpoint.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.events import Event
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from app.structured_output import SET_MODEL_RESPONSE_TOOL
+
+MODEL_LATENCY_KEY = "model_latency_ms"
+RESPONSE_TOOL = "final_response"
+UNKNOWN_STAGE = "other"
+MAX_PENDING = 4096
+
+# Stage ids match ProcessingStage in the frontend adjudicator service.
+TOOL_STAGES = {
+    "analyze_petition_form": "form_validation",
+    "evaluate_specialty_occupation": "evidence_review",
+    "check_beneficiary_qualifications": "evidence_review",
+    "verify_employer_employee_relationship": "evidence_review",
+    "evaluate_extraordinary_ability": "evidence_review",
+    "evaluate_national_interest": "evidence_review",
+    "check_lca_compliance": "policy_matching",
+    "check_citation_validity": "policy_matching",
+    "generate_adjudication_draft": "draft_generation",
+    RESPONSE_TOOL: "draft_generation",
+}
+
+# USD per million tokens: (uncached prompt, cached prompt, output).
+MODEL_PRICES = {
+    "gemini-2.0-flash-lite": (0.075, 0.01875, 0.30),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+    "gemini-2.5-pro": (1.25, 0.31, 10.00),
+}
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+def model_price(model: str | None) -> tuple[float, float, float]:
+    """Price row for ``model``, matching versioned names by longest prefix."""
+    if model:
+        for name in sorted(MODEL_PRICES, key=len, reverse=True):
+            if model.startswith(name):
+                return MODEL_PRICES[name]
+    return MODEL_PRICES[DEFAULT_MODEL]
+
+
+# ========================================
+# MODEL CALLBACKS
+# ========================================
+
+# Start time of the model call in flight, keyed by (invocation id, agent).
+_started: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+
+def start_model_timer(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """before_model_callback recording when the model call starts."""
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    _started[key] = time.perf_counter()
+    while len(_started) > MAX_PENDING:
+        _started.popitem(last=False)
+
+
+def record_model_latency(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> None:
+    """after_model_callback stamping the response with the model latency."""
+    if llm_response.partial:
+        return
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    started = _started.pop(key, None)
+    if started is not None:
+        llm_response.custom_metadata = {
+            **(llm_response.custom_metadata or {}),
+            MODEL_LATENCY_KEY: round(1000 * (time.perf_counter() - started), 3),
+        }
+
+
+# ========================================
+# ACCOUNTING
+# ========================================
+
+
+@dataclass
+class UsageTotals:
+    model_turns: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    cost_usd: float = 0.0
+
+    @classmethod
+    def from_event(cls, event: Event) -> "UsageTotals":
+        usage = event.usage_metadata or types.GenerateContentResponseUsageMetadata()
+        prompt = usage.prompt_token_count or 0
+        cached = usage.cached_content_token_count or 0
+        # Thinking tokens are billed as output.
+        output = (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+        latency = float((event.custom_metadata or {}).get(MODEL_LATENCY_KEY, 0.0))
+        uncached_price, cached_price, output_price = model_price(event.model_version)
+        return cls(
+            model_turns=1,
+            prompt_tokens=prompt,
+            cached_tokens=cached,
+            output_tokens=output,
+            latency_ms_total=latency,
+            latency_ms_max=latency,
+            cost_usd=(
+                (prompt - cached) * uncached_price
+                + cached * cached_price
+                + output * output_price
+            )
+            / 1_000_000,
+        )
+
+    def add(self, other: "UsageTotals") -> None:
+        self.model_turns += other.model_turns
+        self.prompt_tokens += other.prompt_tokens
+        self.cached_tokens += other.cached_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_ms_total += other.latency_ms_total
+        self.latency_ms_max = max(self.latency_ms_max, other.latency_ms_max)
+        self.cost_usd += other.cost_usd
+
+    def split(self, parts: int) -> list["UsageTotals"]:
+        """``parts`` shares of this turn; the first takes the token remainders.
+
+        Each share still counts as a model turn of its tool.
+        """
+        shares = []
+        for i in range(parts):
+            first = i == 0
+            shares.append(
+                UsageTotals(
+                    model_turns=self.model_turns,
+                    prompt_tokens=self.prompt_tokens // parts
+                    + (self.prompt_tokens % parts if first else 0),
+                    cached_tokens=self.cached_tokens // parts
+                    + (self.cached_tokens % parts if first else 0),
+                    output_tokens=self.output_tokens // parts
+                    + (self.output_tokens % parts if first else 0),
+                    latency_ms_total=self.latency_ms_total / parts,
+                    latency_ms_max=self.latency_ms_max,
+                    cost_usd=self.cost_usd / parts,
+                )
+            )
+        return shares
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "model_turns": self.model_turns,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.prompt_tokens + self.output_tokens,
+            "model_latency_ms": round(self.latency_ms_total, 3),
+            "model_latency_max_ms": round(self.latency_ms_max, 3),
+            "estimated_cost_usd": round(self.cost_usd, 6),
+        }
+
+
+class UsageLedger:
+    """Model usage of one run (or, merged, of many) by stage and tool."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.total = UsageTotals()
+        self.by_stage: dict[str, UsageTotals] = {}
+        self.by_tool: dict[str, UsageTotals] = {}
+
+    def _attribute(self, tool: str, share: UsageTotals) -> None:
+        self.by_tool.setdefault(tool, UsageTotals()).add(share)
+        stage = TOOL_STAGES.get(tool, UNKNOWN_STAGE)
+        self.by_stage.setdefault(stage, UsageTotals()).add(share)
+
+    def observe(self, event: Event) -> None:
+        """Accounts for ``event`` if it is a completed model response."""
+        if event.usage_metadata is None or event.partial:
+            return
+        turn = UsageTotals.from_event(event)
+        self.total.add(turn)
+        tools = [
+            RESPONSE_TOOL
+            if fc.name == SET_MODEL_RESPONSE_TOOL
+            else fc.name or "unknown"
+            for fc in event.get_function_calls()
+        ]
+        tools = tools or [RESPONSE_TOOL]
+        for tool, share in zip(tools, turn.split(len(tools)), strict=True):
+            self._attribute(tool, share)
+
+    def merge(self, other: "UsageLedger") -> None:
+        self.runs += max(other.runs, 1)
+        self.total.add(other.total)
+        for tool, totals in other.by_tool.items():
+            self.by_tool.setdefault(tool, UsageTotals()).add(totals)
+        for stage, totals in other.by_stage.items():
+            self.by_stage.setdefault(stage, UsageTotals()).add(totals)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **self.total.as_dict(),
+            "by_stage": {k: v.as_dict() for k, v in sorted(self.by_stage.items())},
+            "by_tool": {k: v.as_dict() for k, v in sorted(self.by_tool.items())},
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """Totals with per-run averages, without the breakdowns."""
+        runs = self.runs or 1
+        return {
+            "runs": self.runs,
+            "avg_tokens_per_run": round(
+                (self.total.prompt_tokens + self.total.output_tokens) / runs, 1
+            ),
+            "avg_output_tokens_per_run": round(self.total.output_tokens / runs, 1),
+            "avg_model_latency_ms_per_run": round(
+                self.total.latency_ms_total / runs, 3
+            ),
+            "avg_cost_usd_per_run": round(self.total.cost_usd / runs, 6),
+            **self.total.as_dict(),
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        """Aggregate view with per-run averages, for the metrics endpoint."""
+        return {**self.summary(), **self.as_dict()}
+
+
+# Every finished run, since process start.
+usage_metrics = UsageLedger()
@@ -0,0 +1,173 @@
+# Copyright 2025 VisaShield AI
+# Registry of visa-type-specific adjudicator agents
+
+"""One agent per visa classification, built on first use.
+
+Each registry entry pairs a classification with its own workflow instruction
+and the smallest tool set that workflow needs, so an O-1 or EB-2 NIW run is
+not sent the H-1B instruction, H-1B tool schemas or their citations. The
+reference legend in each instruction only covers the authorities that the
+entry's tools and draft decisions can cite, and is only sent to runs that
+compact tool results.
+
+``get_visa_agent`` builds an agent (and its structured-output variant) the
+first time its classification is requested and caches it. The H-1B entry is
+the original ``adjudicator_agent``. Unknown classifications fall back to it,
+as they did before the registry existed.
+"""
+
+import functools
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from google.adk.agents import Agent, LlmAgent
+
+from app.adjudicator_agent import (
+    ADJUDICATOR_GUIDANCE,
+    ADJUDICATOR_INSTRUCTION,
+    ADJUDICATOR_ROLE,
+    H1B_TOOLS,
+    LEGAL_BASIS,
+    adjudicator_agent,
+    analyze_petition_form,
+    check_beneficiary_qualifications,
+    check_citation_validity,
+    evaluate_extraordinary_ability,
+    evaluate_national_interest,
+    generate_adjudication_draft,
+    structured_adjudicator_agent,
+)
+from app.criteria import normalize_visa_type
+from app.structured_output import (
+    STRUCTURED_OUTPUT_INSTRUCTION,
+    AdjudicationDecision,
+    OutputFormat,
+)
+from app.tool_results import CompactInstruction, reference_legend
+
+DEFAULT_VISA_TYPE = "H-1B"
+
+
+def numbered_steps(steps: tuple[str, ...]) -> str:
+    return "\n".join(f"{i}. {step}" for i, step in enumerate(steps, start=1))
+
+
+@dataclass(frozen=True)
+class VisaAgentSpec:
+    """Workflow and tool set of one classification's agent."""
+
+    name: str
+    description: str
+    steps: tuple[str, ...]
+    tools: tuple[Callable[..., Any], ...]
+
+    def instruction(self, visa_type: str) -> CompactInstruction:
+        if visa_type == DEFAULT_VISA_TYPE:
+            return ADJUDICATOR_INSTRUCTION
+        legal_basis, precedents = LEGAL_BASIS[visa_type]
+        return CompactInstruction(
+            ADJUDICATOR_ROLE
+            + f"\nWhen analyzing a {visa_type} case, follow this structured approach:\n"
+            + numbered_steps(self.steps)
+            + "\n"
+            + ADJUDICATOR_GUIDANCE,
+            reference_legend(self.tools, [*legal_basis, *precedents]),
+        )
+
+
+VISA_AGENT_SPECS = {
+    "H-1B": VisaAgentSpec(
+        name="adjudicator_agent",
+        description="H-1B specialty occupation petition adjudication assistant",
+        steps=(
+            "Analyze the petition form",
+            "Evaluate specialty occupation criteria",
+            "Check beneficiary qualifications",
+            "Verify employer-employee relationship",
+            "Check LCA compliance",
+            "Generate a draft adjudication decision",
+        ),
+        tools=H1B_TOOLS,
+    ),
+    "O-1": VisaAgentSpec(
+        name="o1_adjudicator_agent",
+        description="O-1 extraordinary ability petition adjudication assistant",
+        steps=(
+            "Analyze the I-129 petition form for completeness",
+            "Evaluate the extraordinary ability evidence against the O-1A criteria (at least three must be met), then weigh the totality of the evidence",
+            "Confirm the beneficiary is coming to continue work in the area of extraordinary ability",
+            "Generate a draft adjudication decision",
+        ),
+        tools=(
+            analyze_petition_form,
+            evaluate_extraordinary_ability,
+            generate_adjudication_draft,
+            check_citation_validity,
+        ),
+    ),
+    "EB-2 NIW": VisaAgentSpec(
+        name="eb2_niw_adjudicator_agent",
+        description="EB-2 national interest waiver petition adjudication assistant",
+        steps=(
+            "Analyze the I-140 petition form for completeness",
+            "Verify the beneficiary holds an advanced degree or its equivalent (pass the degree's country and program length when known)",
+            "Evaluate the national interest waiver under the three Dhanasar prongs",
+            "Generate a draft adjudication decision",
+        ),
+        tools=(
+            analyze_petition_form,
+            check_beneficiary_qualifications,
+            evaluate_national_interest,
+            generate_adjudication_draft,
+            check_citation_validity,
+        ),
+    ),
+}
+
+
+def resolve_visa_type(visa_type: str) -> str:
+    """Registry key for ``visa_type``, or the default for unknown types."""
+    key = normalize_visa_type(visa_type)
+    return key if key in VISA_AGENT_SPECS else DEFAULT_VISA_TYPE
+
+
+@functools.cache
+def get_visa_agent(visa_type: str, output_format: OutputFormat = "text") -> LlmAgent:
+    """Agent for a registry visa type, built on first use.
+
+    Args:
+        visa_type: Registry key, as returned by ``resolve_visa_type``
+        output_format: "json" for the structured-output variant
+
+    Returns:
+        LlmAgent: The classification's agent
+    """
+    if visa_type == DEFAULT_VISA_TYPE:
+        return (
+            structured_adjudicator_agent
+            if output_format == "json"
+            else adjudicator_agent
+        )
+    spec = VISA_AGENT_SPECS[visa_type]
+    instruction = spec.instruction(visa_type)
+    agent = Agent(
+        name=spec.name,
+        model=adjudicator_agent.model,
+        description=spec.description,
+        instruction=instruction,
+        before_model_callback=adjudicator_agent.before_model_callback,
+        after_model_callback=adjudicator_agent.after_model_callback,
+        before_tool_callback=adjudicator_agent.before_tool_callback,
+        after_tool_callback=adjudicator_agent.after_tool_callback,
+        tools=list(spec.tools),
+    )
+    if output_format == "json":
+        agent = agent.clone(
+            update={
+                "name": f"structured_{spec.name}",
+                "instruction": instruction + STRUCTURED_OUTPUT_INSTRUCTION,
+                "output_schema": AdjudicationDecision,
+            }
+        )
+    return agent
@@ -0,0 +1,134 @@
+# Copyright 2025 VisaShield AI
+# Wire protocols of the adjudicator WebSocket: JSON text and MessagePack
+
+"""Event encodings for ``/api/adjudicator/ws``, chosen at the handshake.
+
+JSON text frames stay the default. A client that lists the
+``visashield.msgpack.v1`` subprotocol in ``Sec-WebSocket-Protocol`` gets
+binary MessagePack frames instead:
+
+1. The first frame is a preamble map::
+
+       {"protocol": "visashield.msgpack.v1",
+        "keys": ["event_type", "stage", ...],
+        "event_types": ["stage", "reasoning", ...],
+        "timestamp": "epoch_ms"}
+
+2. Every later frame is one event, a map keyed by the index of each key in
+   ``keys``. The ``event_type`` value is an index into ``event_types``, and
+   ``timestamp`` is milliseconds since the epoch. Keys and event types not in
+   the preamble are sent as strings. Nested values such as ``tool_result`` are
+   sent as they are.
+
+Either protocol may send requests as JSON text or as a MessagePack map in
+a binary frame. MessagePack needs the ``msgpack`` package; without it the
+subprotocol is not offered and clients fall back to JSON.
+"""
+
+import json
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Protocol
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+MSGPACK_SUBPROTOCOL = "visashield.msgpack.v1"
+
+# Order is part of the protocol: append only.
+EVENT_KEYS = (
+    "event_type",
+    "stage",
+    "content",
+    "tool_name",
+    "tool_result",
+    "confidence",
+    "tool_result_compaction",
+    "usage",
+    "decision",
+    "decision_error",
+    "timestamp",
+)
+EVENT_TYPES = ("stage", "reasoning", "tool_call", "tool_result", "complete", "error")
+
+_KEY_CODES = {key: code for code, key in enumerate(EVENT_KEYS)}
+_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+_EVENT_TYPE = _KEY_CODES["event_type"]
+_TIMESTAMP = _KEY_CODES["timestamp"]
+
+
+class EventCodec(Protocol):
+    subprotocol: str | None
+
+    def preamble(self) -> bytes | None: ...
+
+    def encode(self, payload: dict[str, Any]) -> str | bytes: ...
+
+
+class JsonCodec:
+    """JSON text frames with ISO timestamps, as sent by ``send_json``."""
+
+    subprotocol: str | None = None
+
+    def preamble(self) -> bytes | None:
+        return None
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        payload["timestamp"] = datetime.now().isoformat()
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+class MsgpackCodec:
+    """Binary frames with coded keys and event types and epoch timestamps."""
+
+    subprotocol: str | None = MSGPACK_SUBPROTOCOL
+
+    def preamble(self) -> bytes:
+        return msgpack.packb(
+            {
+                "protocol": MSGPACK_SUBPROTOCOL,
+                "keys": list(EVENT_KEYS),
+                "event_types": list(EVENT_TYPES),
+                "timestamp": "epoch_ms",
+            }
+        )
+
+    def encode(self, payload: dict[str, Any]) -> bytes:
+        event: dict[int | str, Any] = {
+            _KEY_CODES.get(key, key): value for key, value in payload.items()
+        }
+        event_type = payload["event_type"]
+        event[_EVENT_TYPE] = _TYPE_CODES.get(event_type, event_type)
+        event[_TIMESTAMP] = time.time_ns() // 1_000_000
+        return msgpack.packb(event, default=str)
+
+
+def negotiate_codec(offered: list[str]) -> EventCodec:
+    """MessagePack if the client offered it and msgpack is installed."""
+    if MSGPACK_SUBPROTOCOL in offered and msgpack is not None:
+        return MsgpackCodec()
+    return JsonCodec()
+
+
+def decode_request(message: Mapping[str, Any]) -> dict[str, Any]:
+    """A request from a received ASGI message: binary MessagePack or JSON text."""
+    if message.get("bytes") is not None:
+        if msgpack is None:
+            raise ValueError("Binary requests need the msgpack package")
+        return msgpack.unpackb(message["bytes"])
+    return json.loads(message["text"])
+
+
+def decode_event(preamble: dict[str, Any], frame: bytes) -> dict[str, Any]:
+    """A MessagePack event frame back in JSON form, as a client decodes it."""
+    keys, event_types = preamble["keys"], preamble["event_types"]
+    event = {
+        keys[key] if isinstance(key, int) else key: value
+        for key, value in msgpack.unpackb(frame, strict_map_key=False).items()
+    }
+    if isinstance(event.get("event_type"), int):
+        event["event_type"] = event_types[event["event_type"]]
+    return event
@@ -0,0 +1,39 @@
+# Copyright 2025 VisaShield AI
+# Shared fixtures for the hot-path micro-benchmarks
+
+import os
+
+import pytest
+
+# Benchmarks measure the code, not the environment: no Google Cloud and no
+# shared cache.
+os.environ.setdefault("OFFLINE_MODE", "1")
+os.environ["SHARED_CACHE_SIZE_MB"] = "0"
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:  # pragma: no cover - dev dependency missing
+    collect_ignore_glob = ["test_*.py"]
+
+from app.adjudicator_models import CaseInfo
+
+
+@pytest.fixture
+def case() -> CaseInfo:
+    return CaseInfo(
+        case_number="WAC-25-000001",
+        visa_type="H-1B",
+        petitioner_name="Acme Analytics Inc",
+        beneficiary_name="Jane Doe",
+        job_title="Data Scientist",
+        job_duties="Design statistical models and machine learning pipelines",
+        degree_type="Master's",
+        degree_field="Computer Science",
+        years_experience=4,
+        work_location="Austin, TX",
+        offered_wage=112000.0,
+        prevailing_wage=98000.0,
+        lca_number="I-200-25001-123456",
+        soc_code="15-2051",
+        wage_level=2,
+    )
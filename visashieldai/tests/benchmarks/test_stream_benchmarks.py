@@ -0,0 +1,201 @@
+# Copyright 2025 VisaShield AI
+# Micro-benchmarks of event construction, SSE framing, prompts and criteria
+
+import json
+from typing import Any
+
+import pytest
+
+from app.adjudicator_agent import check_lca_compliance
+from app.adjudicator_api import analysis_prompt, sse_frame
+from app.adjudicator_models import AdjudicationEvent, CaseInfo
+from app.app_utils.compression import BROTLI, GZIP, StreamCompressor, brotli
+from app.criteria import EVALUATION_CRITERIA, get_criterion, normalize_visa_type
+from app.latency import LatencyHistogram, LatencyMetrics
+from app.visa_agents import VISA_AGENT_SPECS
+from app.ws_protocol import JsonCodec, MsgpackCodec, msgpack
+
+TOOL_RESULT = check_lca_compliance(
+    lca_number="I-200-25001-123456",
+    wage_level=2,
+    prevailing_wage=98000.0,
+    offered_wage=112000.0,
+)
+REASONING = "The petitioner has established a specialty occupation. " * 4
+
+
+def test_event_construction(benchmark: Any) -> None:
+    event = benchmark(
+        AdjudicationEvent,
+        event_type="tool_result",
+        tool_name="check_lca_compliance",
+        tool_result=TOOL_RESULT,
+    )
+    assert event.timestamp
+
+
+def test_event_serialization(benchmark: Any) -> None:
+    event = AdjudicationEvent(
+        event_type="tool_result",
+        tool_name="check_lca_compliance",
+        tool_result=TOOL_RESULT,
+    )
+    assert json.loads(benchmark(event.model_dump_json))["tool_result"]
+
+
+def test_sse_frame_tool_result(benchmark: Any) -> None:
+    def frame() -> str:
+        return sse_frame(
+            AdjudicationEvent(
+                event_type="tool_result",
+                tool_name="check_lca_compliance",
+                tool_result=TOOL_RESULT,
+            )
+        )
+
+    assert benchmark(frame).endswith("\n\n")
+
+
+def test_sse_frame_reasoning(benchmark: Any) -> None:
+    def frame() -> str:
+        return sse_frame(AdjudicationEvent(event_type="reasoning", content=REASONING))
+
+    assert benchmark(frame).startswith("data: ")
+
+
+def test_websocket_payload(benchmark: Any) -> None:
+    """The dict the WebSocket route encodes per tool result."""
+    payload = {
+        "event_type": "tool_result",
+        "tool_name": "check_lca_compliance",
+        "tool_result": TOOL_RESULT,
+        "timestamp": "2025-01-01T00:00:00",
+    }
+    benchmark(json.dumps, payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def test_analysis_prompt(benchmark: Any, case: CaseInfo) -> None:
+    assert case.case_number in benchmark(analysis_prompt, case, 98000.0, None)
+
+
+def test_agent_instruction(benchmark: Any) -> None:
+    spec = VISA_AGENT_SPECS["O-1"]
+    assert benchmark(spec.instruction, "O-1")
+
+
+def test_criteria_lookup(benchmark: Any) -> None:
+    def lookup() -> str:
+        key = normalize_visa_type("h1b")
+        json.dumps({"visa_type": key, "criteria": EVALUATION_CRITERIA[key]})
+        return key
+
+    assert benchmark(lookup) == "H-1B"
+
+
+def test_get_criterion(benchmark: Any) -> None:
+    assert benchmark(get_criterion, "eb2 niw", "3") is not None
+
+
+def _stream_frames() -> list[bytes]:
+    events = [
+        AdjudicationEvent(event_type="tool_call", tool_name="check_lca_compliance"),
+        AdjudicationEvent(
+            event_type="tool_result",
+            tool_name="check_lca_compliance",
+            tool_result=TOOL_RESULT,
+        ),
+        AdjudicationEvent(event_type="reasoning", content=REASONING),
+    ] * 5
+    return [sse_frame(event).encode() for event in events]
+
+
+@pytest.mark.parametrize(
+    "encoding",
+    [
+        GZIP,
+        pytest.param(
+            BROTLI,
+            marks=pytest.mark.skipif(brotli is None, reason="Brotli not installed"),
+        ),
+    ],
+)
+def test_compress_sse_stream(benchmark: Any, encoding: str) -> None:
+    """CPU per stream, with bytes on the wire in extra_info."""
+    frames = _stream_frames()
+
+    def compress() -> int:
+        compressor = StreamCompressor(encoding)
+        sent = sum(len(compressor.compress(frame)) for frame in frames)
+        return sent + len(compressor.finish())
+
+    sent = benchmark(compress)
+    raw = sum(len(frame) for frame in frames)
+    benchmark.extra_info.update(raw_bytes=raw, sent_bytes=sent, ratio=sent / raw)
+    assert sent < raw
+
+
+WS_EVENTS: dict[str, dict[str, Any]] = {
+    "tool_call": {
+        "event_type": "tool_call",
+        "tool_name": "check_lca_compliance",
+        "content": "Executing check_lca_compliance",
+    },
+    "tool_result": {
+        "event_type": "tool_result",
+        "tool_name": "check_lca_compliance",
+        "tool_result": TOOL_RESULT,
+    },
+    "reasoning": {"event_type": "reasoning", "content": REASONING},
+}
+WS_CODECS = [
+    pytest.param(JsonCodec, id="json"),
+    pytest.param(
+        MsgpackCodec,
+        id="msgpack",
+        marks=pytest.mark.skipif(msgpack is None, reason="msgpack not installed"),
+    ),
+]
+
+
+@pytest.mark.parametrize("event", list(WS_EVENTS))
+@pytest.mark.parametrize("codec", WS_CODECS)
+def test_websocket_frame(benchmark: Any, codec: type, event: str) -> None:
+    """Encode cost per event, with the frame size in extra_info.
+
+    "json" is the ``send_json`` encoding the route used before the
+    MessagePack subprotocol.
+    """
+    encode = codec().encode
+    frame = benchmark(lambda: encode(dict(WS_EVENTS[event])))
+    benchmark.extra_info["frame_bytes"] = len(
+        frame if isinstance(frame, bytes) else frame.encode()
+    )
+
+
+@pytest.mark.parametrize("codec", WS_CODECS)
+def test_websocket_session(benchmark: Any, codec: type) -> None:
+    """A 15-event session including any preamble; bytes on the wire in extra_info."""
+    events = list(WS_EVENTS.values()) * 5
+
+    def session() -> int:
+        protocol = codec()
+        frames = [protocol.preamble() or b""]
+        frames += [protocol.encode(dict(event)) for event in events]
+        return sum(len(f if isinstance(f, bytes) else f.encode()) for f in frames)
+
+    benchmark.extra_info["session_bytes"] = benchmark(session)
+
+
+def test_latency_histogram_record(benchmark: Any) -> None:
+    """Recording runs for every tool, model turn and first event."""
+    histogram = LatencyHistogram()
+    benchmark(histogram.record, 0.0421)
+    assert histogram.count
+
+
+def test_latency_metrics_record(benchmark: Any) -> None:
+    """Label lookup plus recording, as the tool callbacks do it."""
+    metrics = LatencyMetrics()
+    benchmark(
+        metrics.record, "tool", "analyze/stream", "H-1B", "check_lca_compliance", 0.0421
+    )
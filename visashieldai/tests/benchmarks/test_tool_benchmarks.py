@@ -0,0 +1,120 @@
+# Copyright 2025 VisaShield AI
+# Micro-benchmarks of the adjudicator tools
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from app.adjudicator_agent import (
+    analyze_petition_form,
+    check_beneficiary_qualifications,
+    check_citation_validity,
+    check_lca_compliance,
+    evaluate_extraordinary_ability,
+    evaluate_national_interest,
+    evaluate_specialty_occupation,
+    generate_adjudication_draft,
+    verify_employer_employee_relationship,
+)
+
+TOOL_CALLS: list[tuple[Callable[..., dict[str, Any]], dict[str, Any]]] = [
+    (
+        analyze_petition_form,
+        {
+            "case_number": "WAC-25-000001",
+            "form_type": "I-129",
+            "petitioner_name": "Acme Analytics Inc",
+            "beneficiary_name": "Jane Doe",
+        },
+    ),
+    (
+        evaluate_specialty_occupation,
+        {
+            "job_title": "Data Scientist",
+            "job_duties": "Design statistical models and machine learning pipelines",
+            "degree_requirement": "Bachelor's degree in Computer Science",
+            "soc_code": "15-2051",
+        },
+    ),
+    (
+        check_beneficiary_qualifications,
+        {
+            "degree_type": "Master's",
+            "degree_field": "Computer Science",
+            "years_experience": 4,
+            "certifications": ["AWS Certified Machine Learning"],
+            "degree_country": "India",
+            "program_years": 2,
+        },
+    ),
+    (
+        verify_employer_employee_relationship,
+        {
+            "employer_name": "Acme Analytics Inc",
+            "work_location": "Austin, TX",
+            "supervision_details": "Reports to the Director of Data Science",
+            "right_to_control": "Employer sets schedule and assigns projects",
+        },
+    ),
+    (
+        check_lca_compliance,
+        {
+            "lca_number": "I-200-25001-123456",
+            "wage_level": 2,
+            "prevailing_wage": 0,
+            "offered_wage": 112000.0,
+            "soc_code": "15-2051",
+            "work_location": "Austin, TX",
+        },
+    ),
+    (
+        evaluate_extraordinary_ability,
+        {
+            "field_of_endeavor": "Machine learning research",
+            "evidence_criteria": ["awards", "judging", "scholarly_articles"],
+            "comparable_evidence": False,
+        },
+    ),
+    (
+        evaluate_national_interest,
+        {
+            "proposed_endeavor": "Grid-scale battery safety research",
+            "national_importance_evidence": ["DOE grant", "Congressional testimony"],
+            "positioning_evidence": ["PhD", "12 publications"],
+            "waiver_justification": "Labor certification would delay the research",
+        },
+    ),
+    (
+        generate_adjudication_draft,
+        {
+            "case_number": "WAC-25-000001",
+            "visa_type": "H-1B",
+            "recommendation": "APPROVE",
+            "key_findings": ["Specialty occupation established"],
+            "risk_factors": [],
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("tool", "arguments"), TOOL_CALLS, ids=[tool.__name__ for tool, _ in TOOL_CALLS]
+)
+def test_tool(
+    benchmark: Any,
+    tool: Callable[..., dict[str, Any]],
+    arguments: dict[str, Any],
+) -> None:
+    result = benchmark(tool, **arguments)
+    assert isinstance(result, dict)
+
+
+@pytest.mark.parametrize(
+    "citation",
+    ["8 CFR § 214.2(h)(4)(iii)(A)", "Matter of Imaginary, 99 I&N Dec. 1 (AAO 2030)"],
+    ids=["known", "unknown"],
+)
+def test_check_citation_validity(benchmark: Any, citation: str) -> None:
+    result = benchmark(check_citation_validity, citation)
+    assert result["citation"] == citation
@@ -0,0 +1,287 @@
+# Copyright 2025 VisaShield AI
+# Locust scenarios for the adjudicator endpoints
+
+"""Load test of the adjudicator API: SSE, synchronous, WebSocket and criteria.
+
+Each simulated officer submits generated cases (mostly H-1B, with O-1 and
+EB-2 NIW, and some deficient ones that the pre-screen short-circuits). Besides
+locust's own request statistics, streamed runs report custom metrics
+(request type ``METRIC``):
+
+* ``<route> time_to_first_event``: request start to the first event
+* ``<route> time_to_first_tool_result``: request start to the first tool result
+* ``<route> total_duration``: request start to the ``complete`` event
+* ``<route> events_per_second``: events per second over the run; the value is
+  reported in the response-time column
+
+``LOAD_PROFILE=step`` ramps users in steps and ``LOAD_PROFILE=soak`` holds a
+steady load for a long time. Without it, ``-u``/``-r``/``-t`` apply. Run it
+offline against the stub model:
+
+    OFFLINE_MODE=1 AGENT_MODEL=stub uv run uvicorn app.fast_api_app:app --port 8000
+    locust -f tests/load_test/adjudicator_load_test.py -H http://127.0.0.1:8000 \\
+        --headless -t 60s -u 20 -r 5
+"""
+
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any
+
+import websocket
+from locust import HttpUser, LoadTestShape, between, events, task
+
+# ========================================
+# CASE GENERATORS
+# ========================================
+
+EMPLOYERS = [
+    "Acme Analytics Inc",
+    "Northwind Systems LLC",
+    "Globex Corporation",
+    "Initech Software",
+    "Umbrella Biotech",
+    "Stark Robotics",
+    "Wayne Financial Services",
+    "Cyberdyne Research",
+]
+# (job title, SOC code, degree field, typical prevailing wage)
+POSITIONS = [
+    ("Software Engineer", "15-1252", "Computer Science", 118000),
+    ("Data Scientist", "15-2051", "Statistics", 112000),
+    ("Mechanical Engineer", "17-2141", "Mechanical Engineering", 96000),
+    ("Financial Analyst", "13-2051", "Finance", 84000),
+    ("Biochemist", "19-1021", "Biochemistry", 91000),
+]
+LOCATIONS = ["Austin, TX", "Seattle, WA", "New York, NY", "San Jose, CA", "Boston, MA"]
+DEGREES = ["Bachelor's", "Master's", "PhD"]
+VISA_TYPES = ["H-1B"] * 7 + ["O-1"] * 2 + ["EB-2 NIW"]
+DEFICIENT_RATE = 0.1
+
+
+def make_case(rng: random.Random) -> dict[str, Any]:
+    """A plausible CaseInfo payload; a few lack their LCA (deficient)."""
+    title, soc, field, wage = rng.choice(POSITIONS)
+    level = rng.randint(1, 4)
+    prevailing = round(wage * (0.8 + 0.1 * level), -2)
+    case = {
+        "case_number": f"WAC-25-{rng.randint(0, 999999):06d}",
+        "visa_type": rng.choice(VISA_TYPES),
+        "petitioner_name": rng.choice(EMPLOYERS),
+        "beneficiary_name": f"Beneficiary {uuid.uuid4().hex[:6]}",
+        "job_title": title,
+        "job_duties": f"{title} duties requiring a degree in {field}",
+        "degree_type": rng.choice(DEGREES),
+        "degree_field": field,
+        "years_experience": rng.randint(0, 12),
+        "work_location": rng.choice(LOCATIONS),
+        "offered_wage": round(prevailing * rng.uniform(0.95, 1.3), -2),
+        "prevailing_wage": prevailing,
+        "lca_number": f"I-200-25{rng.randint(0, 999):03d}-{rng.randint(0, 999999):06d}",
+        "soc_code": soc,
+        "wage_level": level,
+    }
+    if rng.random() < DEFICIENT_RATE:
+        case["lca_number"] = None
+    return case
+
+
+def analysis_request(rng: random.Random) -> dict[str, Any]:
+    return {
+        "case_info": make_case(rng),
+        "output_format": "json" if rng.random() < 0.25 else "text",
+        # Unique cases rarely repeat; keep runs out of the shared cache
+        # unless the cache itself is under test.
+        "use_cache": os.environ.get("LOAD_TEST_USE_CACHE", "") == "1",
+    }
+
+
+def headers() -> dict[str, str]:
+    result = {"Content-Type": "application/json"}
+    if os.environ.get("_ID_TOKEN"):
+        result["Authorization"] = f"Bearer {os.environ['_ID_TOKEN']}"
+    return result
+
+
+# ========================================
+# STREAM METRICS
+# ========================================
+
+
+class StreamMetrics:
+    """Timings of one streamed run, reported as locust METRIC entries."""
+
+    def __init__(self, route: str) -> None:
+        self.route = route
+        self.started = time.perf_counter()
+        self.first_event: float | None = None
+        self.first_tool_result: float | None = None
+        self.events = 0
+
+    def observe(self, event: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        self.events += 1
+        if self.first_event is None:
+            self.first_event = now
+        if event.get("event_type") == "tool_result" and self.first_tool_result is None:
+            self.first_tool_result = now
+
+    def report(self) -> None:
+        elapsed = time.perf_counter() - self.started
+        for name, at in (
+            ("time_to_first_event", self.first_event),
+            ("time_to_first_tool_result", self.first_tool_result),
+        ):
+            if at is not None:
+                fire_metric(f"{self.route} {name}", 1000 * (at - self.started))
+        fire_metric(f"{self.route} total_duration", 1000 * elapsed, self.events)
+        fire_metric(
+            f"{self.route} events_per_second", self.events / elapsed if elapsed else 0
+        )
+
+
+def fire_metric(name: str, value: float, length: int = 0) -> None:
+    events.request.fire(
+        request_type="METRIC",
+        name=name,
+        response_time=value,
+        response_length=length,
+        response=None,
+        context={},
+        exception=None,
+    )
+
+
+# ========================================
+# USERS
+# ========================================
+
+
+class AdjudicatorUser(HttpUser):
+    """An officer running analyses over the SSE, HTTP and WebSocket routes."""
+
+    wait_time = between(1, 3)
+
+    def on_start(self) -> None:
+        self.rng = random.Random()
+        self.user_id = f"officer_{uuid.uuid4().hex[:8]}"
+
+    @task(4)
+    def analyze_stream(self) -> None:
+        metrics = StreamMetrics("analyze/stream")
+        with self.client.post(
+            "/api/adjudicator/analyze/stream",
+            name="/api/adjudicator/analyze/stream",
+            headers=headers(),
+            json=analysis_request(self.rng),
+            stream=True,
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"Unexpected status code: {response.status_code}")
+                return
+            for line in response.iter_lines():
+                if not line or not line.startswith(b"data: "):
+                    continue
+                event = json.loads(line[6:])
+                metrics.observe(event)
+                if event.get("event_type") == "error":
+                    response.failure(f"Error event: {event.get('content')}")
+                    return
+            metrics.report()
+
+    @task(2)
+    def analyze(self) -> None:
+        with self.client.post(
+            "/api/adjudicator/analyze",
+            headers=headers(),
+            json=analysis_request(self.rng),
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"Unexpected status code: {response.status_code}")
+            elif not response.json().get("analysis"):
+                response.failure("Empty analysis")
+
+    @task(2)
+    def analyze_websocket(self) -> None:
+        url = (self.host or "").replace("http", "ws", 1)
+        session_id = f"session_{uuid.uuid4().hex[:8]}"
+        path = f"/api/adjudicator/ws/{self.user_id}/{session_id}"
+        metrics = StreamMetrics("ws")
+        exception: Exception | None = None
+        try:
+            ws = websocket.create_connection(
+                url + path, header=[f"{k}: {v}" for k, v in headers().items()]
+            )
+            try:
+                ws.send(json.dumps(analysis_request(self.rng)))
+                while True:
+                    event = json.loads(ws.recv())
+                    metrics.observe(event)
+                    if event.get("event_type") == "error":
+                        raise RuntimeError(event.get("content"))
+                    if event.get("event_type") == "complete":
+                        break
+            finally:
+                ws.close()
+        except Exception as e:
+            exception = e
+        events.request.fire(
+            request_type="WS",
+            name="/api/adjudicator/ws/[user_id]/[session_id]",
+            response_time=1000 * (time.perf_counter() - metrics.started),
+            response_length=metrics.events,
+            response=None,
+            context={},
+            exception=exception,
+        )
+        if exception is None:
+            metrics.report()
+
+    @task(1)
+    def criteria(self) -> None:
+        visa_type = self.rng.choice(["H-1B", "O-1", "EB-2 NIW"])
+        self.client.get(
+            f"/api/adjudicator/criteria/{visa_type}",
+            name="/api/adjudicator/criteria/[visa_type]",
+            headers=headers(),
+        )
+
+
+# ========================================
+# LOAD PROFILES
+# ========================================
+
+PROFILE = os.environ.get("LOAD_PROFILE", "")
+
+if PROFILE == "step":
+
+    class StepLoadShape(LoadTestShape):
+        """Adds STEP_USERS users every STEP_SECONDS, for STEPS steps."""
+
+        step_users = int(os.environ.get("STEP_USERS", "10"))
+        step_seconds = int(os.environ.get("STEP_SECONDS", "60"))
+        steps = int(os.environ.get("STEPS", "5"))
+
+        def tick(self) -> tuple[int, float] | None:
+            step = int(self.get_run_time() // self.step_seconds) + 1
+            if step > self.steps:
+                return None
+            return step * self.step_users, self.step_users
+
+elif PROFILE == "soak":
+
+    class SoakLoadShape(LoadTestShape):
+        """Ramps to SOAK_USERS over SOAK_RAMP_SECONDS, holds SOAK_MINUTES."""
+
+        users = int(os.environ.get("SOAK_USERS", "30"))
+        ramp_seconds = int(os.environ.get("SOAK_RAMP_SECONDS", "120"))
+        hold_seconds = 60 * int(os.environ.get("SOAK_MINUTES", "60"))
+
+        def tick(self) -> tuple[int, float] | None:
+            if self.get_run_time() > self.ramp_seconds + self.hold_seconds:
+                return None
+            return self.users, max(1.0, self.users / self.ramp_seconds)
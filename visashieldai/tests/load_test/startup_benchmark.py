@@ -0,0 +1,106 @@
+# Copyright 2025 VisaShield AI
+# Cold-start cost: import time and time to the first served request
+
+"""Reports how long a fresh process takes to import the app and to serve.
+
+* **import**: ``import app.fast_api_app`` in a new interpreter.
+* **first request**: from launching uvicorn to the first 200 from
+  ``/api/adjudicator/health``, then to the first ``/prescreen`` answer, which
+  loads the rule engine.
+
+Each figure is the median over ``--runs`` fresh processes.
+
+    uv run python tests/load_test/startup_benchmark.py --runs 5 [--offline]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.fast_api_app; "
+    "print(time.perf_counter() - t)"
+)
+CASE = {
+    "case_number": "WAC-25-000001",
+    "visa_type": "H-1B",
+    "petitioner_name": "Acme Corp",
+    "beneficiary_name": "Jane Doe",
+}
+
+
+def import_seconds(env: dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def request(port: int, method: str, path: str, body: str | None = None) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request(method, path, body, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def serve_seconds(env: dict[str, str], port: int) -> tuple[float, float]:
+    """Seconds from launch to the first health check and first pre-screen."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.fast_api_app:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            try:
+                if request(port, "GET", "/api/adjudicator/health") == 200:
+                    break
+            except OSError:
+                time.sleep(0.02)
+        healthy = time.perf_counter() - started
+        request(port, "POST", "/api/adjudicator/prescreen", json.dumps(CASE))
+        return healthy, time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--offline", action="store_true", help="set OFFLINE_MODE=1")
+    args = parser.parse_args()
+
+    env = {**os.environ, "SHARED_CACHE_SIZE_MB": "0"}
+    if args.offline:
+        env["OFFLINE_MODE"] = "1"
+    imports = [import_seconds(env) for _ in range(args.runs)]
+    serves = [serve_seconds(env, args.port) for _ in range(args.runs)]
+    print(f"import app.fast_api_app   {1000 * statistics.median(imports):8.0f} ms")
+    print(
+        "first health check        "
+        f"{1000 * statistics.median(s[0] for s in serves):8.0f} ms"
+    )
+    print(
+        "first pre-screen          "
+        f"{1000 * statistics.median(s[1] for s in serves):8.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
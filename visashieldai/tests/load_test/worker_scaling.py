@@ -0,0 +1,120 @@
+# Copyright 2025 VisaShield AI
+# Throughput of the multi-worker server as the worker count grows
+
+"""Measures requests/s of a CPU-bound endpoint at 1, 2, 4, ... workers.
+
+Each run starts ``python -m app.app_utils.serving --workers N``, waits for
+``/api/adjudicator/health`` and then drives ``/api/adjudicator/prescreen/batch``
+(pydantic validation, rule evaluation and JSON encoding of a 200-case batch)
+from client processes for a fixed time. With enough cores, throughput should
+grow close to linearly with the worker count.
+
+    uv run python tests/load_test/worker_scaling.py --workers 1 2 4 --seconds 10
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+ENDPOINT = "/api/adjudicator/prescreen/batch"
+CASES = [
+    {
+        "case_number": f"WAC-25-{i:06d}",
+        "visa_type": "H-1B",
+        "petitioner_name": f"Employer {i % 37}",
+        "beneficiary_name": f"Beneficiary {i}",
+        "job_title": "Software Engineer",
+        "degree_type": "Bachelor's",
+        "degree_field": "Computer Science",
+        "offered_wage": 95000 + i,
+        "prevailing_wage": 98000,
+        "lca_number": f"I-200-25{i:03d}-123456",
+        "soc_code": "15-1252",
+        "wage_level": 2,
+    }
+    for i in range(200)
+]
+
+
+def wait_for_server(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/adjudicator/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def drive(port: int, seconds: float) -> int:
+    """Sends requests back to back on one connection; returns the count."""
+    body = json.dumps({"cases": CASES})
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    completed = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        conn.request(
+            "POST", ENDPOINT, body, headers={"Content-Type": "application/json"}
+        )
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            completed += 1
+    return completed
+
+
+def run(workers: int, clients: int, seconds: float, port: int) -> float:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.app_utils.serving",
+            "--workers",
+            str(workers),
+            "--port",
+            str(port),
+        ],
+        env={**os.environ, "SHARED_CACHE_SIZE_MB": "0"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_server(port)
+        drive(port, 1.0)  # warm up every worker's imports and caches
+        with multiprocessing.get_context("spawn").Pool(clients) as pool:
+            counts = pool.starmap(drive, [(port, seconds)] * clients)
+        return sum(counts) / seconds
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker-count scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients-per-worker", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        throughput = run(
+            workers, workers * args.clients_per_worker, args.seconds, args.port
+        )
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for admission control
+
+import asyncio
+from typing import Any
+
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.testclient import WebSocketDenialResponse
+
+from app.app_utils.admission import AdmissionController, AdmissionMiddleware
+from app.scheduler import AdjudicationScheduler, Lane
+
+
+def _app(controller: AdmissionController) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    @app.post("/api/adjudicator/analyze")
+    async def analyze() -> dict[str, Any]:
+        return {"in_flight": controller.in_flight}
+
+    @app.get("/api/adjudicator/health")
+    async def health() -> dict[str, Any]:
+        return controller.health()
+
+    @app.get("/api/adjudicator/criteria/{visa_type}")
+    async def criteria(visa_type: str) -> dict[str, str]:
+        return {"visa_type": visa_type}
+
+    @app.websocket("/api/adjudicator/ws/{user_id}/{session_id}")
+    async def ws(websocket: WebSocket, user_id: str, session_id: str) -> None:
+        await websocket.accept()
+        await websocket.send_text(str(controller.in_flight))
+        await websocket.close()
+
+    return app
+
+
+def test_admits_and_tracks_in_flight() -> None:
+    controller = AdmissionController(AdjudicationScheduler(concurrency=2))
+    with TestClient(_app(controller)) as client:
+        response = client.post("/api/adjudicator/analyze")
+    assert response.json() == {"in_flight": 1}
+    assert controller.in_flight == 0
+    assert controller.stats["admitted"] == 1
+
+
+def test_open_websockets_are_not_in_flight() -> None:
+    controller = AdmissionController(
+        AdjudicationScheduler(concurrency=2), max_in_flight=1
+    )
+    with TestClient(_app(controller)) as client:
+        with client.websocket_connect("/api/adjudicator/ws/u/s") as ws:
+            assert ws.receive_text() == "0"
+            assert client.post("/api/adjudicator/analyze").status_code == 200
+    assert controller.stats["admitted"] == 2
+
+
+def test_sheds_on_loop_lag_but_keeps_exempt_routes() -> None:
+    controller = AdmissionController(
+        AdjudicationScheduler(concurrency=2), max_loop_lag=0.5
+    )
+    controller.loop_lag.interval = 60  # no samples during the test
+    controller.loop_lag.observe(2.0)
+    with TestClient(_app(controller)) as client:
+        rejected = client.post("/api/adjudicator/analyze")
+        health = client.get("/api/adjudicator/health")
+        criteria = client.get("/api/adjudicator/criteria/H-1B")
+        try:
+            with client.websocket_connect("/api/adjudicator/ws/u/s") as ws:
+                ws.receive_text()
+            denied = None
+        except WebSocketDenialResponse as e:
+            denied = e
+
+    assert rejected.status_code == 503
+    assert rejected.json()["reason"] == "loop_lag"
+    # Twice the lag, since the scheduler has no backlog
+    assert rejected.headers["Retry-After"] == "4"
+    assert denied is not None and denied.status_code == 503
+    assert denied.headers["Retry-After"] == "4"
+    assert health.status_code == 200
+    assert health.json()["status"] == "saturated"
+    assert criteria.status_code == 200
+    assert controller.rejected_by_reason == {"loop_lag": 2}
+
+
+def test_queue_depth_limit_and_retry_after_from_backlog() -> None:
+    async def scenario() -> tuple[str | None, int, str]:
+        scheduler = AdjudicationScheduler(concurrency=1)
+        controller = AdmissionController(scheduler, max_queue_depth=2)
+        gate = asyncio.Event()
+
+        async def run() -> None:
+            async with scheduler.slot(Lane.INTERACTIVE):
+                await gate.wait()
+
+        tasks = [asyncio.create_task(run()) for _ in range(3)]
+        await asyncio.sleep(0)
+        # One running and two queued, at the default 10 s per run
+        reason, retry_after = controller.acquire(), controller.retry_after()
+        status = controller.health()["status"]
+        gate.set()
+        await asyncio.gather(*tasks)
+        return reason, retry_after, status
+
+    reason, retry_after, status = asyncio.run(scenario())
+    assert reason == "queue_depth"
+    assert retry_after == 30
+    assert status == "saturated"
+
+
+def test_lag_decays_after_a_stall() -> None:
+    controller = AdmissionController(AdjudicationScheduler(concurrency=1))
+    controller.loop_lag.observe(1.0)
+    assert controller.health()["status"] == "saturated"
+    for _ in range(20):
+        controller.loop_lag.observe(0.0)
+    assert controller.health()["status"] == "healthy"
+    assert controller.acquire() is None
+
+
+def test_websocket_without_denial_extension_is_closed_with_1013() -> None:
+    controller = AdmissionController(AdjudicationScheduler(concurrency=1))
+    controller.loop_lag.interval = 60  # no samples during the test
+    controller.loop_lag.observe(2.0)
+    middleware = AdmissionMiddleware(_app(controller), controller)
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "websocket.connect"}
+
+    async def send(message: Any) -> None:
+        sent.append(message)
+
+    scope = {"type": "websocket", "path": "/api/adjudicator/ws/u/s"}
+    asyncio.run(middleware(scope, receive, send))
+    assert [m["type"] for m in sent] == ["websocket.accept", "websocket.close"]
+    assert sent[1]["code"] == 1013
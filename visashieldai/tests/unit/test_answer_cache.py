@@ -0,0 +1,47 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the Ask VIA answer cache
+
+from app.answer_cache import AnswerCache, normalize_question
+from app.ask_via_agent import resolve_sources
+
+ANSWER = {"answer": "...", "sources": [], "confidence": 0.9}
+
+
+def test_exact_and_semantic_tiers() -> None:
+    cache = AnswerCache(capacity=8)
+    cache.put("What is a specialty occupation?", ANSWER)
+    assert cache.get("what is a SPECIALTY occupation") == (ANSWER, "exact", 1.0)
+    hit = cache.get("What does specialty occupation mean?")
+    assert hit is not None and hit[1] == "semantic"
+    assert cache.get("How is the prevailing wage level set?") is None
+    assert cache.metrics()["hit_rate"] == round(2 / 3, 4)
+
+
+def test_semantic_hits_require_matching_anchors() -> None:
+    cache = AnswerCache(capacity=8)
+    cache.put("What evidence is needed for H-1B?", ANSWER)
+    assert cache.get("What evidence is needed for O-1?") is None
+    assert normalize_question("8 CFR 214.2(h) requirements?") == (
+        "8 cfr 214.2(h) requirements"
+    )
+
+
+def test_lru_eviction_and_ttl() -> None:
+    now = [0.0]
+    cache = AnswerCache(capacity=2, ttl=60, clock=lambda: now[0])
+    cache.put("cap season dates", ANSWER)
+    cache.put("premium processing fee", ANSWER)
+    assert cache.get("cap season dates") is not None  # now most recent
+    cache.put("itinerary requirement", ANSWER)
+    assert cache.get("premium processing fee") is None
+    assert cache.metrics()["evictions"] == 1
+    now[0] = 61.0
+    assert cache.get("cap season dates") is None
+    assert cache.metrics()["expirations"] == 1
+    assert len(cache) == 1
+
+
+def test_sources_resolve_from_catalog_only() -> None:
+    sources = resolve_sources(["S2", "S99", "S2"])
+    assert [s["id"] for s in sources] == ["S2"]
+    assert sources[0]["url"].startswith("https://www.ecfr.gov/")
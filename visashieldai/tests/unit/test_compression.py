@@ -0,0 +1,82 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for response compression
+
+import asyncio
+import gzip
+import json
+import zlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from app.app_utils import compression
+from app.app_utils.compression import (
+    BROTLI,
+    GZIP,
+    IDENTITY,
+    CompressionStats,
+    compress_body,
+    compress_stream,
+    negotiate_encoding,
+)
+
+FRAMES = [
+    "data: "
+    + json.dumps({"event_type": "tool_result", "tool_result": {"step": i, "ok": True}})
+    + "\n\n"
+    for i in range(5)
+]
+
+
+def test_negotiation_follows_preference_and_q_values(monkeypatch: Any) -> None:
+    monkeypatch.setenv("COMPRESSION_ENCODINGS", "gzip")
+    assert negotiate_encoding("gzip, deflate, br") == GZIP
+    assert negotiate_encoding("br;q=1.0, gzip;q=0") is None
+    assert negotiate_encoding(None) is None
+    monkeypatch.setenv("COMPRESSION_ENCODINGS", "")
+    assert negotiate_encoding("gzip") is None
+
+
+def test_every_event_is_decodable_as_soon_as_it_is_sent(monkeypatch: Any) -> None:
+    monkeypatch.setattr(compression, "compression_stats", CompressionStats())
+
+    async def frames() -> AsyncIterator[str]:
+        for frame in FRAMES:
+            yield frame
+
+    async def collect() -> list[bytes]:
+        return [block async for block in compress_stream(frames(), GZIP, "sse")]
+
+    blocks = asyncio.run(collect())
+    decoder = zlib.decompressobj(31)
+    # Each flushed block decodes to exactly its own event
+    for frame, block in zip(FRAMES, blocks, strict=False):
+        assert decoder.decompress(block).decode() == frame
+    assert gzip.decompress(b"".join(blocks)).decode() == "".join(FRAMES)
+
+    stats = compression.compression_stats.metrics()["routes"]["sse"][GZIP]
+    assert stats["responses"] == 1
+    assert stats["raw_bytes"] == len("".join(FRAMES).encode())
+    assert stats["sent_bytes"] == sum(len(b) for b in blocks)
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="Brotli not installed")
+def test_brotli_stream_round_trips(monkeypatch: Any) -> None:
+    compressor = compression.StreamCompressor(BROTLI)
+    blocks = [compressor.compress(f.encode()) for f in FRAMES] + [compressor.finish()]
+    assert compression.brotli.decompress(b"".join(blocks)).decode() == "".join(FRAMES)
+
+
+def test_small_bodies_skip_compression(monkeypatch: Any) -> None:
+    monkeypatch.setattr(compression, "compression_stats", CompressionStats())
+    monkeypatch.setenv("COMPRESSION_MIN_BYTES", "1024")
+    small = b'{"ok": true}'
+    large = json.dumps({"analysis": "The petitioner has established. " * 100}).encode()
+
+    assert compress_body(small, GZIP, "analyze") is small
+    assert gzip.decompress(compress_body(large, GZIP, "analyze")) == large
+
+    routes = compression.compression_stats.metrics()["routes"]["analyze"]
+    assert routes[IDENTITY]["responses"] == 1
+    assert routes[GZIP]["ratio"] < 0.2
@@ -0,0 +1,44 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the foreign degree equivalency knowledge base
+
+from app.adjudicator_agent import check_beneficiary_qualifications
+from app.degree_equivalency import bounded_edit_distance, evaluate_degree
+
+
+def test_exact_and_alias_lookups() -> None:
+    assert evaluate_degree("B.Tech", "India")["us_equivalency"] == "Bachelor's Degree"
+    assert evaluate_degree("Master's")["us_equivalency"] == "Master's Degree"
+    assert evaluate_degree("Ph.D.")["us_equivalency"] == "Doctorate"
+    diplom = evaluate_degree("Dipl.-Ing.", "Germany", 5)
+    assert (diplom["us_equivalency"], diplom["match"]["fuzzy"]) == (
+        "Master's Degree",
+        False,
+    )
+
+
+def test_misspelled_degree_uses_fuzzy_match() -> None:
+    result = evaluate_degree("Bachelor of Tecnology", "india", 4, "University")
+    assert result["us_equivalency"] == "Bachelor's Degree"
+    assert result["match"]["fuzzy"]
+    assert evaluate_degree("Underwater Basketweaving", "India")["match"] is None
+
+
+def test_three_year_degree_needs_experience() -> None:
+    short = evaluate_degree("B.Sc.", "India", 3, years_experience=1)
+    assert short["status"] == "NOT EQUIVALENT"
+    assert short["experience_years_required"] == 3
+    combined = evaluate_degree("B.Sc.", "India", 3, years_experience=4)
+    assert combined["status"] == "EQUIVALENT WITH EXPERIENCE"
+
+
+def test_tool_flags_unknown_credentials_for_review() -> None:
+    result = check_beneficiary_qualifications(
+        "Licence", "Computer Science", 2, [], degree_country="Atlantis"
+    )
+    assert result["overall_qualification"] == "REQUIRES REVIEW"
+    assert result["degree_evaluation"]["status"] == "REQUIRES CREDENTIAL EVALUATION"
+
+
+def test_bounded_edit_distance() -> None:
+    assert bounded_edit_distance("kitten", "sitting", 3) == 3
+    assert bounded_edit_distance("kitten", "sitting", 1) == 2
@@ -0,0 +1,162 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the MinHash/LSH near-duplicate index
+
+import asyncio
+import glob
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from app.adjudicator_models import CaseInfo
+from app.duplicate_index import DuplicateIndex, DuplicateRecorder
+
+rng = np.random.default_rng(3)
+VOCAB = [f"term{i}" for i in range(2000)]
+
+
+def _text(words: int = 80) -> list[str]:
+    return [str(word) for word in rng.choice(VOCAB, words)]
+
+
+def _variant(words: list[str], edits: int) -> str:
+    words = list(words)
+    for position in rng.integers(0, len(words), edits):
+        words[position] = "edited"
+    return " ".join(words)
+
+
+def _filings() -> tuple[list[str], list[str], list[str]]:
+    template = _text()
+    texts = [_variant(template, 1) for _ in range(5)]
+    texts += [" ".join(_text()) for _ in range(50)]
+    case_numbers = [f"H1B-{i:05d}" for i in range(len(texts))]
+    petitioners = [f"Petitioner {i % 4}" for i in range(len(texts))]
+    return case_numbers, petitioners, texts
+
+
+def _cases(
+    case_numbers: list[str], petitioners: list[str], texts: list[str]
+) -> list[CaseInfo]:
+    return [
+        CaseInfo(
+            case_number=case_number,
+            visa_type="H-1B",
+            petitioner_name=petitioner,
+            beneficiary_name="Jane Doe",
+            job_duties=text,
+        )
+        for case_number, petitioner, text in zip(
+            case_numbers, petitioners, texts, strict=True
+        )
+    ]
+
+
+def test_similar_finds_near_duplicates_only() -> None:
+    case_numbers, petitioners, texts = _filings()
+    index = DuplicateIndex()
+    index.add(case_numbers, petitioners, texts)
+
+    matches = index.similar(texts[0], exclude=case_numbers[0])
+    assert {m["case_number"] for m in matches} == set(case_numbers[1:5])
+    assert all(m["similarity"] >= 0.7 for m in matches)
+    assert index.similar(texts[10], exclude=case_numbers[10]) == []
+    assert index.similar("", exclude=None) == []
+
+
+def test_segments_persist_incrementally(tmp_path: Path) -> None:
+    case_numbers, petitioners, texts = _filings()
+    index = DuplicateIndex(str(tmp_path))
+    index.add(case_numbers[:30], petitioners[:30], texts[:30])
+    index.save()
+    index.add(case_numbers, petitioners, texts)  # first 30 are skipped
+    assert index.pending == len(texts) - 30
+    index.save()
+    segments = sorted(glob.glob(str(tmp_path / "segment-*.npz")))
+    assert len(segments) == 2
+    assert len(os.listdir(tmp_path)) == 3  # and meta.json
+
+    reloaded = DuplicateIndex.load(str(tmp_path))
+    assert len(reloaded) == len(texts)
+    np.testing.assert_array_equal(reloaded.signatures, index.signatures)
+    assert reloaded.similar(texts[0], exclude=case_numbers[0]) == index.similar(
+        texts[0], exclude=case_numbers[0]
+    )
+
+
+def test_clusters_group_mass_filings() -> None:
+    case_numbers, petitioners, texts = _filings()
+    index = DuplicateIndex()
+    index.add(case_numbers, petitioners, texts)
+    assert index.clusters() == [[0, 1, 2, 3, 4]]
+
+
+def test_workers_sharing_a_directory_keep_every_segment(tmp_path: Path) -> None:
+    case_numbers, petitioners, texts = _filings()
+    workers = [DuplicateIndex.load(str(tmp_path)) for _ in range(2)]
+    workers[0].add(case_numbers[:30], petitioners[:30], texts[:30])
+    workers[1].add(case_numbers[20:], petitioners[20:], texts[20:])
+    for worker in workers:
+        worker.save()
+
+    reloaded = DuplicateIndex.load(str(tmp_path))
+    assert reloaded.case_numbers == case_numbers
+
+
+def test_recorder_indexes_in_background_and_saves_on_close(tmp_path: Path) -> None:
+    case_numbers, petitioners, texts = _filings()
+    cases = _cases(case_numbers, petitioners, texts)
+    index = DuplicateIndex(str(tmp_path))
+    recorder = DuplicateRecorder(index, flush_rows=1000)
+
+    async def scenario() -> None:
+        for case in cases + cases[:5]:
+            assert recorder.record(case)
+        assert len(index) == 0  # nothing is indexed on the caller's turn
+        await recorder.close()
+
+    asyncio.run(scenario())
+    assert len(index) == len(cases)
+    assert index.pending == 0
+    assert len(DuplicateIndex.load(str(tmp_path))) == len(cases)
+
+
+def test_recorder_close_waits_for_a_batch_still_in_its_thread() -> None:
+    case_numbers, petitioners, texts = _filings()
+    cases = _cases(case_numbers, petitioners, texts)
+    release = threading.Event()
+    overlaps: list[Sequence[str]] = []
+
+    class SlowIndex(DuplicateIndex):
+        busy = threading.Lock()
+
+        def add(
+            self,
+            case_numbers: Sequence[str],
+            petitioners: Sequence[str],
+            texts: Sequence[str],
+        ) -> None:
+            if not self.busy.acquire(blocking=False):
+                overlaps.append(case_numbers)
+                self.busy.acquire()
+            try:
+                release.wait(5)
+                super().add(case_numbers, petitioners, texts)
+            finally:
+                self.busy.release()
+
+    index = SlowIndex()
+    recorder = DuplicateRecorder(index, batch_size=2)
+
+    async def scenario() -> None:
+        for case in cases:
+            assert recorder.record(case)
+        await asyncio.sleep(0.05)  # the first batch is now stuck in its thread
+        threading.Timer(0.2, release.set).start()
+        await recorder.close(timeout=0.05)
+
+    asyncio.run(scenario())
+    assert overlaps == []
+    assert sorted(index.case_numbers) == sorted(case_numbers)
@@ -0,0 +1,69 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for petitioner entity resolution and employer history
+
+from pathlib import Path
+
+from app.employer_index import (
+    FUZZY_CACHE_SIZE,
+    MAX_ALIASES,
+    EmployerIndex,
+    normalize_employer_name,
+)
+
+
+def test_name_variants_normalize_to_one_key() -> None:
+    assert normalize_employer_name("Acme Corp") == "acme"
+    assert normalize_employer_name("ACME Corporation, Inc.") == "acme"
+    assert normalize_employer_name("The Company") == "the company"
+
+
+def test_fuzzy_match_resolves_misspellings_only() -> None:
+    index = EmployerIndex()
+    index.record("Globex Technologies LLC", "APPROVE")
+    index.record("Initech Software Inc", "APPROVE")
+    employer = index.resolve("Globex Technolgies, L.L.C.")
+    assert employer is not None and employer.name == "Globex Technologies LLC"
+    assert index.resolve("Umbrella Pharmaceuticals") is None
+
+
+def test_aggregates_update_incrementally_and_replay(tmp_path: Path) -> None:
+    path = str(tmp_path / "history.ndjson")
+    index = EmployerIndex(path)
+    index.record("Acme Corp", "APPROVE", 110000, 100000, "2024-03-01")
+    index.record("ACME Corporation, Inc.", "RFE", 95000, 100000, "2024-05-01")
+    index.record("acme corp.", "DENY", None, None, "2024-04-01")
+
+    profile = index.resolve("Acme")
+    assert profile is not None
+    summary = profile.as_dict()
+    assert (summary["petitions"], summary["rfe_rate"]) == (3, 0.333)
+    assert summary["avg_wage_margin_pct"] == 2.5
+    assert summary["min_wage_margin_pct"] == -5.0
+    assert summary["last_filed"] == "2024-05-01"
+    assert summary["aliases"] == ["ACME Corporation, Inc.", "acme corp."]
+
+    reloaded = EmployerIndex.load(path).resolve("Acme Corp")
+    assert reloaded is not None and reloaded.as_dict() == summary
+
+
+def test_fuzzy_lookups_are_bounded() -> None:
+    index = EmployerIndex()
+    index.record("Globex Technologies LLC", "APPROVE")
+    for i in range(FUZZY_CACHE_SIZE + 100):
+        assert index.resolve(f"Unknown Employer {i}") is None
+    assert len(index._fuzzy) == FUZZY_CACHE_SIZE
+    employer = index.resolve("Globex Technolgies")
+    assert employer is not None and employer.name == "Globex Technologies LLC"
+
+
+def test_aliases_keep_the_most_recent_spellings() -> None:
+    index = EmployerIndex()
+    index.record("Acme Corp", "APPROVE")
+    spellings = [f"Acme Corp{'.' * i}" for i in range(1, MAX_ALIASES + 11)]
+    for name in spellings:
+        index.record(name, "APPROVE")
+    index.record(spellings[0], "APPROVE")  # seen again: kept as recent
+
+    employer = index.resolve("Acme")
+    assert employer is not None and employer.petitions == len(spellings) + 2
+    assert list(employer.aliases) == [*spellings[11:], spellings[0]]
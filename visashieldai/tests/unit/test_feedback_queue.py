@@ -0,0 +1,76 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for batched feedback ingestion
+
+import asyncio
+import json
+import os
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from app.app_utils.feedback_queue import FeedbackQueue, JsonlFileSink
+
+
+class _RecordingSink:
+    name = "recording"
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches: list[list[dict[str, Any]]] = []
+        self.fail = fail
+
+    def write(self, batch: Sequence[dict[str, Any]]) -> None:
+        if self.fail:
+            raise OSError("backend down")
+        self.batches.append(list(batch))
+
+
+class _BlockingSink:
+    name = "blocking"
+
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def write(self, batch: Sequence[dict[str, Any]]) -> None:
+        self.release.wait()
+
+
+def test_batches_by_size_and_interval_then_flushes_on_close() -> None:
+    sink = _RecordingSink()
+    feedback = FeedbackQueue([sink], batch_size=3, flush_interval=0.05)
+
+    async def scenario() -> None:
+        for score in range(4):
+            assert await feedback.offer({"score": score})
+        await asyncio.sleep(0.2)  # full batch of 3, then 1 after the interval
+        assert [len(b) for b in sink.batches] == [3, 1]
+        await feedback.offer({"score": 9})
+        await feedback.close()
+
+    asyncio.run(scenario())
+    assert sink.batches[-1] == [{"score": 9}]
+    assert feedback.metrics()["flushed"] == 5
+
+
+def test_full_queue_rejects_and_failing_sink_is_isolated(tmp_path: Any) -> None:
+    path = os.path.join(tmp_path, "feedback.jsonl")
+    release = threading.Event()
+    feedback = FeedbackQueue(
+        [_RecordingSink(fail=True), _BlockingSink(release), JsonlFileSink(path)],
+        max_size=2,
+        batch_size=1,
+        enqueue_timeout=0.01,
+    )
+
+    async def scenario() -> list[bool]:
+        await feedback.offer({"score": 0})
+        await asyncio.sleep(0.05)  # the flusher is now stuck in the slow sink
+        accepted = [await feedback.offer({"score": i}) for i in (1, 2, 3)]
+        release.set()
+        await feedback.close()
+        return accepted
+
+    assert asyncio.run(scenario()) == [True, True, False]
+    assert feedback.stats["rejected"] == 1
+    assert feedback.stats["sink_failures"] == 3
+    with open(path) as f:
+        assert [json.loads(line)["score"] for line in f] == [0, 1, 2]
@@ -0,0 +1,37 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for lazy Google Cloud configuration and offline fallbacks
+
+import logging
+from typing import Any
+
+from app.app_utils import gcp
+
+
+def test_offline_mode_skips_cloud_setup(monkeypatch: Any, caplog: Any) -> None:
+    monkeypatch.setenv("OFFLINE_MODE", "1")
+    monkeypatch.delenv("GOOGLE_GENAI_USE_VERTEXAI", raising=False)
+    for cached in (gcp.project_id, gcp.configure_genai, gcp.get_cloud_logger):
+        cached.cache_clear()
+    try:
+        assert gcp.configure_genai() is None
+        assert "GOOGLE_GENAI_USE_VERTEXAI" not in gcp.os.environ
+        with caplog.at_level(logging.INFO):
+            gcp.get_cloud_logger("feedback").log_struct({"score": 5})
+        assert "'score': 5" in caplog.text
+    finally:
+        for cached in (gcp.project_id, gcp.configure_genai, gcp.get_cloud_logger):
+            cached.cache_clear()
+
+
+def test_explicit_environment_wins(monkeypatch: Any) -> None:
+    monkeypatch.delenv("OFFLINE_MODE", raising=False)
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "visashield-dev")
+    monkeypatch.setenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+    gcp.project_id.cache_clear()
+    gcp.configure_genai.cache_clear()
+    try:
+        assert gcp.configure_genai() == "visashield-dev"
+        assert gcp.os.environ["GOOGLE_CLOUD_LOCATION"] == "us-central1"
+    finally:
+        gcp.project_id.cache_clear()
+        gcp.configure_genai.cache_clear()
@@ -0,0 +1,72 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the latency histograms
+
+import random
+
+from app.latency import (
+    BUCKET_COUNT,
+    LatencyHistogram,
+    LatencyMetrics,
+    bucket_bounds,
+    bucket_index,
+)
+
+
+def test_buckets_are_contiguous_and_bounded() -> None:
+    previous_high = -1
+    for index in range(BUCKET_COUNT):
+        low, high = bucket_bounds(index)
+        assert low == previous_high + 1
+        assert bucket_index(low) == bucket_index(high) == index
+        # Relative width stays under 1/64 above the linear range
+        assert (high - low) <= max(1, low / 64)
+        previous_high = high
+    assert BUCKET_COUNT < 2000
+
+
+def test_percentiles_are_within_bucket_precision() -> None:
+    rng = random.Random(7)
+    samples = sorted(rng.lognormvariate(-1, 1.2) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for seconds in samples:
+        histogram.record(seconds)
+
+    for percent in (50, 90, 99):
+        exact = samples[int(len(samples) * percent / 100) - 1]
+        assert abs(histogram.percentile(percent) - exact) <= exact / 64
+    assert histogram.percentile(100) == histogram.max == samples[-1]
+    assert histogram.count == len(samples)
+
+    histogram.record(10_000)  # beyond MAX_SECONDS: clamped, still counted
+    assert histogram.count == len(samples) + 1
+    assert len(histogram.counts) == BUCKET_COUNT
+
+
+def test_cumulative_counts_never_exceed_the_bound() -> None:
+    histogram = LatencyHistogram()
+    # 25.05 ms shares the bucket holding 25 ms: it must not count as <= 25 ms.
+    for seconds in (0.02, 0.02505, 0.03):
+        histogram.record(seconds)
+    assert histogram.cumulative((0.025, 0.031, 600)) == [1, 3, 3]
+
+
+def test_summary_and_prometheus_exposition() -> None:
+    metrics = LatencyMetrics()
+    for seconds in (0.02, 0.04, 3.0):
+        metrics.record("tool", "analyze", "H-1B", "check_lca_compliance", seconds)
+    metrics.record("tool", "websocket", "O-1", "evaluate_extraordinary_ability", 0.5)
+
+    tool = metrics.summary()["metrics"]["tool"]
+    assert tool["overall"]["count"] == 4
+    assert tool["series"][0]["tool"] == "check_lca_compliance"
+    assert abs(tool["series"][0]["p50_ms"] - 40) <= 40 / 64
+    assert metrics.summary()["metrics"]["request"]["overall"]["count"] == 0
+
+    lines = metrics.prometheus().splitlines()
+    labels = 'endpoint="analyze",visa_type="H-1B",tool="check_lca_compliance"'
+    name = "visashield_adjudication_tool_seconds"
+    assert "# TYPE visashield_adjudication_tool_seconds histogram" in lines
+    assert f'{name}_bucket{{{labels},le="0.025"}} 1' in lines
+    assert f'{name}_bucket{{{labels},le="2.5"}} 2' in lines
+    assert f'{name}_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f"{name}_count{{{labels}}} 3" in lines
@@ -0,0 +1,122 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for vectorized bulk LCA screening
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from app.adjudicator_agent import check_lca_compliance
+from app.lca_screening import LcaBatch, iter_csv, iter_ndjson, screen_lca_batch
+from app.prevailing_wage import compile_index, get_prevailing_wage_index
+
+WAGES_CSV = """Area,SocCode,GeoLvl,Level1,Level2,Level3,Level4,Average,Label
+41884,15-1252,1,50.00,60.00,70.00,80.00,65.00,Software Developers
+"""
+
+GEOGRAPHY_CSV = """Area,AreaName,StateAb,State,CountyTownName
+41884,"San Francisco-Redwood City-South San Francisco, CA",CA,California,San Francisco County
+"""
+
+
+@pytest.fixture
+def wage_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    wages = tmp_path / "wages.csv"
+    geography = tmp_path / "geography.csv"
+    wages.write_text(WAGES_CSV)
+    geography.write_text(GEOGRAPHY_CSV)
+    path = str(tmp_path / "prevailing_wage.idx")
+    compile_index(str(wages), str(geography), path)
+    monkeypatch.setenv("PREVAILING_WAGE_INDEX_PATH", path)
+    get_prevailing_wage_index.cache_clear()
+    yield
+    get_prevailing_wage_index.cache_clear()
+
+
+def _assert_rows_match_scalar_tool(columns: dict[str, list[Any]]) -> list[Any]:
+    batch = LcaBatch.from_columns(columns)
+    result = screen_lca_batch(batch)
+    rows = [
+        json.loads(line) for line in "".join(iter_ndjson(batch, result)).splitlines()
+    ]
+    assert len(rows) == len(batch)
+    for i, row in enumerate(rows):
+        scalar = check_lca_compliance(
+            batch.lca_number[i],
+            int(batch.wage_level[i]),
+            float(batch.prevailing_wage[i]),
+            float(batch.offered_wage[i]),
+            batch.soc_code[i],
+            batch.work_location[i],
+        )
+        assert row["overall_status"] == scalar["overall_status"]
+        assert row["confidence_score"] == scalar["confidence_score"]
+        analysis = scalar.get("wage_analysis")
+        if analysis is None:
+            assert row["margin"] is None
+            continue
+        assert row["compliant"] is analysis["compliant"]
+        assert row["prevailing_wage_source"] == analysis["prevailing_wage_source"]
+        assert f"${row['prevailing_wage']:,.2f}" == analysis["prevailing_wage"]
+        assert row["margin"] == analysis["margin"]
+    return rows
+
+
+def test_bulk_screening_matches_scalar_tool() -> None:
+    rng = np.random.default_rng(7)
+    rows = 500
+    prevailing = np.round(rng.uniform(60_000, 180_000, rows), 2)
+    prevailing[::10] = 0  # undetermined: no OFLC index configured
+    offered = np.round(prevailing * rng.uniform(0.9, 1.2, rows), 2)
+    offered[1] = prevailing[1]  # exactly at the prevailing wage
+    _assert_rows_match_scalar_tool(
+        {
+            "lca_number": [f"I-200-24001-{i:06d}" for i in range(rows)],
+            "wage_level": [2] * rows,
+            "prevailing_wage": prevailing.tolist(),
+            "offered_wage": offered.tolist(),
+        }
+    )
+
+
+def test_derived_prevailing_wages_match_scalar_tool(wage_index: None) -> None:
+    # Level 2 in San Francisco is $60.00/h, $124,800.00 a year.
+    rows = _assert_rows_match_scalar_tool(
+        {
+            "lca_number": ["I-200-1", "I-200-2", "I-200-3", "I-200-4"],
+            "wage_level": [2, 2, 2, 3],
+            "prevailing_wage": ["", "", "", "130000"],
+            "offered_wage": [130000, 120000.5, 125000, 125000],
+            "soc_code": ["15-1252", "15-1252", "15-1211", "15-1252"],
+            "work_location": [
+                "San Francisco, CA",
+                "San Francisco, CA",
+                "San Francisco, CA",
+                "Boise, ID",
+            ],
+        }
+    )
+    assert [row["prevailing_wage_source"] for row in rows] == [
+        "OFLC Wage Tables",
+        "OFLC Wage Tables",
+        "",
+        "Petition",
+    ]
+    assert rows[1]["margin"] == "-$4,799.50"
+
+
+def test_csv_round_trip() -> None:
+    batch = LcaBatch.from_csv(
+        "lca_number,offered_wage,prevailing_wage\n"
+        "I-200-1,120000,100000\n"
+        "I-200-2,90000,100000\n"
+        "I-200-3,90000,\n"
+    )
+    lines = "".join(iter_csv(batch, screen_lca_batch(batch))).splitlines()
+    assert lines[0].startswith("lca_number,prevailing_wage")
+    assert lines[1].endswith(',True,"+$20,000.00",97,LCA COMPLIANT')
+    assert lines[2].endswith(',False,"-$10,000.00",45,LCA NON-COMPLIANT')
+    assert lines[3].endswith(",False,,0,PREVAILING WAGE UNDETERMINED")
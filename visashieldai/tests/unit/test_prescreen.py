@@ -0,0 +1,82 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the rule-based pre-screen
+
+import pytest
+
+from app.adjudicator_models import CaseInfo
+from app.prescreen import RULES, compile_rules, prescreen_case, prescreen_cases
+
+COMPLETE_H1B = {
+    "case_number": "H1B-2024-00847",
+    "visa_type": "H-1B",
+    "petitioner_name": "Acme Corp",
+    "beneficiary_name": "Jane Doe",
+    "job_duties": "Design and build distributed systems",
+    "degree_type": "Master's",
+    "degree_field": "Computer Science",
+    "work_location": "San Francisco, CA",
+    "offered_wage": 150000,
+    "prevailing_wage": 120000,
+    "lca_number": "I-200-24001-123456",
+}
+
+
+def test_rules_compile_against_criteria_registry() -> None:
+    compiled = compile_rules(RULES)
+    assert set(compiled) == {"H-1B", "O-1", "EB-2 NIW"}
+
+
+def test_complete_case_passes() -> None:
+    result = prescreen_case(CaseInfo.model_validate(COMPLETE_H1B))
+    assert result["passed"]
+    assert "recommendation" not in result
+
+
+def test_deficient_case_returns_rfe_with_failed_criteria() -> None:
+    case = CaseInfo.model_validate(
+        {**COMPLETE_H1B, "lca_number": None, "offered_wage": 90000}
+    )
+    result = prescreen_case(case)
+    assert not result["passed"]
+    assert result["recommendation"] == "RFE"
+    assert [d["rule_id"] for d in result["deficiencies"]] == ["H1B-006", "H1B-007"]
+    assert {d["criterion"] for d in result["deficiencies"]} == {
+        "Prevailing Wage Compliance",
+        "LCA Compliance",
+    }
+
+
+def test_niw_accepts_bachelors_with_progressive_experience() -> None:
+    base = {**COMPLETE_H1B, "visa_type": "EB-2 NIW", "degree_type": "Bachelor's"}
+    experienced = CaseInfo.model_validate({**base, "years_experience": 6})
+    junior = CaseInfo.model_validate({**base, "years_experience": 2})
+    assert prescreen_case(experienced)["passed"]
+    assert not prescreen_case(junior)["passed"]
+
+
+@pytest.mark.parametrize(
+    "degree",
+    ["Master of Science", "M.Sc.", "MS", "MEng", "Doctor of Philosophy", "Ph.D."],
+)
+def test_niw_accepts_advanced_degree_spellings(degree: str) -> None:
+    case = CaseInfo.model_validate(
+        {**COMPLETE_H1B, "visa_type": "EB-2 NIW", "degree_type": degree}
+    )
+    assert prescreen_case(case)["passed"]
+
+
+@pytest.mark.parametrize("degree", ["BEng", "B.Sc.", "Associate"])
+def test_niw_rejects_lower_degrees_without_experience(degree: str) -> None:
+    case = CaseInfo.model_validate(
+        {**COMPLETE_H1B, "visa_type": "EB-2 NIW", "degree_type": degree}
+    )
+    assert not prescreen_case(case)["passed"]
+
+
+def test_batch_summary() -> None:
+    cases = [
+        CaseInfo.model_validate(COMPLETE_H1B),
+        CaseInfo.model_validate({**COMPLETE_H1B, "job_duties": ""}),
+    ]
+    summary = prescreen_cases(cases)
+    assert (summary["total"], summary["passed"], summary["deficient"]) == (2, 1, 1)
@@ -0,0 +1,66 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the OFLC prevailing-wage index
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from app.adjudicator_agent import check_lca_compliance
+from app.prevailing_wage import (
+    PrevailingWageIndex,
+    compile_index,
+    get_prevailing_wage_index,
+)
+
+WAGES_CSV = """Area,SocCode,GeoLvl,Level1,Level2,Level3,Level4,Average,Label
+41884,15-1252,1,50.00,60.00,70.00,80.00,65.00,Software Developers
+41884,15-1211,1,40.00,48.00,56.00,64.00,52.00,Computer Systems Analysts
+12060,15-1252,1,40.00,50.00,60.00,70.00,55.00,Software Developers
+"""
+
+GEOGRAPHY_CSV = """Area,AreaName,StateAb,State,CountyTownName
+41884,"San Francisco-Redwood City-South San Francisco, CA",CA,California,San Francisco County
+41884,"San Francisco-Redwood City-South San Francisco, CA",CA,California,San Mateo County
+12060,"Atlanta-Sandy Springs-Roswell, GA",GA,Georgia,Fulton County
+"""
+
+
+@pytest.fixture
+def index_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    wages = tmp_path / "wages.csv"
+    geography = tmp_path / "geography.csv"
+    wages.write_text(WAGES_CSV)
+    geography.write_text(GEOGRAPHY_CSV)
+    path = str(tmp_path / "prevailing_wage.idx")
+    compile_index(str(wages), str(geography), path)
+    monkeypatch.setenv("PREVAILING_WAGE_INDEX_PATH", path)
+    get_prevailing_wage_index.cache_clear()
+    yield path
+    get_prevailing_wage_index.cache_clear()
+
+
+def test_lookup_by_county_and_principal_city(index_path: str) -> None:
+    index = PrevailingWageIndex(index_path)
+    try:
+        assert len(index) == 3
+        assert index.lookup("15-1252", "San Mateo County, CA", 2) == 124800.0
+        assert index.lookup("15-1252.00", "Redwood City, CA", 4) == 166400.0
+        assert index.lookup("15-1252", "Atlanta, GA", 1) == 83200.0
+        assert index.lookup("15-1252", "Boise, ID", 1) is None
+        assert index.lookup("15-9999", "Atlanta, GA", 1) is None
+        assert index.lookup("15-1252", "Atlanta, GA", 5) is None
+    finally:
+        index.close()
+
+
+def test_check_lca_compliance_derives_prevailing_wage(index_path: str) -> None:
+    result = check_lca_compliance(
+        "I-200-24001-123456", 2, 0, 130000, "15-1252", "San Francisco, CA"
+    )
+    assert result["wage_analysis"]["prevailing_wage"] == "$124,800.00"
+    assert result["wage_analysis"]["prevailing_wage_source"] == "OFLC Wage Tables"
+    assert result["overall_status"] == "LCA COMPLIANT"
+
+    unknown = check_lca_compliance("I-200-24001-123456", 2, 0, 130000)
+    assert unknown["overall_status"] == "PREVAILING WAGE UNDETERMINED"
@@ -0,0 +1,68 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the triage risk model
+
+from app.adjudicator_models import CaseInfo
+from app.risk_model import FEATURES, extract_features, score_case, score_queue
+
+BASE_CASE = {
+    "case_number": "H1B-2024-00001",
+    "visa_type": "H-1B",
+    "petitioner_name": "Acme Corp",
+    "beneficiary_name": "Jane Doe",
+    "job_title": "Software Engineer",
+    "job_duties": "Design and build distributed systems",
+    "degree_type": "Master's",
+    "degree_field": "Computer Science",
+    "years_experience": 6,
+    "work_location": "San Francisco, CA",
+    "offered_wage": 160000,
+    "prevailing_wage": 120000,
+    "lca_number": "I-200-24001-123456",
+}
+
+
+def test_feature_matrix_shape_and_values() -> None:
+    risky = CaseInfo.model_validate(
+        {
+            **BASE_CASE,
+            "job_title": "Marketing Manager",
+            "work_location": "Various client sites, NJ",
+            "offered_wage": 100000,
+        }
+    )
+    features = extract_features([CaseInfo.model_validate(BASE_CASE), risky])
+    assert features.shape == (2, len(FEATURES))
+    row = dict(zip(FEATURES, features[1].tolist(), strict=True))
+    assert row["degree_field_mismatch"] == 1.0
+    assert row["client_site"] == 1.0
+    assert row["wage_margin_ratio"] < 0
+
+
+def test_queue_is_ordered_by_risk() -> None:
+    clean = CaseInfo.model_validate(BASE_CASE)
+    risky = CaseInfo.model_validate(
+        {
+            **BASE_CASE,
+            "case_number": "H1B-2024-00002",
+            "offered_wage": 90000,
+            "lca_number": None,
+            "work_location": "Remote",
+        }
+    )
+    queue = score_queue([clean, risky])
+    assert queue["scored"] == 2
+    assert [r["case_number"] for r in queue["results"]] == [
+        "H1B-2024-00002",
+        "H1B-2024-00001",
+    ]
+    assert score_case(risky)["risk_score"] > score_case(clean)["risk_score"]
+    assert score_case(clean)["risk_tier"] == "LOW"
+
+
+def test_missing_fields_count_none_and_blank_values() -> None:
+    sparse = CaseInfo.model_validate(
+        {**BASE_CASE, "job_duties": "", "years_experience": None, "lca_number": None}
+    )
+    features = extract_features([CaseInfo.model_validate(BASE_CASE), sparse])
+    missing = features[:, FEATURES.index("missing_field_ratio")].tolist()
+    assert missing == [0.0, 3 / 8]
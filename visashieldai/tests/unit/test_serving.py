@@ -0,0 +1,33 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for multi-worker serving configuration
+
+import os
+from typing import Any
+
+from app.app_utils import serving
+
+
+def test_one_worker_unless_configured(tmp_path: Any, monkeypatch: Any) -> None:
+    cpu_max = os.path.join(tmp_path, "cpu.max")
+    monkeypatch.setattr(serving, "CGROUP_V2_CPU_MAX", cpu_max)
+    monkeypatch.setattr(serving, "available_cpus", lambda: 8)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+
+    with open(cpu_max, "w") as f:
+        f.write("250000 100000\n")
+    assert serving.cpu_quota() == 2.5
+    assert serving.quota_workers() == 3
+    assert serving.worker_count() == 1
+    with open(cpu_max, "w") as f:
+        f.write("max 100000\n")
+    assert serving.quota_workers() == 8
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    assert serving.worker_count() == 2
+
+
+def test_several_workers_default_to_a_shared_session_store(monkeypatch: Any) -> None:
+    monkeypatch.delenv("SESSION_SERVICE_URI", raising=False)
+    assert serving.session_service_uri(1) is None
+    assert serving.session_service_uri(4) == serving.DEFAULT_SQLITE_URI
+    monkeypatch.setenv("SESSION_SERVICE_URI", "postgresql+asyncpg://db/sessions")
+    assert serving.session_service_uri(1) == "postgresql+asyncpg://db/sessions"
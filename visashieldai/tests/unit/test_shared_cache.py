@@ -0,0 +1,78 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the cross-worker shared result cache
+
+import multiprocessing
+import os
+import time
+from typing import Any
+
+from app.shared_cache import SharedCache, ToolMemo
+
+
+def _put_in_child(path: str) -> None:
+    SharedCache(path).put("tool", "child", b'{"from":"child"}')
+
+
+def test_round_trip_and_visible_to_other_processes(tmp_path: Any) -> None:
+    path = os.path.join(tmp_path, "cache.bin")
+    cache = SharedCache(path, size_bytes=1 << 16, slots=64)
+    assert cache.put("criteria", "H-1B", b'{"visa_type":"H-1B"}')
+    assert cache.get("criteria", "H-1B") == b'{"visa_type":"H-1B"}'
+    assert cache.get("adjudication", "H-1B") is None  # namespaces are separate
+
+    child = multiprocessing.get_context("spawn").Process(
+        target=_put_in_child, args=(path,)
+    )
+    child.start()
+    child.join()
+    assert cache.get_json("tool", "child") == {"from": "child"}
+    # A worker configured differently adopts the existing file's geometry.
+    other = SharedCache(path, size_bytes=1 << 20, slots=8)
+    assert other.data_size == 1 << 16
+    assert other.get("criteria", "H-1B") is not None
+    assert cache.metrics()["writes"] == 2
+
+
+def test_log_wraparound_evicts_oldest_and_ttl_expires(tmp_path: Any) -> None:
+    cache = SharedCache(os.path.join(tmp_path, "c.bin"), size_bytes=4096, slots=64)
+    value = b"x" * 900
+    for i in range(8):
+        assert cache.put("tool", str(i), value)
+    assert cache.get("tool", "0") is None  # overwritten by later records
+    assert cache.get("tool", "7") == value
+    assert not cache.put("tool", "big", b"x" * 2048)  # over a quarter of the log
+
+    cache.put("tool", "short", b"1", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("tool", "short") is None
+    assert cache.stats["expired"] >= 2
+    cache.clear()
+    assert cache.get("tool", "7") is None
+
+
+class _Tool:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _Context:
+    def __init__(self, function_call_id: str) -> None:
+        self.function_call_id = function_call_id
+
+
+def test_tool_memo_only_memoizes_listed_tools(tmp_path: Any, monkeypatch: Any) -> None:
+    cache = SharedCache(os.path.join(tmp_path, "memo.bin"), size_bytes=1 << 16)
+    monkeypatch.setattr("app.shared_cache.get_shared_cache", lambda: cache)
+    memo = ToolMemo(["check_lca_compliance"])
+    lca, draft = _Tool("check_lca_compliance"), _Tool("generate_adjudication_draft")
+    args = {"lca_number": "I-200", "wage_level": 2}
+
+    assert memo.before_tool(lca, args, _Context("a")) is None  # type: ignore[arg-type]
+    memo.after_tool(lca, args, _Context("a"), {"overall_status": "OK"})  # type: ignore[arg-type]
+    hit = memo.before_tool(lca, dict(reversed(args.items())), _Context("b"))  # type: ignore[arg-type]
+    assert hit == {"overall_status": "OK"}
+    memo.after_tool(lca, args, _Context("b"), hit)  # type: ignore[arg-type]
+    assert cache.metrics()["writes"] == 1  # hits are not written back
+
+    memo.after_tool(draft, {}, _Context("c"), {"draft": "..."})  # type: ignore[arg-type]
+    assert memo.before_tool(draft, {}, _Context("d")) is None  # type: ignore[arg-type]
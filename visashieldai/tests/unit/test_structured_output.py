@@ -0,0 +1,69 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for structured (JSON) adjudication output
+
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.tools.set_model_response_tool import SetModelResponseTool
+from google.genai import types
+
+from app.adjudicator_agent import structured_adjudicator_agent
+from app.structured_output import AdjudicationDecision, parse_decision
+from app.tool_results import ToolResultLedger, compact_tool_result
+
+DECISION: dict[str, Any] = {
+    "recommendation": "RFE",
+    "confidence": 72,
+    "summary": "Degree equivalency is not established.",
+    "findings": [
+        {
+            "criterion": "beneficiary qualifications",
+            "status": "REQUIRES REVIEW",
+            "confidence": 60,
+            "finding": "Three-year degree without qualifying experience.",
+            "citations": ["R2"],
+        }
+    ],
+    "risk_factors": ["three-year degree"],
+    "citations": ["8 CFR § 214.2(h)"],
+    "requires_human_review": True,
+}
+
+
+def test_parse_decision_validates_schema() -> None:
+    decision, error = parse_decision(json.dumps(DECISION))
+    assert error is None
+    assert decision == DECISION
+
+    decision, error = parse_decision(json.dumps({**DECISION, "recommendation": "X"}))
+    assert decision is None
+    assert error is not None and error.startswith("1 validation error")
+    assert parse_decision("Recommend approval.")[0] is None
+
+
+def test_structured_agent_keeps_tools_and_sets_schema() -> None:
+    assert structured_adjudicator_agent.output_schema is AdjudicationDecision
+    assert len(structured_adjudicator_agent.tools) == 7
+
+
+def test_final_answer_is_not_compacted_or_reported_as_tool_result() -> None:
+    tool = SetModelResponseTool(AdjudicationDecision)
+    context: Any = SimpleNamespace(state={}, function_call_id="call-1")
+    assert compact_tool_result(tool, DECISION, context, DECISION) is None
+
+    response = types.Part.from_function_response(name=tool.name, response=DECISION)
+    ledger = ToolResultLedger()
+    answer = Event(
+        author="structured_adjudicator_agent",
+        content=types.Content(role="user", parts=[response]),
+    )
+    synthetic_final = Event(
+        author="structured_adjudicator_agent",
+        content=types.Content(role="model", parts=[types.Part(text="{}")]),
+    )
+    assert ledger.observe(answer) == []
+    assert ledger.observe(synthetic_final) == []
+    assert ledger.as_dict()["tool_results"] == 0
+    assert ledger.as_dict()["model_turns"] == 0
@@ -0,0 +1,48 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the offline stub model
+
+import asyncio
+from typing import Any
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from app.ask_via_agent import AskViaAnswer
+from app.structured_output import AdjudicationDecision, parse_decision
+from app.stub_model import StubLlm, agent_model, sample
+from app.visa_agents import get_visa_agent
+
+
+def test_samples_satisfy_response_schemas() -> None:
+    AskViaAnswer.model_validate(sample(AskViaAnswer.model_json_schema()))
+    decision = sample(AdjudicationDecision.model_json_schema())
+    assert AdjudicationDecision.model_validate(decision).recommendation == "APPROVE"
+
+
+def test_stub_drives_every_tool_then_answers(monkeypatch: Any) -> None:
+    monkeypatch.setenv("AGENT_MODEL", "stub")
+    monkeypatch.setenv("STUB_MODEL_LATENCY_MS", "0")
+    model = agent_model("gemini-2.0-flash")
+    assert isinstance(model, StubLlm) and model.latency == 0
+    agent = get_visa_agent("O-1", "json").clone(update={"model": model})
+    runner = InMemoryRunner(agent=agent, app_name="stub_test")
+
+    async def run() -> tuple[list[str], str]:
+        session = await runner.session_service.create_session(
+            app_name="stub_test", user_id="u"
+        )
+        calls, text = [], ""
+        async for event in runner.run_async(
+            user_id="u",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="O-1 case")]),
+        ):
+            calls += [fc.name or "" for fc in event.get_function_calls()]
+            if event.is_final_response() and event.content and event.content.parts:
+                text += "".join(p.text or "" for p in event.content.parts)
+        return calls, text
+
+    calls, text = asyncio.run(run())
+    assert calls[:-1] == [getattr(t, "__name__", "") for t in agent.tools]
+    assert calls[-1] == "set_model_response"
+    assert parse_decision(text)[1] is None
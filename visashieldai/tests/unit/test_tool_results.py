@@ -0,0 +1,132 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for compact tool results
+
+from types import SimpleNamespace
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
+
+from app.adjudicator_agent import (
+    analyze_petition_form,
+    check_lca_compliance,
+    evaluate_specialty_occupation,
+    verify_employer_employee_relationship,
+)
+from app.tool_results import (
+    COMPACT_RESULTS_NOTE,
+    REFERENCES,
+    CompactInstruction,
+    ToolResultLedger,
+    compact_tool_result,
+    estimate_tokens,
+)
+
+
+def _context(call_id: str, compact: bool = True) -> Any:
+    return SimpleNamespace(
+        state={"compact_tool_results": compact}, function_call_id=call_id
+    )
+
+
+def test_compaction_drops_prose_echoes_and_references_citations() -> None:
+    args = {
+        "employer_name": "Acme Corp",
+        "work_location": "San Francisco, CA",
+        "supervision_details": "Reports to the VP of Engineering",
+        "right_to_control": "Employer assigns and reviews all work",
+    }
+    verbose = verify_employer_employee_relationship(**args)
+    tool = FunctionTool(verify_employer_employee_relationship)
+    compacted = compact_tool_result(tool, args, _context("call-1"), verbose)
+
+    assert compacted is not None
+    assert compacted["legal_standard"] in REFERENCES
+    assert compacted["eval"]["right_to_control"] == {"st": "ESTABLISHED", "conf": 93}
+    assert "employer" not in compacted  # echoed argument
+    assert estimate_tokens(compacted) < estimate_tokens(verbose) / 2
+
+
+def test_informative_literals_and_disabled_mode_are_kept() -> None:
+    args: dict[str, Any] = {
+        "lca_number": "I-200-1",
+        "wage_level": 2,
+        "prevailing_wage": 100000.0,
+        "offered_wage": 90000.0,
+    }
+    verbose = check_lca_compliance(**args)
+    tool = FunctionTool(check_lca_compliance)
+    compacted = compact_tool_result(tool, args, _context("call-2"), verbose)
+    assert compacted is not None
+    assert compacted["wage"]["pw_src"] == "Petition"
+    assert compacted["st"] == "LCA NON-COMPLIANT"
+    assert compact_tool_result(tool, args, _context("call-3", False), verbose) is None
+
+
+def test_findings_keep_the_fields_that_tell_them_apart() -> None:
+    args = {
+        "case_number": "H1B-2024-00847",
+        "form_type": "I-129",
+        "petitioner_name": "Acme Corp",
+        "beneficiary_name": "Jane Doe",
+    }
+    verbose = analyze_petition_form(**args)
+    tool = FunctionTool(analyze_petition_form)
+    compacted = compact_tool_result(tool, args, _context("call-7"), verbose)
+
+    assert compacted is not None
+    fields = [finding["field"] for finding in compacted["findings"]]
+    assert fields == [finding["field"] for finding in verbose["findings"]]
+    assert "notes" not in compacted["findings"][0]  # boilerplate still dropped
+
+
+def test_ledger_returns_verbose_results_and_counts_savings() -> None:
+    args = {
+        "job_title": "Software Engineer",
+        "job_duties": "Build distributed systems",
+        "degree_requirement": "Bachelor's in Computer Science",
+        "soc_code": "15-1252",
+    }
+    verbose = evaluate_specialty_occupation(**args)
+    tool = FunctionTool(evaluate_specialty_occupation)
+    compacted = compact_tool_result(tool, args, _context("call-4"), verbose)
+    saved = estimate_tokens(verbose) - estimate_tokens(compacted)
+
+    def model_turn(text: str) -> Event:
+        return Event(
+            author="adjudicator_agent",
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        )
+
+    response = types.Part.from_function_response(
+        name=tool.name, response=compacted or {}
+    )
+    assert response.function_response is not None
+    response.function_response.id = "call-4"
+    tool_event = Event(
+        author="adjudicator_agent",
+        content=types.Content(role="user", parts=[response]),
+    )
+
+    ledger = ToolResultLedger(instruction_tokens=10)
+    assert ledger.observe(model_turn("calling tool")) == []
+    assert ledger.observe(tool_event) == [(tool.name, verbose)]
+    ledger.observe(model_turn("final answer"))
+    assert ledger.as_dict() == {
+        "tool_results": 1,
+        "model_turns": 2,
+        "result_tokens_saved": saved,
+        "prompt_tokens_saved": saved - 2 * 10,
+    }
+
+
+def test_legend_is_only_sent_when_compacting() -> None:
+    instruction = CompactInstruction("Adjudicate.", "[R5] Simeio") + " Answer in JSON."
+    compacting = instruction(_context("call-5"))
+    verbose = instruction(_context("call-6", False))
+    assert compacting == (
+        "Adjudicate." + COMPACT_RESULTS_NOTE + "[R5] Simeio Answer in JSON."
+    )
+    assert verbose == "Adjudicate. Answer in JSON."
+    assert instruction.overhead_tokens == (len(compacting) - len(verbose)) // 4
@@ -0,0 +1,119 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for adjudication tracing
+
+from types import SimpleNamespace
+from typing import Any
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from app import tracing
+from app.adjudicator_models import AdjudicationRequest
+from app.latency import LatencyMetrics
+from app.tracing import (
+    adjudication_span,
+    end_model_span,
+    end_tool_span,
+    start_model_span,
+    start_tool_span,
+    stream_event,
+)
+
+REQUEST = AdjudicationRequest.model_validate(
+    {
+        "case_info": {
+            "case_number": "H1B-2024-00847",
+            "visa_type": "H-1B",
+            "petitioner_name": "Acme Corp",
+            "beneficiary_name": "Jane Doe",
+        }
+    }
+)
+
+
+def _exporter(monkeypatch: Any, **provider_args: Any) -> InMemorySpanExporter:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(**provider_args)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "tracer", provider.get_tracer("test"))
+    return exporter
+
+
+def _run_turn() -> None:
+    context: Any = SimpleNamespace(
+        invocation_id="inv-1", agent_name="adjudicator_agent"
+    )
+    tool: Any = SimpleNamespace(name="check_lca_compliance")
+    tool_context: Any = SimpleNamespace(function_call_id="call-1")
+    args = {"lca_number": "I-200-24001-123456", "wage_level": 2}
+
+    start_model_span(context, LlmRequest(model="stub"))
+    end_model_span(
+        context,
+        LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[types.Part.from_function_call(name=tool.name, args=args)],
+            ),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=120, candidates_token_count=15
+            ),
+        ),
+    )
+    start_tool_span(tool, args, tool_context)
+    end_tool_span(tool, args, tool_context, {"compliant": True})
+
+
+def test_turns_and_tools_nest_under_the_adjudication(monkeypatch: Any) -> None:
+    exporter = _exporter(monkeypatch)
+    monkeypatch.setattr(tracing, "latency_metrics", LatencyMetrics())
+
+    with adjudication_span("analyze/stream", REQUEST):
+        _run_turn()
+        stream_event("sse", "tool_result", "data: {}\n\n")
+
+    spans: dict[str, Any] = {s.name: s for s in exporter.get_finished_spans()}
+    root = spans["adjudicate"]
+    model, tool = spans["model_turn"], spans["tool check_lca_compliance"]
+    assert model.parent.span_id == tool.parent.span_id == root.context.span_id
+    assert model.attributes["gen_ai.usage.input_tokens"] == 120
+    assert model.attributes["model_turn.function_calls"] == ("check_lca_compliance",)
+    assert "I-200-24001-123456" in tool.attributes["tool.arguments"]
+    assert tool.attributes["tool.result_bytes"] == len('{"compliant":true}')
+
+    attributes = root.attributes
+    assert attributes["adjudication.route"] == "analyze/stream"
+    assert attributes["adjudication.model_turns"] == 1
+    assert attributes["adjudication.tool_calls"] == 1
+    assert attributes["adjudication.overhead_ms"] >= 0
+    assert attributes["adjudication.bytes_sent"] == 10
+    assert [event.name for event in root.events] == ["sse.send"]
+
+    latency = tracing.latency_metrics.summary()["metrics"]
+    for metric in ("request", "first_event", "model_turn", "tool"):
+        assert latency[metric]["overall"]["count"] == 1
+    assert latency["request"]["series"][0]["endpoint"] == "analyze/stream"
+    # The model turn before the LCA tool is form validation time
+    stages = {row["stage"]: row["count"] for row in latency["stage"]["series"]}
+    assert stages == {"form_validation": 1, "policy_matching": 1}
+
+
+def test_unsampled_adjudications_record_no_spans(monkeypatch: Any) -> None:
+    exporter = _exporter(monkeypatch, sampler=ALWAYS_OFF)
+    monkeypatch.setattr(tracing, "latency_metrics", LatencyMetrics())
+
+    with adjudication_span("analyze", REQUEST):
+        _run_turn()
+        stream_event("websocket", "complete", b"\x80")
+
+    assert exporter.get_finished_spans() == ()
+    assert not tracing._model_spans and not tracing._tool_spans
+    # Latency is recorded whether or not the trace is sampled
+    request = tracing.latency_metrics.summary()["metrics"]["request"]
+    assert request["overall"]["count"] == 1
@@ -0,0 +1,93 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for token, latency and cost accounting
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.adk.events import Event
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from app.usage import (
+    MODEL_LATENCY_KEY,
+    RESPONSE_TOOL,
+    UsageLedger,
+    record_model_latency,
+    start_model_timer,
+)
+
+
+def _turn(
+    prompt: int, output: int, calls: list[str], cached: int = 0, latency: float = 0
+) -> Event:
+    parts = [types.Part.from_function_call(name=name, args={}) for name in calls]
+    return Event(
+        author="adjudicator_agent",
+        model_version="gemini-2.0-flash-001",
+        content=types.Content(role="model", parts=parts or [types.Part(text="ok")]),
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt,
+            cached_content_token_count=cached,
+            candidates_token_count=output,
+        ),
+        custom_metadata={MODEL_LATENCY_KEY: latency},
+    )
+
+
+def test_turns_are_attributed_to_tools_and_stages() -> None:
+    ledger = UsageLedger()
+    ledger.observe(_turn(1000, 21, ["analyze_petition_form"], latency=400))
+    ledger.observe(
+        _turn(
+            2001,
+            40,
+            ["evaluate_specialty_occupation", "check_lca_compliance"],
+            cached=1000,
+            latency=600,
+        )
+    )
+    ledger.observe(_turn(3000, 500, [], latency=900))
+    ledger.observe(Event(author="user"))  # no usage: ignored
+
+    usage = ledger.as_dict()
+    assert usage["model_turns"] == 3
+    assert usage["prompt_tokens"] == 6001
+    assert usage["cached_tokens"] == 1000
+    assert usage["output_tokens"] == 561
+    assert usage["model_latency_ms"] == 1900
+    assert usage["model_latency_max_ms"] == 900
+    assert usage["by_tool"]["evaluate_specialty_occupation"]["prompt_tokens"] == 1001
+    assert usage["by_tool"]["check_lca_compliance"]["prompt_tokens"] == 1000
+    assert usage["by_tool"][RESPONSE_TOOL]["output_tokens"] == 500
+    assert usage["by_stage"]["form_validation"]["model_latency_ms"] == 400
+    assert sum(stage["prompt_tokens"] for stage in usage["by_stage"].values()) == 6001
+    # 5001 uncached + 1000 cached prompt tokens and 561 output tokens.
+    expected = (5001 * 0.10 + 1000 * 0.025 + 561 * 0.40) / 1_000_000
+    assert usage["estimated_cost_usd"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_merge_counts_runs() -> None:
+    aggregate = UsageLedger()
+    for _ in range(2):
+        run = UsageLedger()
+        run.observe(_turn(100, 10, []))
+        aggregate.merge(run)
+    metrics = aggregate.metrics()
+    assert metrics["runs"] == 2
+    assert metrics["avg_tokens_per_run"] == 110
+    assert metrics["by_stage"]["draft_generation"]["model_turns"] == 2
+
+
+def test_model_callbacks_stamp_latency() -> None:
+    context: Any = SimpleNamespace(invocation_id="inv-1", agent_name="agent")
+    response = LlmResponse(custom_metadata={"other": 1})
+    start_model_timer(context, None)  # type: ignore[arg-type]
+    record_model_latency(context, response)
+    assert response.custom_metadata is not None
+    assert response.custom_metadata["other"] == 1
+    assert response.custom_metadata[MODEL_LATENCY_KEY] >= 0
+    # A response without a recorded start is left alone.
+    untimed = LlmResponse()
+    record_model_latency(context, untimed)
+    assert untimed.custom_metadata is None
@@ -0,0 +1,49 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the per-visa-type agent registry
+
+from app.adjudicator_agent import (
+    adjudicator_agent,
+    evaluate_extraordinary_ability,
+    evaluate_national_interest,
+    generate_adjudication_draft,
+)
+from app.structured_output import AdjudicationDecision
+from app.tool_results import CompactInstruction
+from app.visa_agents import get_visa_agent, resolve_visa_type
+
+
+def test_visa_types_resolve_to_registry_keys() -> None:
+    assert resolve_visa_type("h1b") == "H-1B"
+    assert resolve_visa_type("O-1A") == "O-1"
+    assert resolve_visa_type("eb2-niw") == "EB-2 NIW"
+    assert resolve_visa_type("L-1") == "H-1B"  # unknown types keep the default
+
+
+def test_agents_are_built_once_with_their_own_tools() -> None:
+    assert get_visa_agent("H-1B") is adjudicator_agent
+    o1 = get_visa_agent("O-1")
+    assert get_visa_agent("O-1") is o1
+    tool_names = {getattr(tool, "__name__", "") for tool in o1.tools}
+    assert "evaluate_extraordinary_ability" in tool_names
+    assert "check_lca_compliance" not in tool_names
+    assert isinstance(o1.instruction, CompactInstruction)
+    assert "Kazarian" in o1.instruction.legend
+    assert "Simeio" not in o1.instruction.legend  # no H-1B citations
+    structured = get_visa_agent("EB-2 NIW", "json")
+    assert structured.output_schema is AdjudicationDecision
+    assert structured.name == "structured_eb2_niw_adjudicator_agent"
+
+
+def test_type_specific_tools_and_draft_citations() -> None:
+    o1 = evaluate_extraordinary_ability("ML research", ["awards", "Judging"], False)
+    assert o1["criteria_met"] == 2
+    assert o1["determination"] == "INSUFFICIENT EVIDENCE"
+    niw = evaluate_national_interest(
+        "Grid-scale battery research", ["DOE grant"], ["PhD", "patents"], "Urgency"
+    )
+    assert niw["determination"] == "NATIONAL INTEREST WAIVER SUPPORTED"
+    draft = generate_adjudication_draft("C-1", "EB2 NIW", "APPROVE", [], [])
+    assert draft["draft_decision"]["legal_basis"] == [
+        "INA § 203(b)(2)(B)(i)",
+        "8 CFR § 204.5(k)",
+    ]
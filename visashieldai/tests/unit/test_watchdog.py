@@ -0,0 +1,57 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the event-loop watchdog
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.app_utils.watchdog import LoopWatchdog
+
+
+def slow_tool() -> None:
+    time.sleep(0.3)
+
+
+async def analyze_endpoint() -> None:
+    async def generate_events() -> None:
+        slow_tool()
+
+    await generate_events()
+
+
+def test_blocked_loop_is_reported_with_route_and_tool() -> None:
+    watchdog = LoopWatchdog(interval=0.01, block_threshold=0.1)
+    watchdog.register_routes(
+        [SimpleNamespace(endpoint=analyze_endpoint, methods={"POST"}, path="/analyze")]
+    )
+    watchdog.register_tools(["slow_tool"])
+
+    async def scenario() -> None:
+        watchdog.ensure_started()
+        await asyncio.sleep(0.05)
+        await analyze_endpoint()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert watchdog.stalls == 1
+    report = watchdog.reports[0]
+    assert report["routes"] == ["POST /analyze"]
+    assert report["tools"] == ["slow_tool"]
+    assert report["stack"][-1].endswith("slow_tool")
+    assert report["blocked_ms"] >= 250
+    metrics = watchdog.metrics()
+    assert metrics["lag_histogram"]["le_500ms"] == 1
+    assert metrics["samples"] >= 2
+
+
+def test_idle_loop_is_not_a_stall() -> None:
+    watchdog = LoopWatchdog(interval=0.01, block_threshold=0.05)
+
+    async def scenario() -> None:
+        watchdog.ensure_started()
+        await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+    time.sleep(0.2)  # loop stopped: nothing is blocked
+    assert watchdog.stalls == 0
@@ -0,0 +1,137 @@
+# Copyright 2025 VisaShield AI
+# Unit tests for the adjudicator WebSocket wire protocols
+
+import json
+import os
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("OFFLINE_MODE", "1")
+os.environ.setdefault("SHARED_CACHE_SIZE_MB", "0")
+
+from app import adjudicator_api, duplicate_index
+from app.adjudicator_api import router
+from app.adjudicator_models import CaseInfo
+from app.duplicate_index import DuplicateIndex, case_text
+from app.ws_protocol import (
+    MSGPACK_SUBPROTOCOL,
+    JsonCodec,
+    MsgpackCodec,
+    decode_event,
+    msgpack,
+)
+
+requires_msgpack = pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+
+# Missing LCA: the pre-screen answers without the model.
+DEFICIENT_REQUEST = {
+    "case_info": {
+        "case_number": "H1B-2024-00847",
+        "visa_type": "H-1B",
+        "petitioner_name": "Acme Corp",
+        "beneficiary_name": "Jane Doe",
+        "job_duties": "Design and build distributed systems",
+        "degree_type": "Master's",
+        "degree_field": "Computer Science",
+        "work_location": "San Francisco, CA",
+        "offered_wage": 90000,
+        "prevailing_wage": 120000,
+    }
+}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@requires_msgpack
+def test_msgpack_event_decodes_to_the_json_event() -> None:
+    payload = {
+        "event_type": "tool_result",
+        "tool_name": "prescreen",
+        "tool_result": {"passed": False, "deficiencies": [{"rule_id": "H1B-006"}]},
+        "custom": 1,
+    }
+    codec = MsgpackCodec()
+    preamble = msgpack.unpackb(codec.preamble())
+    event = decode_event(preamble, codec.encode(dict(payload)))
+    expected = json.loads(JsonCodec().encode(dict(payload)))
+
+    assert isinstance(event.pop("timestamp"), int)
+    expected.pop("timestamp")
+    assert event == expected
+    assert len(codec.encode(dict(payload))) < len(JsonCodec().encode(dict(payload)))
+
+
+def test_json_stays_the_default() -> None:
+    with _client().websocket_connect("/api/adjudicator/ws/u1/s1") as ws:
+        ws.send_text(json.dumps(DEFICIENT_REQUEST))
+        result, complete = ws.receive_json(), ws.receive_json()
+
+    assert result["tool_name"] == "prescreen"
+    assert complete["event_type"] == "complete"
+    datetime.fromisoformat(complete["timestamp"])
+
+
+@requires_msgpack
+def test_msgpack_is_negotiated_at_the_handshake() -> None:
+    with _client().websocket_connect(
+        "/api/adjudicator/ws/u1/s1", subprotocols=[MSGPACK_SUBPROTOCOL]
+    ) as ws:
+        preamble = msgpack.unpackb(ws.receive_bytes())
+        ws.send_bytes(msgpack.packb(DEFICIENT_REQUEST))
+        result = decode_event(preamble, ws.receive_bytes())
+        complete = decode_event(preamble, ws.receive_bytes())
+
+    assert preamble["protocol"] == MSGPACK_SUBPROTOCOL
+    assert result["event_type"] == "tool_result"
+    assert not result["tool_result"]["passed"]
+    assert complete["event_type"] == "complete"
+    assert complete["confidence"] == 100
+    assert isinstance(complete["timestamp"], int)
+    # Last: the test client types the attribute as always None.
+    assert ws.accepted_subprotocol == MSGPACK_SUBPROTOCOL
+
+
+def test_websocket_screens_and_records_duplicates(monkeypatch: Any) -> None:
+    earlier = CaseInfo.model_validate(
+        {**DEFICIENT_REQUEST["case_info"], "case_number": "H1B-2024-00001"}
+    )
+    index = DuplicateIndex()
+    index.add([earlier.case_number], [earlier.petitioner_name], [case_text(earlier)])
+    recorded: list[CaseInfo] = []
+
+    class Recorder:
+        def record(self, case: CaseInfo) -> bool:
+            recorded.append(case)
+            return True
+
+    async def no_agent_run(*args: Any) -> AsyncGenerator[Any, None]:
+        return
+        yield
+
+    monkeypatch.setattr(duplicate_index, "get_duplicate_index", lambda: index)
+    monkeypatch.setattr(duplicate_index, "get_duplicate_recorder", Recorder)
+    monkeypatch.setattr(adjudicator_api, "run_agent", no_agent_run)
+    with _client().websocket_connect("/api/adjudicator/ws/u1/s1") as ws:
+        ws.send_text(json.dumps({**DEFICIENT_REQUEST, "prescreen": False}))
+        events = [ws.receive_json()]
+        while events[-1]["event_type"] != "complete":
+            events.append(ws.receive_json())
+
+    results = {
+        e["tool_name"]: e["tool_result"]
+        for e in events
+        if e["event_type"] == "tool_result"
+    }
+    assert list(results) == ["risk_model", "duplicate_risk"]
+    matches = results["duplicate_risk"]["matches"]
+    assert [m["case_number"] for m in matches] == [earlier.case_number]
+    assert [case.case_number for case in recorded] == ["H1B-2024-00847"]